@@ -0,0 +1,178 @@
+"""
+Walk-forward 백테스트
+
+    python backtest.py --sample_size 20 --epochs 10 --start 2010-01-01 --end 2025-01-01
+
+- train/test window를 step_days씩 밀면서 fold마다 LSTM을 새로 학습(또는 --warm_start weight에서 fine-tune)
+- fold는 서로 독립이라 process pool로 CPU 코어에 나눠서 실행 (TF는 fork에 안전하지 않아 spawn)
+- fold별 / 전체 오차 지표를 backtest_saved/folds.csv, summary.json에 저장
+"""
+import os
+import json
+import time
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+METRICS = ["mae", "rmse", "mape", "direction_acc", "naive_mae"]
+
+
+def make_folds(n_rows, train_days, test_days, step_days=None, anchored=False) -> list:
+    """
+    위치 기준 fold 구간 [(train_start, train_end, test_end), ...]
+    train = [train_start, train_end), test = [train_end, test_end)
+    anchored=True면 train 시작을 0에 고정 (expanding window)
+    """
+    step_days = step_days or test_days
+    folds = []
+    train_end = train_days
+    while train_end + test_days <= n_rows:
+        train_start = 0 if anchored else train_end - train_days
+        folds.append((train_start, train_end, train_end + test_days))
+        train_end += step_days
+    return folds
+
+
+def forecast_metrics(pred, truth, last_value) -> dict:
+    """예측/정답 1차원 시계열 오차 (naive_mae: 마지막 학습 값을 그대로 유지하는 기준선)"""
+    err = pred - truth
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mape = np.nanmean(np.abs(err / truth)) * 100
+    # 방향: 직전 값 대비 상승/하락이 맞았는지
+    prev_truth = np.concatenate([[last_value], truth[:-1]])
+    prev_pred = np.concatenate([[last_value], pred[:-1]])
+    direction = np.sign(pred - prev_pred) == np.sign(truth - prev_truth)
+    return {
+        "mae": float(np.mean(np.abs(err))),
+        "rmse": float(np.sqrt(np.mean(err ** 2))),
+        "mape": float(mape),
+        "direction_acc": float(np.mean(direction)),
+        "naive_mae": float(np.mean(np.abs(truth - last_value))),
+    }
+
+
+def _init_worker(threads):
+    # 워커 하나가 코어 여러 개를 독점하지 않도록 TF 스레드 수 제한
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def run_fold(fold_id, train_df, test_df, params) -> dict:
+    """fold 하나 학습 + 예측 + 평가 (워커 프로세스에서 실행)"""
+    import tensorflow as tf
+    from model import LSTM
+    from utils import restore_checkpoint_file
+
+    t0 = time.perf_counter()
+    tf.keras.utils.set_random_seed(params["seed"] + fold_id)
+
+    lstm = LSTM(sample_size=params["sample_size"], output_size=params["sample_size"])
+    lstm.pre_processor(train_df)
+    lstm.build_model()
+    if params["warm_start"]:
+        if params["warm_start"].endswith(".npz"):
+            restore_checkpoint_file(lstm.model, params["warm_start"], with_optimizer=False)
+        else:
+            lstm.model.load_weights(params["warm_start"])
+
+    history = lstm.model.fit(lstm.train_input, lstm.gt_output, epochs=params["epochs"],
+                             batch_size=params["batch_size"], verbose=0)
+
+    inp = train_df.to_numpy()[-lstm.sample_size:]
+    pred = lstm.forecast(inp, len(test_df))[0][:, params["target_idx"]]
+    truth = test_df.to_numpy()[:, params["target_idx"]]
+    last_value = train_df.to_numpy()[-1, params["target_idx"]]
+
+    result = {
+        "fold": fold_id,
+        "train_start": str(train_df.index[0].date()),
+        "train_end": str(train_df.index[-1].date()),
+        "test_start": str(test_df.index[0].date()),
+        "test_end": str(test_df.index[-1].date()),
+        "final_loss": float(history.history["loss"][-1]),
+        "seconds": time.perf_counter() - t0,
+    }
+    result.update(forecast_metrics(pred, truth, last_value))
+    return result
+
+
+def run_backtest(data, folds, params, workers=None, threads_per_worker=1) -> pd.DataFrame:
+    """fold들을 process pool로 병렬 실행 -> fold별 결과 DataFrame (fold 순서)"""
+    workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+    ctx = mp.get_context("spawn")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(threads_per_worker,)) as pool:
+        futures = [pool.submit(run_fold, i, data.iloc[s:e], data.iloc[e:t], params)
+                   for i, (s, e, t) in enumerate(folds)]
+        for fut in as_completed(futures):
+            r = fut.result()
+            results.append(r)
+            print(f"[fold {r['fold']:>3}] {r['test_start']} ~ {r['test_end']} "
+                  f"mae {r['mae']:.2f} (naive {r['naive_mae']:.2f}) {r['seconds']:.1f}s")
+    return pd.DataFrame(results).sort_values("fold").reset_index(drop=True)
+
+
+def summarize(df_folds) -> dict:
+    """지표별 fold 평균/중앙값/표준편차 + naive 대비 개선 fold 비율"""
+    summary = {m: {"mean": float(df_folds[m].mean()), "median": float(df_folds[m].median()),
+                   "std": float(df_folds[m].std(ddof=0))} for m in METRICS}
+    summary["folds"] = len(df_folds)
+    summary["beat_naive"] = float((df_folds["mae"] < df_folds["naive_mae"]).mean())
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Walk-forward backtest')
+    parser.add_argument('--ticker',      default='006400.KS')
+    parser.add_argument('--start',       default='2010-01-01')
+    parser.add_argument('--end',         default='2025-01-01')
+    parser.add_argument('--sample_size', type=int, required=True, help='입력 window size')
+    parser.add_argument('--epochs',      type=int, default=10, help='fold별 학습 epoch 수')
+    parser.add_argument('--batch_size',  type=int, default=32)
+    parser.add_argument('--train_days',  type=int, default=1250, help='fold별 학습 구간 (거래일, 약 5년)')
+    parser.add_argument('--test_days',   type=int, default=126,  help='fold별 예측 구간 (거래일, 약 6개월)')
+    parser.add_argument('--step_days',   type=int, default=None, help='fold 이동 간격 (기본 test_days)')
+    parser.add_argument('--anchored',    action='store_true', help='학습 시작일 고정 (expanding window)')
+    parser.add_argument('--warm_start',  default=None, help='fold마다 이 weight에서 fine-tune (.npz/.h5)')
+    parser.add_argument('--target_idx',  type=int, default=2, help='평가할 feature 위치 (main.py와 동일)')
+    parser.add_argument('--workers',     type=int, default=None, help='프로세스 수 (기본 코어 수 / threads)')
+    parser.add_argument('--threads_per_worker', type=int, default=1)
+    parser.add_argument('--seed',        type=int, default=0)
+    parser.add_argument('--save_dir',    default='backtest_saved')
+    args = parser.parse_args()
+
+    from market_cache import MarketCache
+    data = MarketCache('market_cache').get(args.ticker, args.start, args.end)
+
+    folds = make_folds(len(data), args.train_days, args.test_days, args.step_days, args.anchored)
+    if not folds:
+        raise SystemExit(f"데이터({len(data)}행)가 train_days + test_days보다 짧습니다.")
+    print(f">>> {args.ticker} {len(data)}행, fold {len(folds)}개")
+
+    params = {k: getattr(args, k) for k in
+              ("sample_size", "epochs", "batch_size", "warm_start", "target_idx", "seed")}
+    t0 = time.perf_counter()
+    df_folds = run_backtest(data, folds, params, args.workers, args.threads_per_worker)
+    summary = summarize(df_folds)
+    summary["seconds"] = time.perf_counter() - t0
+    summary["params"] = dict(params, ticker=args.ticker, train_days=args.train_days,
+                             test_days=args.test_days, step_days=args.step_days,
+                             anchored=args.anchored)
+
+    os.makedirs(args.save_dir, exist_ok=True)
+    df_folds.to_csv(os.path.join(args.save_dir, "folds.csv"), index=False)
+    with open(os.path.join(args.save_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n{'metric':<14} {'mean':>10} {'median':>10} {'std':>10}")
+    for m in METRICS:
+        s = summary[m]
+        print(f"{m:<14} {s['mean']:>10.4f} {s['median']:>10.4f} {s['std']:>10.4f}")
+    print(f"naive 대비 개선 fold 비율 : {summary['beat_naive']:.2%}")
+    print(f"총 소요 시간 : {summary['seconds']:.1f}s  ->  {args.save_dir}")
@@ -1,15 +1,90 @@
+import sys
 import argparse
 
-def get_training_args():
+COMMANDS = ['train', 'predict', 'all', 'global', 'plot']
+DEFAULT_COMMAND = 'all'
+
+
+# 이전 단일 parser에서는 모든 모드가 받던 학습 옵션 (predict/plot에서는 무시)
+LEGACY_TRAIN_OPTIONS = ['--epochs', '--batch_size', '--save_interval', '--sample_size']
+
+
+def _drop_options(argv, names):
+    """argv에서 '--name value' / '--name=value' 형태의 옵션 제거"""
+    out, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in names:
+            skip = True
+        elif arg.split('=', 1)[0] not in names:
+            out.append(arg)
+    return out
+
+
+def _legacy_mode(argv):
+    """
+    이전 방식(--mode train) 호환: 서브커맨드 형태로 변환
+    예전에는 --sample_size가 필수였으므로 predict/plot에 붙은 학습 옵션은 버림
+    """
+    argv = list(argv)
+    for i, arg in enumerate(argv):
+        if arg == '--mode' and i + 1 < len(argv):
+            mode, rest = argv[i + 1], argv[:i] + argv[i + 2:]
+        elif arg.startswith('--mode='):
+            mode, rest = arg.split('=', 1)[1], argv[:i] + argv[i + 1:]
+        else:
+            continue
+        if mode in ('predict', 'plot'):
+            rest = _drop_options(rest, LEGACY_TRAIN_OPTIONS)
+        return [mode] + rest
+    return argv
+
+
+def get_training_args(argv=None):
+    """
+    서브커맨드: train / predict / all / global / plot (생략하면 all)
+    argparse만 사용하므로 --help는 tensorflow 등을 import하지 않음
+    """
+    argv = _legacy_mode(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS + ['-h', '--help']:
+        argv = [DEFAULT_COMMAND] + argv
+
+    train_args = argparse.ArgumentParser(add_help=False)
+    train_args.add_argument('--epochs',        type=int, default=10, help='훈련할 epoch 수')
+    train_args.add_argument('--batch_size',    type=int, default=32, help='배치 크기')
+    train_args.add_argument('--save_interval', type=int, default=5,  help='체크포인트 저장 주기')
+    train_args.add_argument('--keep_last',     type=int, default=3,  help='유지할 최근 체크포인트 수 (best는 항상 유지)')
+    train_args.add_argument('--resume',        action='store_true',
+                            help='마지막 체크포인트(weight/optimizer/epoch)에서 학습 재개')
+    train_args.add_argument('--profile_epochs', type=int, nargs=2, default=None, metavar=('START', 'END'),
+                            help='TF profiler trace를 저장할 epoch 구간 (1부터, END 포함)')
+    train_args.add_argument('--sample_size',   type=int, required=True,
+                            help='입력 window size (predict는 bundle 값 사용)')
+    train_args.add_argument('--stream',        action='store_true',
+                            help='window를 미리 만들지 않고 tf.data로 배치마다 생성 (메모리 절약)')
+
+    output_args = argparse.ArgumentParser(add_help=False)
+    output_args.add_argument('--weights',      choices=['latest','best'], default='latest',
+                             help='사용할 체크포인트 (manifest.json 기준)')
+    output_args.add_argument('--show',         action='store_true',
+                             help='그래프 창 표시 (기본은 파일로만 저장)')
+
     parser = argparse.ArgumentParser(description='Train/Infer LSTM model.')
-    parser.add_argument(
-        '--mode',
-        choices=['train','predict','all'],
-        default='all',
-        help='실행모드: train(학습만) / predict(예측+플롯+손실곡선) / all(학습→예측)'
-    )
-    parser.add_argument('--epochs',        type=int, default=10, help='훈련할 epoch 수')
-    parser.add_argument('--batch_size',    type=int, default=32, help='배치 크기')
-    parser.add_argument('--save_interval', type=int, default=5,  help='체크포인트 저장 주기')
-    parser.add_argument('--sample_size',   type=int, required=True, help='입력 window size')
-    return parser.parse_args()
\ No newline at end of file
+    sub = parser.add_subparsers(dest='command', metavar='{' + ','.join(COMMANDS) + '}')
+    sub.add_parser('train',   parents=[train_args], help='학습만')
+    sub.add_parser('predict', parents=[output_args], help='예측 + 플롯 + 손실곡선')
+    sub.add_parser('all',     parents=[train_args, output_args], help='학습 → 예측 (기본)')
+    p_global = sub.add_parser('global', parents=[train_args], help='저장소 전 종목을 하나의 모델로 학습')
+    p_global.add_argument('--embedding_dim', type=int, default=0,
+                          help='종목 embedding 크기 (0이면 사용 안 함)')
+    p_global.add_argument('--balance',       action='store_true',
+                          help='종목별로 같은 비율로 window 추출')
+    p_global.add_argument('--features',      action='store_true',
+                          help='feature_store 행렬(가격 + GDP + PER/PBR/EPS + 지표)로 학습')
+    sub.add_parser('plot',    parents=[output_args],
+                   help='기존 loss_log.csv로 손실곡선만 다시 그림 (tensorflow 불필요)')
+
+    args = parser.parse_args(argv)
+    args.mode = args.command    # 이전 코드 호환
+    return args
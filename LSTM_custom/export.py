@@ -0,0 +1,130 @@
+"""
+학습된 LSTM을 CPU 추론용 TFLite 파일로 export
+
+    python export.py --save_dir checkpoint_saved --quantize float16
+    lstm = load_tflite('checkpoint_saved', 'float16')    # predict / forecast 그대로 사용
+
+- Keras 3 LSTM은 batch 차원이 동적이면 변환되지 않아 batch 크기를 고정해서 변환
+  (runner가 입력을 batch 단위로 나누고 모자라면 0으로 채움)
+- weight를 상수로 고정한 그래프를 변환 (resource 변수가 남으면 TFLite에서 실행되지 않음)
+- quantize: None(float32) / 'float16'(weight fp16) / 'dynamic'(weight int8, 활성값 float)
+"""
+import os
+import json
+import argparse
+import threading
+import numpy as np
+import tensorflow as tf
+
+from model import LSTM
+
+EXPORT_DIR = "export"
+QUANTIZE = ("float32", "float16", "dynamic")
+
+
+def export_path(save_dir, quantize="float32"):
+    return os.path.join(save_dir, EXPORT_DIR, f"model_{quantize}.tflite")
+
+
+def export_tflite(lstm, save_dir, quantize="float32", batch_size=1) -> str:
+    """lstm.model -> {save_dir}/export/model_{quantize}.tflite (+ export.json에 batch 크기 기록)"""
+    from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+    if lstm.model is None:
+        raise ValueError("model이 정의되지 않았습니다. 먼저 build_model() 실행하세요.")
+    quantize = quantize or "float32"
+    if quantize not in QUANTIZE:
+        raise ValueError(f"quantize는 {QUANTIZE} 중 하나여야 합니다: {quantize}")
+
+    spec = tf.TensorSpec([batch_size, lstm.sample_size, lstm.feature_size], tf.float32)
+    fn = tf.function(lambda x: lstm.model(x, training=False))
+    frozen = convert_variables_to_constants_v2(fn.get_concrete_function(spec))
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([frozen])
+    if quantize != "float32":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    content = converter.convert()
+
+    path = export_path(save_dir, quantize)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(content)
+    os.replace(path + ".tmp", path)
+
+    meta_path = os.path.join(save_dir, EXPORT_DIR, "export.json")
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+    meta[quantize] = {"path": os.path.relpath(path, save_dir), "batch_size": batch_size,
+                      "weight_path": getattr(lstm, "weight_path", None), "bytes": len(content)}
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+def _interpreter(path, num_threads):
+    try:
+        # TF 2.20+ 권장 런타임 (설치되어 있으면 사용)
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=path, num_threads=num_threads)
+
+
+class TFLiteRunner:
+    """
+    (N, sample_size, feature) float32 -> (N, sample_size, feature)
+    고정 batch 크기로 나눠서 실행, interpreter는 thread-safe가 아니라 lock으로 보호
+    """
+    def __init__(self, path, num_threads=None):
+        self.path = path
+        self.interpreter = _interpreter(path, num_threads)
+        self.interpreter.allocate_tensors()
+        inp = self.interpreter.get_input_details()[0]
+        self.input_index = inp["index"]
+        self.input_shape = tuple(inp["shape"])
+        self.output_index = self.interpreter.get_output_details()[0]["index"]
+        self.batch_size = self.input_shape[0]
+        self.lock = threading.Lock()
+
+    def __call__(self, x):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        n, B = x.shape[0], self.batch_size
+        outputs = []
+        with self.lock:
+            for i in range(0, n, B):
+                chunk = x[i:i + B]
+                if len(chunk) < B:
+                    chunk = np.concatenate([chunk, np.zeros((B - len(chunk),) + chunk.shape[1:], np.float32)])
+                self.interpreter.set_tensor(self.input_index, chunk)
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self.output_index)[:n - i])
+        return np.concatenate(outputs)
+
+
+def load_tflite(save_dir, quantize="float32", num_threads=None) -> LSTM:
+    """bundle.json(scaler/설정) + export된 tflite -> Keras 모델 없이 predict/forecast 가능한 LSTM"""
+    lstm = LSTM.from_bundle_config(save_dir)
+    path = quantize if quantize.endswith(".tflite") else export_path(save_dir, quantize)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"export 파일이 없습니다: {path} (먼저 export.py 실행)")
+    lstm.runner = TFLiteRunner(path, num_threads)
+    lstm.weight_path = path
+    return lstm
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export LSTM to TFLite')
+    parser.add_argument('--save_dir',   default='checkpoint_saved')
+    parser.add_argument('--weights',    default='latest', help="latest / best / weight 파일 경로")
+    parser.add_argument('--quantize',   nargs='+', choices=QUANTIZE, default=['float32'])
+    parser.add_argument('--batch_size', type=int, default=1, help='고정 batch 크기 (서버 micro-batch 크기에 맞춤)')
+    args = parser.parse_args()
+
+    lstm = LSTM.from_bundle(args.save_dir, which=args.weights)
+    for q in args.quantize:
+        path = export_tflite(lstm, args.save_dir, q, args.batch_size)
+        print(f"{q} 저장 완료 : {path} ({os.path.getsize(path) / 2**20:.2f} MB)")
@@ -0,0 +1,198 @@
+"""
+여러 종목을 하나의 LSTM으로 학습하는 global 모델
+
+- 종목별 RobustScaler (가격 수준이 달라도 같은 스케일로 학습)
+- 모든 종목의 정규화 데이터를 하나의 (sum T, feature) 배열에 이어 붙이고
+  종목 경계를 넘지 않는 window 시작 위치만 index로 보관 (window 복사 없음)
+- 배치는 여러 종목의 window를 섞어서 채움 (balance=True면 종목별로 같은 비율로 추출)
+- embedding_dim > 0이면 종목 embedding을 모든 timestep 입력에 이어 붙임
+"""
+import numpy as np
+import tensorflow as tf
+from sklearn.preprocessing import RobustScaler
+from tensorflow.keras.layers import LSTM as KerasLSTM
+from tensorflow.keras.layers import Input, Embedding, RepeatVector, Concatenate, TimeDistributed, Dense
+
+from model import LSTM
+
+
+def _scaler_state(scaler):
+    return {"center": scaler.center_.tolist(), "scale": scaler.scale_.tolist()}
+
+
+def _scaler_from_state(state, n_features):
+    scaler = RobustScaler()
+    scaler.center_ = np.asarray(state["center"])
+    scaler.scale_ = np.asarray(state["scale"])
+    scaler.n_features_in_ = n_features
+    return scaler
+
+
+class GlobalLSTM(LSTM):
+    def __init__(self, sample_size, output_size, embedding_dim=0):
+        super().__init__(sample_size, output_size)
+        self.embedding_dim = embedding_dim
+        self.tickers = []
+        self.scalers = {}
+        self.starts = None          # window 시작 위치 (이어 붙인 배열 기준)
+        self.ticker_ids = None      # window별 종목 번호
+
+    @property
+    def ticker_index(self):
+        return {t: i for i, t in enumerate(self.tickers)}
+
+    def pre_processor(self, frames: dict):
+        """
+        frames: {종목: DataFrame} (모든 종목의 컬럼이 같아야 함)
+        return: window 수
+        """
+        columns = None
+        parts, starts, ids = [], [], []
+        offset = 0
+        span = self.sample_size + self.output_size
+        self.tickers, self.scalers = [], {}
+        for ticker in sorted(frames):
+            df = frames[ticker].dropna()
+            if columns is None:
+                columns = list(df.columns)
+            elif list(df.columns) != columns:
+                raise ValueError(f"{ticker}: 컬럼이 다른 종목과 다릅니다.")
+            n_windows = len(df) - span + 1
+            if n_windows <= 0:
+                print(f">>> {ticker}: 데이터가 짧아 제외 ({len(df)}행)")
+                continue
+
+            scaler = RobustScaler()
+            parts.append(scaler.fit_transform(df.to_numpy()))
+            starts.append(offset + np.arange(n_windows))
+            ids.append(np.full(n_windows, len(self.tickers)))
+            self.tickers.append(ticker)
+            self.scalers[ticker] = scaler
+            offset += len(df)
+
+        if not parts:
+            raise ValueError("학습할 수 있는 종목이 없습니다.")
+        self.features = [str(c) for c in columns]
+        self.scaled_data = np.concatenate(parts).astype(np.float32)
+        self.starts = np.concatenate(starts)
+        self.ticker_ids = np.concatenate(ids)
+        self.feature_size = self.scaled_data.shape[1]
+        # 공용 scaler는 사용하지 않지만 bundle 형식을 맞추기 위해 첫 종목 값으로 채움
+        self.scaler = self.scalers[self.tickers[0]]
+        return len(self.starts)
+
+    def sample_order(self, rng, balance=False):
+        """
+        한 epoch 동안 사용할 window index 순서
+        balance=False: 전체 window를 섞음 / True: 종목을 균등 확률로 뽑은 뒤 그 종목 window 추출
+        """
+        n = len(self.starts)
+        if not balance:
+            return rng.permutation(n)
+        counts = np.bincount(self.ticker_ids, minlength=len(self.tickers))
+        weights = 1.0 / counts[self.ticker_ids]
+        return rng.choice(n, size=n, replace=True, p=weights / weights.sum())
+
+    def make_dataset(self, batch_size, shuffle=True, seed=None, balance=False):
+        """종목이 섞인 배치를 index gather로 생성 (embedding이 있으면 입력은 (window, 종목 번호))"""
+        if self.scaled_data is None:
+            raise ValueError("scaled_data가 없습니다. 먼저 pre_processor를 실행하세요.")
+
+        data = tf.constant(self.scaled_data)
+        starts = tf.constant(self.starts, dtype=tf.int64)
+        ids = tf.constant(self.ticker_ids, dtype=tf.int32)
+        in_offsets = tf.range(self.sample_size, dtype=tf.int64)
+        out_offsets = tf.range(self.sample_size, self.sample_size + self.output_size, dtype=tf.int64)
+        rng = np.random.default_rng(seed)
+        n = len(self.starts)
+
+        def order():
+            # epoch마다 새 순서 (generator는 반복할 때마다 다시 호출됨), 배치 단위로 yield
+            idx = self.sample_order(rng, balance)
+            for s in range(0, n, batch_size):
+                yield idx[s:s + batch_size]
+
+        def gather_batch(idx):
+            pos = tf.gather(starts, idx)
+            x = tf.gather(data, pos[:, None] + in_offsets[None, :])
+            y = tf.gather(data, pos[:, None] + out_offsets[None, :])
+            if self.embedding_dim:
+                return (x, tf.gather(ids, idx)), y
+            return x, y
+
+        if shuffle and balance:
+            # 종목 균형 복원추출은 numpy로 epoch마다 뽑고 배치 단위로 넘김 (샘플마다 Python 호출 없음)
+            ds = tf.data.Dataset.from_generator(order, output_signature=tf.TensorSpec([None], tf.int64))
+        else:
+            ds = tf.data.Dataset.range(n)
+            if shuffle:
+                ds = ds.shuffle(n, seed=seed, reshuffle_each_iteration=True)
+            ds = ds.batch(batch_size)
+        ds = ds.map(gather_batch, num_parallel_calls=tf.data.AUTOTUNE)
+        return ds.prefetch(tf.data.AUTOTUNE)
+
+    def build_model(self, feature_size=None):
+        if feature_size is not None:
+            self.feature_size = feature_size
+        elif self.feature_size is None:
+            raise ValueError("train_data가 없습니다. 먼저 pre_processor를 실행하세요.")
+        if not self.embedding_dim:
+            return super().build_model(self.feature_size)
+
+        x_in = Input(shape=(self.sample_size, self.feature_size))
+        id_in = Input(shape=(), dtype="int32")
+        emb = Embedding(len(self.tickers), self.embedding_dim)(id_in)
+        h = Concatenate()([x_in, RepeatVector(self.sample_size)(emb)])
+        h = KerasLSTM(128, return_sequences=True)(h)
+        h = KerasLSTM(64, return_sequences=True)(h)
+        out = TimeDistributed(Dense(self.feature_size))(h)
+
+        model = tf.keras.Model([x_in, id_in], out)
+        model.compile(optimizer='adam', loss='mae')
+        self.model = model
+
+    def forecast(self, model_input, steps, tickers=None, scalers=None):
+        """
+        종목별 입력을 한 배치로 예측 (같은 weight 재사용)
+        model_input: (batch, sample_size, feature) 원본 스케일, tickers: 행별 종목 코드
+        """
+        model_input = np.asarray(model_input, dtype=np.float64)
+        if model_input.ndim == 2:
+            model_input = model_input[None]
+        if tickers is None:
+            if self.embedding_dim:
+                raise ValueError("embedding 모델은 tickers가 필요합니다.")
+            if scalers is not None:
+                return super().forecast(model_input, steps, scalers)
+            # 종목별 scaler가 다르므로 한 종목 모델일 때만 생략 가능
+            if len(self.tickers) != 1:
+                raise ValueError(f"{len(self.tickers)}개 종목 모델은 tickers(행별 종목 코드)가 필요합니다.")
+            tickers = self.tickers[0]
+        if isinstance(tickers, str):
+            tickers = [tickers] * len(model_input)
+        if len(tickers) != len(model_input):
+            raise ValueError("tickers 길이가 batch 크기와 다릅니다.")
+
+        scalers = [self.scalers[t] for t in tickers]
+        window = self._transform(model_input, scalers).astype(np.float32)
+        if self.embedding_dim:
+            ids = np.array([self.ticker_index[t] for t in tickers], dtype=np.int32)
+            call = lambda w: self._call_model((w, ids))
+        else:
+            call = self._call_model
+        predicted = self._rollout(window, steps, call)
+        return self._inverse_transform(predicted, scalers)
+
+    def predict(self, model_input, ticker=None):
+        """한 window 예측 (종목 scaler 사용, 여러 종목 모델이면 ticker 필수)"""
+        return self.forecast(model_input, self.output_size, ticker)[0]
+
+    def _bundle_extra(self):
+        return {"embedding_dim": self.embedding_dim, "tickers": self.tickers,
+                "scalers": {t: _scaler_state(sc) for t, sc in self.scalers.items()}}
+
+    def _load_bundle_extra(self, bundle):
+        self.embedding_dim = bundle.get("embedding_dim", 0)
+        self.tickers = bundle.get("tickers", [])
+        self.scalers = {t: _scaler_from_state(s, bundle["feature_size"])
+                        for t, s in bundle.get("scalers", {}).items()}
@@ -1,133 +1,183 @@
 import os
+import re
 import sys
-import glob
-import yfinance as yf
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 
 from config import get_training_args
-from model import LSTM
-from utils import Checkpoint
 
-if __name__ == "__main__":
-    args = get_training_args()
-    SAVE_DIR = 'checkpoint_saved'
-
-    # ─── train 모드 ──────────────────────────────────────
-    if args.mode == 'train':
-        data = yf.download('006400.KS', '2012-01-01', '2017-02-02')
+# tensorflow / yfinance / matplotlib / pandas는 import 비용이 커서
+# 필요한 명령 안에서만 import (--help, plot은 tensorflow 없이 실행)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-        lstm = LSTM(sample_size=args.sample_size, output_size=args.sample_size)
-        lstm.pre_processor(data)
-        lstm.build_model()
-
-        checkpoint = Checkpoint(save_every=args.save_interval)
-        lstm.model.fit(
-            lstm.train_input,
-            lstm.gt_output,
-            epochs=args.epochs,
-            batch_size=args.batch_size,
-            callbacks=[checkpoint]
-        )
-        sys.exit(0)
+SAVE_DIR = 'checkpoint_saved'
+TICKER   = '006400.KS'
+TRAIN_RANGE = ('2012-01-01', '2017-02-02')
+TEST_RANGE  = ('2017-02-03', '2017-08-14')
 
 
-    # ─── predict 모드 or all 모드 ────────────────────────
-    data    = yf.download('006400.KS', '2012-01-01', '2017-02-02')
-    data_gt = yf.download('006400.KS', '2017-02-03', '2017-08-14')
+def train(data, args, save_dir):
+    from model import LSTM
+    from utils import Checkpoint, Throughput
 
     lstm = LSTM(sample_size=args.sample_size, output_size=args.sample_size)
     lstm.pre_processor(data)
     lstm.build_model()
+    lstm.save_bundle(save_dir)
+
+    checkpoint = Checkpoint(save_every=args.save_interval, save_dir=save_dir,
+                            keep_last=args.keep_last, resume=args.resume)
+    initial_epoch = checkpoint.restore(lstm.model) if args.resume else 0
+    throughput = Throughput(batch_size=args.batch_size, num_samples=len(lstm.train_input),
+                            save_dir=save_dir, profile_epochs=args.profile_epochs,
+                            resume=args.resume, initial_epoch=initial_epoch)
+    fit_model(lstm, args, callbacks=[checkpoint, throughput], initial_epoch=initial_epoch)
+    return lstm
+
+
+def train_global(frames, args, save_dir):
+    """여러 종목을 하나의 모델로 학습 (종목별 scaler, 종목이 섞인 배치)"""
+    from global_model import GlobalLSTM
+    from utils import Checkpoint, Throughput
+
+    lstm = GlobalLSTM(sample_size=args.sample_size, output_size=args.sample_size,
+                      embedding_dim=args.embedding_dim)
+    num_samples = lstm.pre_processor(frames)
+    lstm.build_model()
+    lstm.save_bundle(save_dir)
+    print(f">>> {len(lstm.tickers)}개 종목, window {num_samples}개")
+
+    checkpoint = Checkpoint(save_every=args.save_interval, save_dir=save_dir,
+                            keep_last=args.keep_last, resume=args.resume)
+    initial_epoch = checkpoint.restore(lstm.model) if args.resume else 0
+    throughput = Throughput(batch_size=args.batch_size, num_samples=num_samples,
+                            save_dir=save_dir, profile_epochs=args.profile_epochs,
+                            resume=args.resume, initial_epoch=initial_epoch)
+    lstm.model.fit(
+        lstm.make_dataset(args.batch_size, balance=args.balance),
+        epochs=args.epochs,
+        initial_epoch=initial_epoch,
+        callbacks=[checkpoint, throughput]
+    )
+    return lstm
 
-    if args.mode == 'all':
-        checkpoint = Checkpoint(save_every=args.save_interval)
-        lstm.model.fit(
-            lstm.train_input,
-            lstm.gt_output,
+
+def fit_model(lstm, args, callbacks, initial_epoch=0):
+    if args.stream:
+        # 배치마다 window를 gather하는 tf.data 파이프라인
+        return lstm.model.fit(
+            lstm.make_dataset(args.batch_size),
             epochs=args.epochs,
-            batch_size=args.batch_size,
-            callbacks=[checkpoint]
+            initial_epoch=initial_epoch,
+            callbacks=callbacks
         )
+    return lstm.model.fit(
+        lstm.train_input,
+        lstm.gt_output,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        initial_epoch=initial_epoch,
+        callbacks=callbacks
+    )
 
-    # ─── 최신 체크포인트 로드 ─────────────────────────────
-    weight_dir = os.path.join(SAVE_DIR, 'weight')
-    ckpts      = sorted(glob.glob(os.path.join(weight_dir, '*.h5')))
-    if not ckpts:
-        raise FileNotFoundError(f"No checkpoints found in {weight_dir}")
-    latest_ckpt = ckpts[-1]
-    print(f">>> Loading latest weights: {latest_ckpt}")
-    lstm.model.load_weights(latest_ckpt)
 
-    # ─── epoch 문자열 추출 (loss/predict 파일명에 공통 사용) ───
-    basename, _ = os.path.splitext(os.path.basename(latest_ckpt))
-    epoch_str   = basename[basename.find('epoch_'):]  # e.g. "epoch_020"
+def market_data(*date_range):
+    from market_cache import MarketCache
+    return MarketCache('market_cache').get(TICKER, *date_range)
+
+
+def epoch_tag(weight_path):
+    """weight 파일명의 epoch 문자열 (loss/predict 파일명에 공통 사용), e.g. "epoch_020" """
+    return re.search(r'epoch_\d+', os.path.basename(weight_path)).group(0)
+
+
+def plot_loss(args, epoch_str):
+    import pandas as pd
+    from plotting import plot_loss_curve
+
+    df_loss  = pd.read_csv(os.path.join(SAVE_DIR, 'loss_log.csv'))
+    loss_out = os.path.join(SAVE_DIR, f"loss_{epoch_str}.png")
+    plot_loss_curve(df_loss, loss_out, dpi=150, show=args.show)
+
+
+# ─── 명령별 실행 ─────────────────────────────────────────
+def cmd_train(args):
+    train(market_data(*TRAIN_RANGE), args, SAVE_DIR)
 
-    # ─── 손실곡선 플롯 & 저장 ────────────────────────────
-    loss_log = os.path.join(SAVE_DIR, 'loss_log.csv')
-    df_loss  = pd.read_csv(loss_log)
-
-    plt.figure(figsize=(8,4))
-    plt.errorbar(
-        df_loss['epoch'],
-        df_loss['mean_loss'],
-        yerr=df_loss['std_loss'],
-        fmt='-o',
-        capsize=4,
-        label='Mean Loss'
-    )
-    plt.title("Training Loss Curve")
-    plt.xlabel("Epoch"); plt.ylabel("Loss")
-    plt.legend(); plt.grid(True)
-    plt.tight_layout()
 
-    # 저장
-    loss_fig = f"loss_{epoch_str}.png"
-    loss_out = os.path.join(SAVE_DIR, loss_fig)
-    os.makedirs(os.path.dirname(loss_out), exist_ok=True)
-    plt.savefig(loss_out, dpi=150)
-    plt.show()
+def cmd_global(args):
+    """저장소의 모든 종목을 하나의 모델로"""
+    from data_store import DataStore
+    store = DataStore(os.environ.get("STOCK_DATA_ROOT", "../data_store"))
+    if args.features:
+        # 가격 + GDP + PER/PBR/EPS + 지표 (정의가 같으면 캐시 재사용)
+        from feature_store import FeatureStore
+        frames = FeatureStore(store).materialize_all()
+    else:
+        frames = store.read_all('stock')
+    train_global(frames, args, 'checkpoint_global')
 
 
+def cmd_plot(args):
+    """학습/예측 없이 loss_log.csv로 손실곡선만 다시 그림"""
+    from manifest import resolve_weights
+    plot_loss(args, epoch_tag(resolve_weights(SAVE_DIR, args.weights)))
+
+
+def cmd_predict(args):
+    from model import LSTM
+    from plotting import plot_lines
+
+    data    = market_data(*TRAIN_RANGE)
+    data_gt = market_data(*TEST_RANGE)
+
+    # ─── bundle 로드 (scaler 재학습 / 모델 재구성 없이 복원) ──
+    lstm = LSTM.from_bundle(SAVE_DIR, which=args.weights)
+    print(f">>> Loading {args.weights} weights: {lstm.weight_path}")
+    epoch_str = epoch_tag(lstm.weight_path)
+
+    # ─── 손실곡선 플롯 & 저장 ────────────────────────────
+    plot_loss(args, epoch_str)
+
     # ─── 예측 & 시각화 ──────────────────────────────────
     target_idx   = 2
     predict_days = len(data_gt)
-    predicted    = []
-
-    inp   = data[-lstm.sample_size:].to_numpy()
-    out_sz = lstm.output_size
-    iters = predict_days // out_sz
-    rem   = predict_days % out_sz
-
-    for _ in range(iters):
-        p = lstm.predict(inp)
-        predicted.extend(p)
-        inp = np.concatenate([inp[out_sz:], p], axis=0)
-    if rem:
-        p = lstm.predict(inp)
-        predicted.extend(p[:rem])
-
-    arr          = np.array(predicted)
+
+    # 배치 rollout (여러 종목/시작일이면 window를 쌓아서 한 번에 호출)
+    inp = data[-lstm.sample_size:].to_numpy()
+    arr = lstm.forecast(inp, predict_days)[0]
+
     predict_seq  = arr[:, target_idx]
     history_seq  = data.to_numpy()[:, target_idx]
     ground_truth = data_gt.to_numpy()[:, target_idx]
     predict_seq += (history_seq[-1] - predict_seq[0])
 
-    plt.figure(figsize=(14,5))
-    plt.plot(data.index,    history_seq,   label='History',      marker='o')
-    plt.plot(data_gt.index, predict_seq,   label='Forecast',     marker='x')
-    plt.plot(data_gt.index, ground_truth,  label='Ground Truth', marker='s')
-    plt.axvline(x=data_gt.index[0], linestyle='--', color='gray',
-                label='Prediction Start')
-    plt.title("Past True vs Future Predicted vs Ground Truth (3rd Feature)")
-    plt.xlabel("Date"); plt.ylabel("Value")
-    plt.legend(); plt.grid(True)
-    plt.xticks(rotation=45); plt.tight_layout()
-
-    # 저장
-    predict_fig = f"predict_{epoch_str}.png"
-    predict_out = os.path.join(SAVE_DIR, predict_fig)
-    os.makedirs(os.path.dirname(predict_out), exist_ok=True)
-    plt.savefig(predict_out, dpi=150)
-    plt.show()
+    # 긴 history는 downsampling 후 그림 (forecast 구간은 그대로)
+    predict_out = os.path.join(SAVE_DIR, f"predict_{epoch_str}.png")
+    plot_lines(
+        [{'x': data.index,    'y': history_seq,  'label': 'History',      'marker': 'o'},
+         {'x': data_gt.index, 'y': predict_seq,  'label': 'Forecast',     'marker': 'x'},
+         {'x': data_gt.index, 'y': ground_truth, 'label': 'Ground Truth', 'marker': 's'}],
+        predict_out,
+        title="Past True vs Future Predicted vs Ground Truth (3rd Feature)",
+        xlabel="Date", ylabel="Value",
+        vlines=[{'x': data_gt.index[0], 'label': 'Prediction Start'}],
+        dpi=150, show=args.show,
+    )
+
+
+def cmd_all(args):
+    cmd_train(args)
+    cmd_predict(args)
+
+
+COMMANDS = {
+    'train':   cmd_train,
+    'predict': cmd_predict,
+    'all':     cmd_all,
+    'global':  cmd_global,
+    'plot':    cmd_plot,
+}
+
+
+if __name__ == "__main__":
+    args = get_training_args()
+    COMMANDS[args.command](args)
@@ -0,0 +1,26 @@
+"""
+bundle.json / manifest.json 경로 규칙 (TensorFlow 없이 import 가능)
+
+- bundle.json  : LSTM.save_bundle (sample_size / feature / scaler)
+- manifest.json: Checkpoint (latest / best / history weight 경로)
+"""
+import os
+import json
+
+BUNDLE_FILE = "bundle.json"
+MANIFEST_FILE = "manifest.json"
+
+
+def resolve_weights(save_dir, which="latest"):
+    """manifest.json에서 latest/best weight 경로 조회 (파일 경로를 직접 넘겨도 됨)"""
+    if which not in ("latest", "best"):
+        return which
+    manifest_path = os.path.join(save_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No manifest found in {save_dir}")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    entry = manifest.get(which)
+    if entry is None:
+        raise FileNotFoundError(f"No {which} checkpoint in {manifest_path}")
+    return os.path.join(save_dir, entry["path"])
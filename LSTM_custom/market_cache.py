@@ -0,0 +1,106 @@
+import os
+import json
+import pandas as pd
+
+
+def yf_downloader(ticker, start, end):
+    """기본 downloader: yfinance 일봉 (end 미포함)"""
+    import yfinance as yf
+    df = yf.download(ticker, start=start, end=end, progress=False)
+    if isinstance(df.columns, pd.MultiIndex):
+        # 단일 종목이면 (Price, Ticker) -> Price
+        df.columns = df.columns.droplevel(1)
+        df.columns.name = None
+    return df
+
+
+class MarketCache:
+    """
+    종목/기간 단위 로컬 캐시
+    - 이미 받은 구간은 parquet에서 읽고, 빠진 구간만 downloader로 받아서 병합
+    - 받은 구간(빈 결과 포함)은 {ticker}.json에 [start, end) 리스트로 기록
+      (end는 오늘까지로 잘라서 기록, 오늘 / 미래 bar는 매번 다시 요청)
+    downloader(ticker, start, end) -> DatetimeIndex DataFrame 이면 무엇이든 사용 가능
+    (예: pykrx 펀더멘털 = lambda t, s, e: stock.get_market_fundamental(s, e, t))
+    """
+    def __init__(self, cache_dir='market_cache', downloader=yf_downloader):
+        self.cache_dir = cache_dir
+        self.downloader = downloader
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, ticker):
+        name = "".join(c if c.isalnum() or c in "._-" else "_" for c in ticker)
+        base = os.path.join(self.cache_dir, name)
+        return base + ".parquet", base + ".json"
+
+    def _load(self, ticker):
+        data_path, meta_path = self._paths(ticker)
+        if not os.path.exists(meta_path):
+            return None, []
+        with open(meta_path) as f:
+            ranges = [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in json.load(f)["ranges"]]
+        df = pd.read_parquet(data_path) if os.path.exists(data_path) else None
+        return df, ranges
+
+    def _save(self, ticker, df, ranges):
+        data_path, meta_path = self._paths(ticker)
+        if df is not None:
+            df.to_parquet(data_path + ".tmp")
+            os.replace(data_path + ".tmp", data_path)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({"ranges": [[s.isoformat(), e.isoformat()] for s, e in ranges]}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def get(self, ticker, start, end):
+        """[start, end) 구간 데이터 (yf.download와 같은 end 미포함 규칙)"""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        df, ranges = self._load(ticker)
+
+        missing = missing_ranges(ranges, start, end)
+        if missing:
+            parts = [] if df is None else [df]
+            for s, e in missing:
+                print(f">>> cache miss {ticker} [{s.date()} ~ {e.date()})")
+                new = self.downloader(ticker, s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d"))
+                if new is not None and len(new):
+                    new = new.copy()
+                    new.index = pd.to_datetime(new.index)
+                    parts.append(new)
+            if parts:
+                df = pd.concat(parts)
+                df = df[~df.index.duplicated(keep="last")].sort_index()
+            # 오늘 이후(아직 없는 bar)는 받은 구간으로 기록하지 않음 -> 다음 호출에서 다시 요청
+            today = pd.Timestamp.today().normalize()
+            covered = [(s, min(e, today)) for s, e in missing if s < min(e, today)]
+            self._save(ticker, df, merge_ranges(ranges + covered))
+
+        if df is None:
+            return pd.DataFrame()
+        return df[(df.index >= start) & (df.index < end)]
+
+
+def merge_ranges(ranges):
+    """겹치거나 맞닿은 [start, end) 구간 병합"""
+    merged = []
+    for s, e in sorted(ranges):
+        if merged and s <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def missing_ranges(ranges, start, end):
+    """캐시된 구간들로 덮이지 않은 [start, end)의 부분 구간"""
+    missing, cur = [], start
+    for s, e in merge_ranges(ranges):
+        if e <= cur or s >= end:
+            continue
+        if s > cur:
+            missing.append((cur, s))
+        cur = max(cur, e)
+        if cur >= end:
+            break
+    if cur < end:
+        missing.append((cur, end))
+    return missing
@@ -1,3 +1,5 @@
+import os
+import json
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
@@ -7,6 +9,9 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.preprocessing import RobustScaler
 from tensorflow.keras.layers import RepeatVector, TimeDistributed, Dense
 
+from manifest import BUNDLE_FILE, MANIFEST_FILE, resolve_weights
+
+
 class LSTM:
     def __init__(self, sample_size, output_size):
         self.sample_size = sample_size
@@ -15,31 +20,86 @@ class LSTM:
         self.train_input = None
         self.gt_output = None
         self.model = None
+        self.scaled_data = None
         self.scaler = RobustScaler()
+        self.features = None
+        self.runner = None          # export된 추론 함수 (있으면 Keras 대신 사용)
+        self._model_fn = None
 
     def pre_processor(self, data):
+        self.features = [str(c) for c in data.columns]
         scaled_data = self.scaler.fit_transform(data.to_numpy())
+        return self.set_scaled_data(scaled_data)
 
-        data_reshaped = []  
-        gt_output = []
-        data_size = data.shape[0] - (self.sample_size + self.output_size) + 1
+    def set_scaled_data(self, scaled_data):
+        """
+        이미 정규화된 (T, feature) 배열로 window 구성 (scaler는 그대로)
+        memmap을 넘기면 여러 프로세스가 같은 파일을 복사 없이 공유
+        """
+        self.scaled_data = scaled_data
 
-        for current_idx in range(data_size):
-            next_idx = current_idx + self.sample_size
-            data_reshaped.append(scaled_data[current_idx : next_idx])
-            gt_output.append(scaled_data[next_idx : next_idx + self.output_size])
-            
-        self.train_input = np.array(data_reshaped)
-        self.gt_output = np.array(gt_output)
+        data_size = scaled_data.shape[0] - (self.sample_size + self.output_size) + 1
+        if data_size <= 0:
+            raise ValueError("데이터 길이가 sample_size + output_size 보다 짧습니다.")
+
+        # 복사 없이 strided view로 window 생성: (data_size, sample_size, feature)
+        self.train_input = sliding_windows(scaled_data, self.sample_size)[:data_size]
+        self.gt_output = sliding_windows(scaled_data[self.sample_size:], self.output_size)[:data_size]
 
         return self.train_input
 
-    def build_model(self):
-        if self.train_input is None:
-            raise ValueError("train_data가 없습니다. 먼저 pre_processor를 실행하세요.")
+    def make_dataset(self, batch_size, shuffle=True, seed=None, start=0, stop=None):
+        """
+        window를 미리 만들지 않고 배치마다 index로 gather하는 tf.data 파이프라인
+        메모리는 scaled_data 한 벌만 사용 (sample_size와 무관)
+        start/stop: 사용할 window index 범위 (시간 순서 train/val 분할)
+        scaled_data가 memmap이면 tensor로 올리지 않고 배치마다 memmap에서 필요한 행만 읽음
+        """
+        if self.scaled_data is None:
+            raise ValueError("scaled_data가 없습니다. 먼저 pre_processor를 실행하세요.")
+
+        data_size = self.train_input.shape[0]
+        stop = data_size if stop is None else min(stop, data_size)
+        in_offsets  = np.arange(self.sample_size)
+        out_offsets = np.arange(self.sample_size, self.sample_size + self.output_size)
+        feature_size = self.scaled_data.shape[1]
+
+        if isinstance(self.scaled_data, np.memmap):
+            src = self.scaled_data
+
+            def read_batch(idx):
+                x = np.asarray(src[idx[:, None] + in_offsets[None, :]], dtype=np.float32)
+                y = np.asarray(src[idx[:, None] + out_offsets[None, :]], dtype=np.float32)
+                return x, y
+
+            def gather_batch(idx):
+                x, y = tf.numpy_function(read_batch, [idx], [tf.float32, tf.float32])
+                x.set_shape([None, self.sample_size, feature_size])
+                y.set_shape([None, self.output_size, feature_size])
+                return x, y
+        else:
+            data = tf.constant(self.scaled_data, dtype=tf.float32)
+            in_t, out_t = tf.constant(in_offsets, tf.int64), tf.constant(out_offsets, tf.int64)
 
-        input_shape = (self.train_input.shape[1], self.train_input.shape[2])
-        self.feature_size = self.train_input.shape[2]
+            def gather_batch(idx):
+                x = tf.gather(data, idx[:, None] + in_t[None, :])
+                y = tf.gather(data, idx[:, None] + out_t[None, :])
+                return x, y
+
+        ds = tf.data.Dataset.range(start, stop)
+        if shuffle:
+            ds = ds.shuffle(stop - start, seed=seed, reshuffle_each_iteration=True)
+        ds = ds.batch(batch_size).map(gather_batch, num_parallel_calls=tf.data.AUTOTUNE)
+        return ds.prefetch(tf.data.AUTOTUNE)
+
+    def build_model(self, feature_size=None):
+        if feature_size is not None:
+            # bundle에서 복원할 때는 학습 데이터 없이 feature 수만으로 생성
+            self.feature_size = feature_size
+        elif self.train_input is None:
+            raise ValueError("train_data가 없습니다. 먼저 pre_processor를 실행하세요.")
+        else:
+            self.feature_size = self.train_input.shape[2]
 
         model = Sequential()
         model.add(KerasLSTM(128, input_shape=(self.sample_size, self.feature_size), return_sequences=True))    # return_sequences=False
@@ -51,7 +111,7 @@ class LSTM:
         self.model = model
 
     def predict(self, model_input):
-        if self.model is None:
+        if self.model is None and self.runner is None:
             raise ValueError("model이 정의되지 않았습니다. 먼저 build_model() 실행하세요.")
 
         # 정규화
@@ -60,7 +120,7 @@ class LSTM:
             scaled_input = np.expand_dims(scaled_input, axis=0)
 
         # 예측
-        predicted = self.model.predict(scaled_input)
+        predicted = self._call_model(scaled_input.astype(np.float32))
 
         # 역정규화
         output_reshaped = predicted.reshape(-1, self.feature_size)
@@ -68,4 +128,129 @@ class LSTM:
 
         return output_inversed.reshape(self.output_size, self.feature_size)
 
-    
+    def save_bundle(self, save_dir):
+        """
+        추론에 필요한 설정 저장 (bundle.json)
+        - sample_size / output_size / feature 목록
+        - 학습 데이터로 fit된 scaler 파라미터
+        weight 파일과 latest/best 정보는 Checkpoint가 manifest.json에 기록
+        """
+        if self.feature_size is None:
+            raise ValueError("model이 정의되지 않았습니다. 먼저 build_model() 실행하세요.")
+
+        bundle = {
+            "sample_size": self.sample_size,
+            "output_size": self.output_size,
+            "feature_size": self.feature_size,
+            "features": self.features,
+            "scaler": {
+                "params": self.scaler.get_params(),
+                "center": self.scaler.center_.tolist() if self.scaler.center_ is not None else None,
+                "scale": self.scaler.scale_.tolist() if self.scaler.scale_ is not None else None,
+            },
+        }
+        bundle.update(self._bundle_extra())
+        os.makedirs(save_dir, exist_ok=True)
+        path = os.path.join(save_dir, BUNDLE_FILE)
+        with open(path, "w") as f:
+            json.dump(bundle, f, indent=2)
+        return path
+
+    @classmethod
+    def from_bundle(cls, save_dir, which="latest"):
+        """
+        bundle.json + manifest.json만으로 모델 복원 (데이터 다운로드 / scaler 재학습 없음)
+        which: 'latest' | 'best' | weight 파일 경로
+        """
+        lstm = cls.from_bundle_config(save_dir)
+        lstm.build_model(feature_size=lstm.feature_size)
+        lstm.weight_path = resolve_weights(save_dir, which)
+        if lstm.weight_path.endswith(".npz"):
+            from utils import restore_checkpoint_file
+            restore_checkpoint_file(lstm.model, lstm.weight_path, with_optimizer=False)
+        else:
+            lstm.model.load_weights(lstm.weight_path)
+        return lstm
+
+    @classmethod
+    def from_bundle_config(cls, save_dir):
+        """bundle.json의 설정 + scaler만 복원 (Keras 모델은 만들지 않음)"""
+        with open(os.path.join(save_dir, BUNDLE_FILE)) as f:
+            bundle = json.load(f)
+
+        lstm = cls(sample_size=bundle["sample_size"], output_size=bundle["output_size"])
+        lstm.features = bundle["features"]
+        lstm.feature_size = bundle["feature_size"]
+
+        sc = bundle["scaler"]
+        lstm.scaler = RobustScaler(**sc["params"])
+        lstm.scaler.center_ = None if sc["center"] is None else np.asarray(sc["center"])
+        lstm.scaler.scale_ = None if sc["scale"] is None else np.asarray(sc["scale"])
+        lstm.scaler.n_features_in_ = bundle["feature_size"]
+        lstm._load_bundle_extra(bundle)
+        return lstm
+
+    def _bundle_extra(self):
+        """하위 클래스가 bundle.json에 추가로 저장할 항목"""
+        return {}
+
+    def _load_bundle_extra(self, bundle):
+        pass
+
+    def forecast(self, model_input, steps, scalers=None):
+        """
+        여러 입력(종목/시작일/시나리오)을 한 배치로 묶어 autoregressive 예측
+        model_input: (sample_size, feature) 또는 (batch, sample_size, feature) 원본 스케일 입력
+        steps: 예측할 기간(일) 수
+        scalers: 배치 행별 scaler 리스트 (None이면 self.scaler 공용)
+        return: (batch, steps, feature) 원본 스케일 예측
+        """
+        if self.model is None and self.runner is None:
+            raise ValueError("model이 정의되지 않았습니다. 먼저 build_model() 실행하세요.")
+
+        model_input = np.asarray(model_input, dtype=np.float64)
+        if model_input.ndim == 2:
+            model_input = model_input[None]
+        batch = model_input.shape[0]
+        if scalers is not None and len(scalers) != batch:
+            raise ValueError("scalers 길이가 batch 크기와 다릅니다.")
+
+        # 정규화 후 스케일 공간에서 rollout (입력/출력마다 역정규화 반복하지 않음)
+        window = self._transform(model_input, scalers).astype(np.float32)
+        predicted = self._rollout(window, steps, self._call_model)
+        return self._inverse_transform(predicted, scalers)
+
+    def _rollout(self, window, steps, call):
+        """스케일 공간 window (batch, sample_size, feature) -> (batch, steps, feature)"""
+        outputs, produced = [], 0
+        while produced < steps:
+            p = call(window)[:, -self.output_size:]
+            outputs.append(p)
+            produced += p.shape[1]
+            window = np.concatenate([window, p], axis=1)[:, -self.sample_size:]
+        return np.concatenate(outputs, axis=1)[:, :steps]
+
+    def _call_model(self, x):
+        """predict() 대신 tf.function으로 컴파일된 그래프를 직접 호출 (runner가 있으면 runner)"""
+        if self.runner is not None:
+            return self.runner(np.asarray(x, dtype=np.float32))
+        if self._model_fn is None:
+            self._model_fn = tf.function(lambda t: self.model(t, training=False),
+                                         reduce_retracing=True)
+        return self._model_fn(tf.nest.map_structure(tf.convert_to_tensor, x)).numpy()
+
+    def _transform(self, x, scalers=None):
+        if scalers is None:
+            return self.scaler.transform(x.reshape(-1, x.shape[-1])).reshape(x.shape)
+        return np.stack([sc.transform(row) for sc, row in zip(scalers, x)])
+
+    def _inverse_transform(self, x, scalers=None):
+        if scalers is None:
+            return self.scaler.inverse_transform(x.reshape(-1, x.shape[-1])).reshape(x.shape)
+        return np.stack([sc.inverse_transform(row) for sc, row in zip(scalers, x)])
+
+
+def sliding_windows(arr, window):
+    """(T, F) 배열 -> (T - window + 1, window, F) strided view (읽기 전용, 복사 없음)"""
+    view = np.lib.stride_tricks.sliding_window_view(arr, window, axis=0)
+    return view.transpose(0, 2, 1)
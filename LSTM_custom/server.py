@@ -0,0 +1,232 @@
+"""
+로컬 추론 서버 (모델을 한 번만 로드하고 요청을 micro-batch로 묶어서 처리)
+
+    python server.py --model default=checkpoint_saved --port 8500
+    python server.py --model default=checkpoint_saved --tflite float32 --max_batch 16
+
+POST /forecast  {"model": "default", "window": [[...], ...], "steps": 20}
+                -> {"forecast": [[...], ...], "latency_ms": ..., "batch_size": ...}
+GET  /metrics   -> 큐 길이 / 요청 수 / batch 크기 / 지연 시간 분위수
+GET  /health    -> {"status": "ok", "models": [...]}
+
+- 요청은 모델별 큐에 쌓이고, 워커가 첫 요청부터 max_wait_ms 안에 들어온 요청(최대 max_batch개)을
+  한 번의 forecast 배치로 처리 (steps가 다르면 최대 steps로 rollout 후 잘라서 반환)
+- steps는 max_steps 이하만 허용 (요청 하나가 batch 전체의 rollout을 늘리지 않도록)
+"""
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class Metrics:
+    """최근 window개 요청 기준 지연 시간 / batch 크기 통계 (thread-safe)"""
+    def __init__(self, window=10000):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.latency_ms = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+
+    def record_batch(self, size, latencies_ms):
+        with self.lock:
+            self.batches += 1
+            self.requests += size
+            self.batch_sizes.append(size)
+            self.latency_ms.extend(latencies_ms)
+
+    def record_error(self, count=1):
+        with self.lock:
+            self.errors += count
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            lat = np.asarray(self.latency_ms) if self.latency_ms else np.zeros(1)
+            sizes = np.asarray(self.batch_sizes) if self.batch_sizes else np.zeros(1)
+            p50, p90, p99 = np.percentile(lat, [50, 90, 99])
+            return {"requests": self.requests, "errors": self.errors, "batches": self.batches,
+                    "mean_batch_size": float(sizes.mean()), "max_batch_size": int(sizes.max()),
+                    "latency_p50_ms": float(p50), "latency_p90_ms": float(p90),
+                    "latency_p99_ms": float(p99)}
+
+
+class MicroBatcher:
+    """모델 하나의 요청 큐 + 배치 워커 스레드"""
+    def __init__(self, lstm, max_batch=32, max_wait_ms=5.0, max_steps=250):
+        self.lstm = lstm
+        self.max_batch = max_batch
+        self.max_steps = max_steps
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.metrics = Metrics()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, window, steps) -> Future:
+        window = np.asarray(window, dtype=np.float64)
+        expected = (self.lstm.sample_size, self.lstm.feature_size)
+        if window.shape != expected:
+            raise ValueError(f"window shape {window.shape} != {expected}")
+        if isinstance(steps, bool) or not isinstance(steps, (int, float)) or steps != int(steps):
+            raise ValueError(f"steps는 정수여야 합니다: {steps!r}")
+        if not 1 <= steps <= self.max_steps:
+            raise ValueError(f"steps는 1 이상 {self.max_steps} 이하여야 합니다: {steps}")
+        fut = Future()
+        self.queue.put((window, int(steps), fut, time.perf_counter()))
+        return fut
+
+    def _collect(self):
+        """첫 요청을 기다린 뒤 max_wait 동안 max_batch까지 모음"""
+        first = self.queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._stop.set()
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                break
+            windows = np.stack([b[0] for b in batch])
+            steps = max(b[1] for b in batch)
+            try:
+                pred = self.lstm.forecast(windows, steps)
+            except Exception as e:
+                self.metrics.record_error(len(batch))
+                for *_, fut, _ in batch:
+                    fut.set_exception(e)
+                continue
+            now = time.perf_counter()
+            latencies = []
+            for i, (_, n, fut, t0) in enumerate(batch):
+                latencies.append((now - t0) * 1000)
+                fut.set_result((pred[i, :n], len(batch)))
+            self.metrics.record_batch(len(batch), latencies)
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        return dict(self.metrics.snapshot(), queue_depth=self.queue.qsize())
+
+
+def make_handler(batchers, timeout=30):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, body):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "models": list(batchers)})
+            elif self.path == "/metrics":
+                self._send(200, {name: b.stats() for name, b in batchers.items()})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/forecast":
+                return self._send(404, {"error": "not found"})
+            t0 = time.perf_counter()
+            try:
+                req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if not isinstance(req, dict):
+                    raise ValueError("요청 body는 JSON object여야 합니다.")
+                name = req.get("model", "default")
+                if name not in batchers:
+                    return self._send(404, {"error": f"unknown model: {name}"})
+                batcher = batchers[name]
+                fut = batcher.submit(req["window"], req.get("steps", batcher.lstm.output_size))
+            except (ValueError, KeyError, TypeError) as e:
+                return self._send(400, {"error": str(e)})
+            try:
+                pred, batch_size = fut.result(timeout=timeout)
+            except Exception as e:
+                return self._send(500, {"error": str(e)})
+            self._send(200, {"forecast": pred.tolist(), "batch_size": batch_size,
+                             "latency_ms": (time.perf_counter() - t0) * 1000})
+
+        def log_message(self, fmt, *args):
+            pass   # 요청마다 stderr 출력하지 않음 (/metrics로 확인)
+
+    return Handler
+
+
+def load_models(specs, tflite=None, weights="latest") -> dict:
+    """['name=save_dir', ...] -> {name: LSTM} (tflite를 주면 export된 파일 사용)"""
+    from model import LSTM
+    models = {}
+    for spec in specs:
+        name, _, save_dir = spec.rpartition("=")
+        name = name or "default"
+        if tflite:
+            from export import load_tflite
+            models[name] = load_tflite(save_dir, tflite)
+        else:
+            models[name] = LSTM.from_bundle(save_dir, which=weights)
+        # 첫 요청이 그래프 trace 비용을 내지 않도록 미리 한 번 실행
+        lstm = models[name]
+        lstm.forecast(np.zeros((lstm.sample_size, lstm.feature_size)), lstm.output_size)
+        print(f">>> {name}: {lstm.weight_path}")
+    return models
+
+
+def serve(models, host="127.0.0.1", port=8500, max_batch=32, max_wait_ms=5.0, max_steps=250):
+    batchers = {name: MicroBatcher(lstm, max_batch, max_wait_ms, max_steps)
+                for name, lstm in models.items()}
+    server = ThreadingHTTPServer((host, port), make_handler(batchers))
+    server.daemon_threads = True
+    server.batchers = batchers
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='LSTM 추론 서버')
+    parser.add_argument('--model',       nargs='+', default=['default=checkpoint_saved'],
+                        help='name=save_dir (여러 개 가능)')
+    parser.add_argument('--weights',     choices=['latest', 'best'], default='latest')
+    parser.add_argument('--tflite',      default=None, help='export된 tflite 사용 (float32/float16/dynamic)')
+    parser.add_argument('--host',        default='127.0.0.1')
+    parser.add_argument('--port',        type=int, default=8500)
+    parser.add_argument('--max_batch',   type=int, default=32, help='micro-batch 최대 요청 수')
+    parser.add_argument('--max_wait_ms', type=float, default=5.0, help='batch를 모으는 최대 대기 시간')
+    parser.add_argument('--max_steps',   type=int, default=250, help='요청당 허용하는 최대 forecast steps')
+    args = parser.parse_args()
+
+    models = load_models(args.model, args.tflite, args.weights)
+    server = serve(models, args.host, args.port, args.max_batch, args.max_wait_ms,
+                   args.max_steps)
+    print(f">>> Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for b in server.batchers.values():
+            b.close()
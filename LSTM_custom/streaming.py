@@ -0,0 +1,166 @@
+"""
+종목별 상태를 유지하는 streaming 추론
+
+    stream = StreamingForecaster(LSTM.from_bundle('checkpoint_saved'))
+    stream.prime('006400.KS', history)        # 과거 (T, feature) 원본 스케일
+    pred = stream.update(bar, '006400.KS')    # 새 일봉 하나 -> (output_size, feature) 예측
+
+배치 경로(forecast)는 매번 window 전체(sample_size step)를 두 LSTM 층에 다시 통과시킨다.
+모델은 window 시작에서 0 상태로 출발하므로, 여기서는 최근 sample_size개 bar에서 각각 출발한
+상태 체인(chain) sample_size개를 유지하고 새 bar마다 모든 체인을 한 step씩(배치 한 번) 진행한다.
+sample_size step 진행한 체인의 출력이 곧 model(window) 출력이므로 결과는 배치 경로와 같고,
+bar당 순차 연산은 window 길이와 무관하게 1 step이다.
+"""
+import numpy as np
+
+DEFAULT_TICKER = "default"
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _lstm_step(x, h, c, kernel, recurrent, bias):
+    """Keras LSTM cell 한 step (gate 순서 i, f, c, o / sigmoid, tanh)"""
+    z = x @ kernel + h @ recurrent + bias
+    i, f, g, o = np.split(z, 4, axis=-1)
+    c = _sigmoid(f) * c + _sigmoid(i) * np.tanh(g)
+    h = _sigmoid(o) * np.tanh(c)
+    return h, c
+
+
+class _TickerState:
+    """종목 하나의 체인 상태 (slot = 체인이 시작된 tick % sample_size)"""
+    def __init__(self, sample_size, units, feature_size):
+        s = sample_size
+        self.count = 0
+        self.h = [np.zeros((s, u), np.float32) for u in units]
+        self.c = [np.zeros((s, u), np.float32) for u in units]
+        self.out = np.zeros((s, s, feature_size), np.float32)   # 체인별 step 출력
+        self.window = np.zeros((s, feature_size))               # 최근 원본 bar (forecast 연장용)
+
+
+class StreamingForecaster:
+    """
+    LSTM(model.py) 학습 weight를 numpy로 꺼내 종목별 streaming 추론
+    update는 output_size 길이 예측을 반환하고, 더 긴 기간은 forecast_steps로 배치 경로에 위임
+    """
+    def __init__(self, lstm, scalers=None):
+        if lstm.model is None:
+            raise ValueError("model이 정의되지 않았습니다. 먼저 build_model() 실행하세요.")
+        self.lstm = lstm
+        self.sample_size = lstm.sample_size
+        self.output_size = lstm.output_size
+        self.feature_size = lstm.feature_size
+        self.scalers = scalers or {}          # 종목별 scaler (없으면 lstm.scaler)
+        self.states = {}
+
+        *rnn_layers, dense = lstm.model.layers
+        self.cells = [[w.astype(np.float32) for w in layer.get_weights()] for layer in rnn_layers]
+        self.units = [cell[1].shape[0] for cell in self.cells]
+        self.dense_kernel, self.dense_bias = [w.astype(np.float32) for w in dense.get_weights()]
+
+    def _scaler(self, ticker):
+        return self.scalers.get(ticker, self.lstm.scaler)
+
+    def reset(self, ticker=DEFAULT_TICKER):
+        self.states[ticker] = _TickerState(self.sample_size, self.units, self.feature_size)
+
+    def prime(self, ticker, history):
+        """과거 데이터로 상태 초기화 (마지막 2 * sample_size - 1개 bar만 흘려보내면 충분)"""
+        history = np.asarray(history, dtype=np.float64)
+        self.reset(ticker)
+        pred = None
+        for row in history[-(2 * self.sample_size - 1):]:
+            pred = self.update(row, ticker)
+        return pred
+
+    def update(self, bar, ticker=DEFAULT_TICKER):
+        """새 bar(feature,) 반영 -> (output_size, feature) 원본 스케일 예측 (window가 차기 전엔 None)"""
+        return self.update_many({ticker: bar})[ticker]
+
+    def update_many(self, bars: dict) -> dict:
+        """{종목: bar} 여러 종목을 한 번의 배치 step으로 갱신 -> {종목: 예측 또는 None}"""
+        if not bars:
+            return {}
+        s = self.sample_size
+        tickers = list(bars)
+        for t in tickers:
+            if t not in self.states:
+                self.reset(t)
+        states = [self.states[t] for t in tickers]
+
+        raw = np.stack([np.asarray(bars[t], dtype=np.float64).reshape(-1) for t in tickers])
+        scaled = np.stack([self._scaler(t).transform(raw[k:k + 1])[0]
+                           for k, t in enumerate(tickers)]).astype(np.float32)
+
+        for st in states:
+            # 이번 tick에 시작하는 체인은 0 상태에서 출발
+            slot = st.count % s
+            for h, c in zip(st.h, st.c):
+                h[slot] = 0.0
+                c[slot] = 0.0
+
+        # 모든 종목의 체인을 (종목 수 * sample_size) 배치로 묶어 한 step
+        x = np.repeat(scaled, s, axis=0)
+        for layer, (kernel, recurrent, bias) in enumerate(self.cells):
+            h = np.concatenate([st.h[layer] for st in states])
+            c = np.concatenate([st.c[layer] for st in states])
+            h, c = _lstm_step(x, h, c, kernel, recurrent, bias)
+            for k, st in enumerate(states):
+                st.h[layer] = h[k * s:(k + 1) * s]
+                st.c[layer] = c[k * s:(k + 1) * s]
+            x = h
+        y = x @ self.dense_kernel + self.dense_bias
+
+        results = {}
+        for k, (t, st) in enumerate(zip(tickers, states)):
+            ages = (st.count - np.arange(s)) % s
+            st.out[np.arange(s), ages] = y[k * s:(k + 1) * s]
+            st.window = np.concatenate([st.window[1:], raw[k:k + 1]])
+            st.count += 1
+
+            if st.count < s:
+                results[t] = None
+                continue
+            # sample_size step을 채운 체인 = 현재 window 시작 tick에 출발한 체인
+            done = st.count % s
+            pred = st.out[done][-self.output_size:]
+            results[t] = self._scaler(t).inverse_transform(pred.astype(np.float64))
+        return results
+
+    def forecast_steps(self, ticker, steps):
+        """output_size보다 긴 기간은 현재 window로 배치 rollout"""
+        st = self.states[ticker]
+        if st.count < self.sample_size:
+            raise ValueError("window가 아직 채워지지 않았습니다.")
+        scaler = self.scalers.get(ticker)
+        return self.lstm.forecast(st.window, steps,
+                                  scalers=None if scaler is None else [scaler])[0]
+
+    def save(self, path):
+        """종목별 상태를 npz로 저장 (다음 날 prime 없이 이어서 update)"""
+        arrays = {}
+        for i, (t, st) in enumerate(self.states.items()):
+            arrays[f"{i}/ticker"] = np.array(t)
+            arrays[f"{i}/count"] = np.int64(st.count)
+            arrays[f"{i}/out"] = st.out
+            arrays[f"{i}/window"] = st.window
+            for layer in range(len(self.units)):
+                arrays[f"{i}/h{layer}"] = st.h[layer]
+                arrays[f"{i}/c{layer}"] = st.c[layer]
+        np.savez(path, **arrays)
+
+    def load(self, path):
+        with np.load(path) as f:
+            n = len({k.split("/")[0] for k in f.files})
+            for i in range(n):
+                t = str(f[f"{i}/ticker"])
+                self.reset(t)
+                st = self.states[t]
+                st.count = int(f[f"{i}/count"])
+                st.out = f[f"{i}/out"].copy()
+                st.window = f[f"{i}/window"].copy()
+                st.h = [f[f"{i}/h{layer}"].copy() for layer in range(len(self.units))]
+                st.c = [f[f"{i}/c{layer}"].copy() for layer in range(len(self.units))]
+        return self
@@ -0,0 +1,200 @@
+"""
+하이퍼파라미터 sweep (sample_size / batch_size / epochs)
+
+    python sweep.py --sample_size 10 20 40 --batch_size 32 64 --epochs 20
+    python sweep.py --search random --trials 12 --sample_size 10 20 30 40 60 --batch_size 16 32 64
+
+- 데이터 다운로드 + scaler fit은 한 번만 하고, 정규화된 배열을 sweep_saved/scaled.npy로 저장
+  scaler는 모든 trial의 검증 구간보다 앞선 행으로만 fit (검증 기간 정보 누출 방지)
+- trial 워커는 np.load(mmap_mode='r')로 같은 파일을 공유하고 window는 tf.data로 배치마다
+  memmap에서 gather (window 전체를 복사하지 않음)
+- trial은 process pool로 코어에 분배, 검증 손실이 같은 epoch의 다른 trial 중앙값보다 나쁘면 조기 종료
+- 결과는 sweep_saved/results.csv (val_loss 오름차순)
+"""
+import os
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import RobustScaler
+
+SPACE_KEYS = ("sample_size", "batch_size", "epochs")
+
+
+def make_trials(space: dict, search="grid", n_trials=None, seed=0) -> list:
+    """space: {'sample_size': [..], 'batch_size': [..], 'epochs': [..]} -> trial 설정 리스트"""
+    grid = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+    if search == "grid":
+        return grid
+    rng = random.Random(seed)
+    return rng.sample(grid, min(n_trials or len(grid), len(grid)))
+
+
+def prepare_dataset(data, save_dir, fit_rows=None) -> str:
+    """앞 fit_rows행(기본 전체)으로 scaler fit 후 정규화 배열을 .npy로 저장 (trial 공통 입력)"""
+    os.makedirs(save_dir, exist_ok=True)
+    values = data.to_numpy()
+    scaler = RobustScaler().fit(values[:fit_rows])
+    scaled = scaler.transform(values).astype(np.float32)
+    path = os.path.join(save_dir, "scaled.npy")
+    np.save(path, scaled)
+    with open(os.path.join(save_dir, "scaler.json"), "w") as f:
+        json.dump({"features": [str(c) for c in data.columns], "fit_rows": fit_rows,
+                   "center": scaler.center_.tolist(), "scale": scaler.scale_.tolist()}, f, indent=2)
+    return path
+
+
+def split_windows(n_windows, window_span, val_fraction):
+    """
+    시간 순서 train/val 분할 -> (train 끝, val 시작) window index
+    train window의 정답 구간이 val 입력과 겹치지 않도록 window_span만큼 간격
+    """
+    n_val = max(1, int(n_windows * val_fraction))
+    val_start = n_windows - n_val
+    train_end = val_start - window_span + 1
+    if train_end <= 0:
+        raise ValueError("데이터가 짧아 train/val을 나눌 수 없습니다.")
+    return train_end, val_start
+
+
+def val_row_start(n_rows, sample_size, val_fraction):
+    """sample_size trial의 첫 검증 window가 시작하는 행 (output_size = sample_size)"""
+    span = 2 * sample_size
+    _, val_start = split_windows(n_rows - span + 1, span, val_fraction)
+    return val_start
+
+
+_shared = {}
+
+
+def _init_worker(threads, board, lock):
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    _shared["board"] = board
+    _shared["lock"] = lock
+
+
+def _median_stopping(trial_id, grace_epochs, min_trials):
+    """
+    median stopping rule: epoch별 val_loss를 공유 보드에 기록하고
+    grace_epochs 이후 먼저 기록한 다른 trial(min_trials개 이상)의 중앙값보다 나쁘면 중단
+    """
+    import tensorflow as tf
+
+    class MedianStopping(tf.keras.callbacks.Callback):
+        stopped_epoch = None
+
+        def on_epoch_end(self, epoch, logs=None):
+            epoch_idx, val_loss = epoch + 1, float(logs["val_loss"])
+            with _shared["lock"]:
+                others = _shared["board"].get(epoch_idx, [])
+                _shared["board"][epoch_idx] = others + [val_loss]
+            if epoch_idx >= grace_epochs and len(others) >= min_trials \
+                    and val_loss > float(np.median(others)):
+                self.stopped_epoch = epoch_idx
+                self.model.stop_training = True
+                print(f"[trial {trial_id}] epoch {epoch_idx} 조기 종료 "
+                      f"(val_loss {val_loss:.4f} > median {np.median(others):.4f})")
+
+    return MedianStopping()
+
+
+def run_trial(trial_id, config, data_path, opts) -> dict:
+    import tensorflow as tf
+    from model import LSTM
+
+    t0 = time.perf_counter()
+    tf.keras.utils.set_random_seed(opts["seed"] + trial_id)
+
+    scaled = np.load(data_path, mmap_mode="r")
+    lstm = LSTM(sample_size=config["sample_size"], output_size=config["sample_size"])
+    lstm.set_scaled_data(scaled)
+    lstm.build_model()
+
+    train_end, val_start = split_windows(len(lstm.train_input),
+                                         lstm.sample_size + lstm.output_size,
+                                         opts["val_fraction"])
+    stopper = _median_stopping(trial_id, opts["grace_epochs"], opts["min_trials"])
+    early = tf.keras.callbacks.EarlyStopping(patience=opts["patience"], restore_best_weights=False)
+    # window는 배치마다 memmap에서 gather (strided view를 fit에 넘기면 전체가 복사됨)
+    history = lstm.model.fit(
+        lstm.make_dataset(config["batch_size"], seed=opts["seed"] + trial_id, stop=train_end),
+        validation_data=lstm.make_dataset(config["batch_size"], shuffle=False, start=val_start),
+        epochs=config["epochs"], callbacks=[stopper, early], verbose=0,
+    )
+
+    val_loss = history.history["val_loss"]
+    best = int(np.argmin(val_loss))
+    return dict(config, trial=trial_id,
+                val_loss=float(val_loss[best]), best_epoch=best + 1,
+                train_loss=float(history.history["loss"][best]),
+                epochs_run=len(val_loss),
+                pruned=stopper.stopped_epoch is not None,
+                seconds=time.perf_counter() - t0)
+
+
+def run_sweep(data_path, trials, opts, workers=None, threads_per_worker=1) -> pd.DataFrame:
+    workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+    ctx = mp.get_context("spawn")
+    with ctx.Manager() as manager:
+        board, lock = manager.dict(), manager.Lock()
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                                 initargs=(threads_per_worker, board, lock)) as pool:
+            futures = [pool.submit(run_trial, i, cfg, data_path, opts) for i, cfg in enumerate(trials)]
+            for fut in as_completed(futures):
+                r = fut.result()
+                results.append(r)
+                print(f"[trial {r['trial']:>3}] {json.dumps({k: r[k] for k in SPACE_KEYS})} "
+                      f"val_loss {r['val_loss']:.4f} (epoch {r['best_epoch']}/{r['epochs_run']}) "
+                      f"{r['seconds']:.1f}s")
+    return pd.DataFrame(results).sort_values("val_loss").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Hyperparameter sweep')
+    parser.add_argument('--ticker',       default='006400.KS')
+    parser.add_argument('--start',        default='2012-01-01')
+    parser.add_argument('--end',          default='2017-02-02')
+    parser.add_argument('--sample_size',  type=int, nargs='+', default=[10, 20, 40])
+    parser.add_argument('--batch_size',   type=int, nargs='+', default=[32, 64])
+    parser.add_argument('--epochs',       type=int, nargs='+', default=[20])
+    parser.add_argument('--search',       choices=['grid', 'random'], default='grid')
+    parser.add_argument('--trials',       type=int, default=None, help='random search trial 수')
+    parser.add_argument('--val_fraction', type=float, default=0.2, help='마지막 구간 검증 비율')
+    parser.add_argument('--grace_epochs', type=int, default=3,  help='조기 종료 판단 전 최소 epoch')
+    parser.add_argument('--min_trials',   type=int, default=2,  help='중앙값 비교에 필요한 최소 trial 수')
+    parser.add_argument('--patience',     type=int, default=5,  help='val_loss 개선 없으면 중단할 epoch 수')
+    parser.add_argument('--workers',      type=int, default=None)
+    parser.add_argument('--threads_per_worker', type=int, default=1)
+    parser.add_argument('--seed',         type=int, default=0)
+    parser.add_argument('--save_dir',     default='sweep_saved')
+    args = parser.parse_args()
+
+    from market_cache import MarketCache
+    data = MarketCache('market_cache').get(args.ticker, args.start, args.end)
+    # 모든 trial의 검증 구간보다 앞선 행으로만 scaler fit
+    fit_rows = min(val_row_start(len(data), s, args.val_fraction) for s in args.sample_size)
+    data_path = prepare_dataset(data, args.save_dir, fit_rows)
+
+    space = {k: getattr(args, k) for k in SPACE_KEYS}
+    trials = make_trials(space, args.search, args.trials, args.seed)
+    print(f">>> {args.ticker} {len(data)}행, trial {len(trials)}개 ({args.search})")
+
+    opts = {k: getattr(args, k) for k in
+            ("val_fraction", "grace_epochs", "min_trials", "patience", "seed")}
+    t0 = time.perf_counter()
+    df = run_sweep(data_path, trials, opts, args.workers, args.threads_per_worker)
+
+    out = os.path.join(args.save_dir, "results.csv")
+    df.to_csv(out, index=False)
+    print(f"\n{df.to_string(index=False)}")
+    print(f"\n총 소요 시간 : {time.perf_counter() - t0:.1f}s  ->  {out}")
@@ -1,21 +1,106 @@
 import os
+import json
+import time
 import tensorflow as tf
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import MANIFEST_FILE
+
+
+def optimizer_variables(optimizer):
+    """Keras 2(메서드) / Keras 3(속성) 모두에서 optimizer 변수 리스트"""
+    variables = optimizer.variables
+    return list(variables() if callable(variables) else variables)
+
+
+def save_checkpoint_file(path, weights, opt_weights, epoch):
+    """weight + optimizer 상태 + epoch을 npz 하나로 저장 (임시 파일 후 교체)"""
+    arrays = {f"w_{i:04d}": w for i, w in enumerate(weights)}
+    arrays.update({f"opt_{i:04d}": w for i, w in enumerate(opt_weights)})
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, epoch=np.int64(epoch), **arrays)
+    os.replace(tmp, path)
+
+
+def restore_checkpoint_file(model, path, with_optimizer=True):
+    """save_checkpoint_file로 저장한 파일 복원 -> 저장 당시 epoch"""
+    with np.load(path) as ckpt:
+        weights = [ckpt[k] for k in sorted(ckpt.files) if k.startswith("w_")]
+        opt_weights = [ckpt[k] for k in sorted(ckpt.files) if k.startswith("opt_")]
+        epoch = int(ckpt["epoch"])
+    model.set_weights(weights)
+
+    if with_optimizer and opt_weights and model.optimizer is not None:
+        # 아직 한 번도 학습하지 않은 optimizer는 변수부터 생성
+        if len(optimizer_variables(model.optimizer)) != len(opt_weights):
+            model.optimizer.build(model.trainable_variables)
+        opt_vars = optimizer_variables(model.optimizer)
+        if len(opt_vars) == len(opt_weights):
+            for var, value in zip(opt_vars, opt_weights):
+                var.assign(value)
+        else:
+            print(f">>> optimizer 상태 불일치 ({len(opt_vars)} != {len(opt_weights)}), weight만 복원")
+    return epoch
+
+
+def trim_epoch_log(path, last_epoch):
+    """epoch 열이 첫 번째인 csv 로그에서 last_epoch 이후 행 제거 (resume 시 다시 학습할 구간)"""
+    with open(path) as f:
+        lines = f.readlines()
+    kept = lines[:1] + [l for l in lines[1:]
+                        if l.strip() and int(l.split(",")[0]) <= last_epoch]
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.writelines(kept)
+    os.replace(tmp, path)
 
 
 class Checkpoint(tf.keras.callbacks.Callback):
-    def __init__(self, save_every: int):
+    """
+    - 매 epoch 손실 통계를 loss_log.csv에 기록
+    - save_every epoch마다 weight/optimizer를 스냅샷 후 백그라운드 스레드에서 저장
+    - 최근 keep_last개 + best 체크포인트만 유지 (manifest.json)
+    - resume=True면 기존 로그/manifest를 이어서 사용, restore()로 마지막 체크포인트 복원
+    """
+    def __init__(self, save_every: int, save_dir: str = 'checkpoint_saved',
+                 keep_last: int = 3, async_save: bool = True, resume: bool = False):
         super().__init__()
         self.save_every = save_every
-        self.save_dir   = 'checkpoint_saved'
+        self.save_dir   = save_dir
+        self.keep_last  = keep_last
         self.loss_log   = os.path.join(self.save_dir, "loss_log.csv")
         self.weight_dir = os.path.join(self.save_dir, "weight")
+        self.manifest_path = os.path.join(self.save_dir, MANIFEST_FILE)
+        self.initial_epoch = 0
+        self._executor  = ThreadPoolExecutor(max_workers=1) if async_save else None
+        self._pending   = []
 
-        os.makedirs(self.save_dir, exist_ok=True) 
-        os.makedirs(self.weight_dir, exist_ok=True)  
+        os.makedirs(self.save_dir, exist_ok=True)
+        os.makedirs(self.weight_dir, exist_ok=True)
 
-        with open(self.loss_log, "w") as f:
-            f.write("epoch,mean_loss,std_loss\n")
+        self.manifest = {"latest": None, "best": None, "history": []}
+        if resume and os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest.update(json.load(f))
+
+        if not (resume and os.path.exists(self.loss_log)):
+            with open(self.loss_log, "w") as f:
+                f.write("epoch,mean_loss,std_loss\n")
+
+    def restore(self, model):
+        """
+        manifest의 latest 체크포인트(weight + optimizer) 복원 -> fit의 initial_epoch
+        이후 epoch의 로그는 다시 학습하므로 잘라냄
+        """
+        latest = self.manifest.get("latest")
+        if latest is None or not latest["path"].endswith(".npz"):
+            return 0
+        path = os.path.join(self.save_dir, latest["path"])
+        self.initial_epoch = restore_checkpoint_file(model, path)
+        print(f">>> Resumed from {path} (epoch {self.initial_epoch})")
+        trim_epoch_log(self.loss_log, self.initial_epoch)
+        return self.initial_epoch
 
     def on_epoch_begin(self, epoch, logs=None):
         # 매 에포크 시작 시 배치 손실을 담을 리스트 초기화
@@ -31,11 +116,150 @@ class Checkpoint(tf.keras.callbacks.Callback):
         mean_loss = float(np.mean(self._batch_losses))
         std_loss  = float(np.std(self._batch_losses))
 
+        with open(self.loss_log, "a") as f:
+            f.write(f"{epoch_idx},{mean_loss:.4f},{std_loss:.4f}\n")
+
         if epoch_idx % self.save_every == 0:
-            fname = f"model_weights_epoch_{epoch_idx:03d}.h5"
+            fname = f"model_epoch_{epoch_idx:03d}.ckpt.npz"
             path  = os.path.join(self.weight_dir, fname)
-            self.model.save_weights(path)
-            print(f"[epochs : {epoch_idx}] Saved weights to {path}")
 
-            with open(self.loss_log, "a") as f:
-                f.write(f"{epoch_idx},{mean_loss:.4f},{std_loss:.4f}\n")
\ No newline at end of file
+            # 학습 스레드에서는 numpy 스냅샷만 뜨고, 파일 쓰기는 백그라운드로
+            weights = self.model.get_weights()
+            opt_weights = [v.numpy() for v in optimizer_variables(self.model.optimizer)]
+            job = (path, weights, opt_weights, epoch_idx, mean_loss)
+            if self._executor is None:
+                self._write(*job)
+            else:
+                self._pending.append(self._executor.submit(self._write, *job))
+
+    def on_train_end(self, logs=None):
+        self.wait()
+
+    def wait(self):
+        """대기 중인 백그라운드 저장이 끝날 때까지 대기 (에러는 여기서 전달)"""
+        pending, self._pending = self._pending, []
+        for fut in pending:
+            fut.result()
+
+    def _write(self, path, weights, opt_weights, epoch_idx, mean_loss):
+        save_checkpoint_file(path, weights, opt_weights, epoch_idx)
+        print(f"[epochs : {epoch_idx}] Saved weights to {path}")
+        self._update_manifest(epoch_idx, mean_loss, path)
+
+    def _update_manifest(self, epoch_idx, mean_loss, path):
+        """latest / best(mean_loss 최소) 기록 후 오래된 체크포인트 정리"""
+        entry = {"epoch": epoch_idx, "mean_loss": mean_loss,
+                 "path": os.path.relpath(path, self.save_dir)}
+        self.manifest["latest"] = entry
+        best = self.manifest["best"]
+        if best is None or mean_loss <= best["mean_loss"]:
+            self.manifest["best"] = entry
+
+        # resume 시 재학습으로 덮이는 이후 epoch 기록은 history에서 제외
+        old_history = self.manifest["history"]
+        history = [h for h in old_history if h["epoch"] < epoch_idx] + [entry]
+        keep = history[-self.keep_last:] if self.keep_last > 0 else [entry]
+        keep_paths = {h["path"] for h in keep} | {self.manifest["best"]["path"]}
+        self.manifest["history"] = [h for h in history if h["path"] in keep_paths]
+
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+        # manifest 갱신 후 삭제 (중간에 죽어도 manifest가 없는 파일을 가리키지 않음)
+        for h in old_history:
+            if h["path"] not in keep_paths:
+                old = os.path.join(self.save_dir, h["path"])
+                if os.path.exists(old):
+                    os.remove(old)
+
+
+def current_rss_mb():
+    """현재 프로세스 RSS(MB) - /proc가 없으면 ru_maxrss(최대값)로 대체"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Throughput(tf.keras.callbacks.Callback):
+    """
+    epoch별 학습 처리량 / 지연 시간 기록 (train_metrics.csv, loss_log.csv와 같은 폴더)
+    - samples_per_sec : epoch 전체 샘플 / epoch 소요 시간
+    - step_p50/p90/p99_ms : 배치 begin ~ end (연산 step) 지연 시간 분위수
+    - compute_sec / data_sec : 연산 step 시간 합 / 배치 사이(데이터 준비 + 콜백) 시간 합
+    - peak_rss_mb : epoch 중 관측한 최대 RSS
+    profile_epochs=(start, end)면 해당 epoch 구간(1부터 시작, end 포함)의 TF profiler trace 저장
+    resume=True면 기존 로그를 이어 쓰되 initial_epoch(Checkpoint.restore 결과) 이후 행은 잘라냄
+    """
+    COLUMNS = ["epoch", "samples", "seconds", "samples_per_sec",
+               "step_p50_ms", "step_p90_ms", "step_p99_ms",
+               "compute_sec", "data_sec", "peak_rss_mb"]
+
+    def __init__(self, batch_size: int, num_samples: int = None, save_dir: str = 'checkpoint_saved',
+                 profile_epochs=None, resume: bool = False, initial_epoch: int = 0):
+        super().__init__()
+        self.batch_size  = batch_size
+        self.num_samples = num_samples
+        self.metrics_log = os.path.join(save_dir, "train_metrics.csv")
+        self.profile_dir = os.path.join(save_dir, "profile")
+        self.profile_epochs = profile_epochs
+        self._profiling  = False
+
+        os.makedirs(save_dir, exist_ok=True)
+        if resume and os.path.exists(self.metrics_log):
+            trim_epoch_log(self.metrics_log, initial_epoch)
+        else:
+            with open(self.metrics_log, "w") as f:
+                f.write(",".join(self.COLUMNS) + "\n")
+
+    def on_epoch_begin(self, epoch, logs=None):
+        epoch_idx = epoch + 1
+        if self.profile_epochs and epoch_idx == self.profile_epochs[0] and not self._profiling:
+            tf.profiler.experimental.start(self.profile_dir)
+            self._profiling = True
+
+        self._step_times = []
+        self._data_time  = 0.0
+        self._batches    = 0
+        self._peak_rss   = current_rss_mb()
+        self._epoch_start = time.perf_counter()
+        self._last_end   = self._epoch_start
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._batch_start = time.perf_counter()
+        self._data_time += self._batch_start - self._last_end
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._last_end = time.perf_counter()
+        self._step_times.append(self._last_end - self._batch_start)
+        self._batches += 1
+        self._peak_rss = max(self._peak_rss, current_rss_mb())
+
+    def on_epoch_end(self, epoch, logs=None):
+        epoch_idx = epoch + 1
+        seconds = time.perf_counter() - self._epoch_start
+        samples = self.num_samples or self._batches * self.batch_size
+        steps_ms = np.asarray(self._step_times) * 1000 if self._step_times else np.zeros(1)
+        p50, p90, p99 = np.percentile(steps_ms, [50, 90, 99])
+
+        row = [epoch_idx, samples, seconds, samples / seconds if seconds else 0.0,
+               p50, p90, p99, float(np.sum(self._step_times)), self._data_time, self._peak_rss]
+        with open(self.metrics_log, "a") as f:
+            f.write(",".join(str(v) if isinstance(v, int) else f"{v:.4f}" for v in row) + "\n")
+
+        if self._profiling and epoch_idx >= self.profile_epochs[1]:
+            self._stop_profiler()
+
+    def on_train_end(self, logs=None):
+        self._stop_profiler()
+
+    def _stop_profiler(self):
+        if self._profiling:
+            tf.profiler.experimental.stop()
+            self._profiling = False
+            print(f">>> Profiler trace saved to {self.profile_dir}")
@@ -1,68 +1,93 @@
-from audioop import add
 import pandas as pd
-import os
+
+from data_store import DataStore
+
+# date_type -> 키로 사용할 Period 주기
+PERIOD_FREQ = {
+    "day": "D",
+    "week": "W-MON",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+
+
+def _to_datetime_index(index_list):
+    """datetime-like / Period 리스트를 DatetimeIndex로 변환"""
+    if isinstance(index_list, pd.PeriodIndex):
+        return index_list.to_timestamp()
+    if len(index_list) and isinstance(index_list[0], pd.Period):
+        return pd.PeriodIndex(index_list).to_timestamp()
+    return pd.DatetimeIndex(index_list)
+
 
 def unify_index(index_list, date_type):
     """
     index_list: datetime-like 리스트
-    date_type: 'year' | 'month' | 'day' | 'week'
+    date_type: 'year' | 'quarter' | 'month' | 'day' | 'week'
     """
-    idx = pd.DatetimeIndex(index_list)
+    idx = _to_datetime_index(index_list)
     if date_type == "week":
         # 주 시작(월요일)로 내림해서 키 생성 (예: 2025-06-02~08 -> '25-06-02')
         wk_start = idx.to_period("W-MON").start_time
         return wk_start.strftime("%y-%m-%d").tolist()
+    if date_type == "quarter":
+        return [f"{p.year % 100:02d}Q{p.quarter}" for p in idx.to_period("Q")]
     fmt = {"year": "%y", "month": "%y-%m", "day": "%y-%m-%d"}[date_type]
     return idx.strftime(fmt).tolist()
 
 
+def date_keys(index_list, date_type):
+    """
+    unify_index와 같은 기준의 정수 키(Period ordinal) 배열
+    문자열 포맷팅 없이 해시 조인에 바로 쓸 수 있음
+    """
+    idx = _to_datetime_index(index_list)
+    return idx.to_period(PERIOD_FREQ[date_type]).asi8
+
+
 def add_col(df_orig, df_add, date_type):
+    """
+    df_orig의 각 행에 같은 기간 키(date_type)를 가진 df_add의 값을 붙임
+    - 같은 키가 df_add에 여러 번 있으면 마지막 값 우선
+    - 매칭되지 않은 행: 새 컬럼은 NaN, 기존 컬럼은 원래 값 유지
+    """
     df_orig = df_orig.copy()
 
-    # 인덱스 -> 키 리스트 변환
-    orig_index_list = df_orig.index.to_list()
-    add_index_list  = df_add.index.to_list()
+    orig_keys = date_keys(df_orig.index, date_type)
+    add_keys  = date_keys(df_add.index,  date_type)
 
-    orig_key_list = unify_index(orig_index_list, date_type)
-    add_key_list  = unify_index(add_index_list,  date_type)
+    # 키 -> df_add 행 (중복 키는 마지막 값 우선)
+    df_add = df_add.set_axis(add_keys, axis=0)
+    df_add = df_add[~df_add.index.duplicated(keep="last")]
 
-    if date_type == "week":
-        # 같은 주는 같은 키로 매칭: add의 주단위 값으로 orig의 해당 주(월~일) 채움
-        key_to_row = {k: j for j, k in enumerate(add_key_list)}  # 마지막 값 우선
-        for i, o_key in enumerate(orig_key_list):
-            j = key_to_row.get(o_key)
-            if j is None:
-                continue
-            for col in df_add.columns:
-                df_orig.loc[orig_index_list[i], col] = df_add.iloc[j][col]
+    # 해시 인덱스로 한 번에 정렬 (O(N + M))
+    aligned = df_add.reindex(orig_keys)
+    aligned.index = df_orig.index
+    matched = df_add.index.get_indexer(orig_keys) >= 0
+    if not matched.any():
+        # 매칭이 하나도 없으면 기존처럼 컬럼을 추가하지 않음
         return df_orig
 
-    # day/month/year는 기존 방식 그대로
-    for i, o_key in enumerate(orig_key_list):
-        for j, a_key in enumerate(add_key_list):
-            if o_key == a_key:
-                for col in df_add.columns:
-                    df_orig.loc[orig_index_list[i], col] = df_add.iloc[j][col]
+    for col in df_add.columns:
+        if col in df_orig.columns:
+            df_orig[col] = aligned[col].where(matched, df_orig[col])
+        else:
+            df_orig[col] = aligned[col]
 
     return df_orig
 
 if __name__ == "__main__":
-    stk_pth = "./stk_data/ship_stock_prices.xlsx"
-    df_stk = pd.read_excel(stk_pth, header=0, index_col=0)
-    df_stk.index = pd.to_datetime(df_stk.index).date 
-    
-    
-    ship_pth = "./economic_data/new_tanker_ship_price_20250604_20250914.xlsx"
-    ecos_pth = "./economic_data/usd_krw_20250704_20251102.xlsx"
-    add_dic = [("ecos", "day", ecos_pth), ("ship_price", "week", ship_pth)]
-
-    fname = "ship_stock_prices"
-    for add_name, date_type, add_pth in add_dic:
-        df_add = pd.read_excel(add_pth, header=0, index_col=0)
-        df_stk = add_col(df_stk, df_add, date_type=date_type)
-        fname = fname + f"_{add_name}"
-    fname = fname + ".xlsx"
-    
-    df_stk.to_excel(f"./stk_data/{fname}.xlsx")
-    print(f"{fname}.xlsx 저장 완료")
+    store = DataStore()
+
+    # (저장소 source, key, date_type)
+    add_dic = [("ecos", "usd_krw", "day"), ("ship_price", "new_tanker", "week")]
+
+    for code in store.keys("stock"):
+        df_stk = store.read("stock", code)
+        for source, key, date_type in add_dic:
+            df_add = store.read(source, key)
+            df_stk = add_col(df_stk, df_add, date_type=date_type)
 
+        save_path = store.write(df_stk, "merged", code)
+        print(f"{code} 저장 완료 : {save_path}")
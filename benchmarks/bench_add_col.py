@@ -0,0 +1,100 @@
+"""
+add_col 벤치마크: 기존 O(N×M) 루프 구현 vs 해시 조인 구현
+
+실행: python benchmarks/bench_add_col.py --rows 10000 --add_rows 10000
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from add_col import add_col, unify_index
+
+
+def add_col_loop(df_orig, df_add, date_type):
+    """기존(baseline) 구현 - 비교 기준용으로 그대로 보존"""
+    df_orig = df_orig.copy()
+
+    orig_index_list = df_orig.index.to_list()
+    add_index_list  = df_add.index.to_list()
+
+    orig_key_list = unify_index(orig_index_list, date_type)
+    add_key_list  = unify_index(add_index_list,  date_type)
+
+    if date_type == "week":
+        key_to_row = {k: j for j, k in enumerate(add_key_list)}
+        for i, o_key in enumerate(orig_key_list):
+            j = key_to_row.get(o_key)
+            if j is None:
+                continue
+            for col in df_add.columns:
+                df_orig.loc[orig_index_list[i], col] = df_add.iloc[j][col]
+        return df_orig
+
+    for i, o_key in enumerate(orig_key_list):
+        for j, a_key in enumerate(add_key_list):
+            if o_key == a_key:
+                for col in df_add.columns:
+                    df_orig.loc[orig_index_list[i], col] = df_add.iloc[j][col]
+
+    return df_orig
+
+
+# date_type별 df_add 최대 행 수 (100년 이내)
+MAX_ADD_ROWS = {"month": 1200, "quarter": 400, "year": 100}
+
+
+def make_frames(n_orig, n_add, date_type, seed=0):
+    """합성 주가(df_orig) / 추가 지표(df_add) 생성"""
+    rng = np.random.default_rng(seed)
+    orig_idx = pd.bdate_range("2000-01-03", periods=n_orig)
+    freq = {"day": "D", "week": "W-MON", "month": "MS",
+            "quarter": "QS", "year": "YS"}[date_type]
+    add_idx = pd.date_range("2000-01-01", periods=n_add, freq=freq)
+
+    df_orig = pd.DataFrame({
+        "Close":  rng.uniform(1e3, 1e5, n_orig),
+        "Volume": rng.integers(1, 1_000_000, n_orig).astype(float),
+    }, index=orig_idx)
+    df_add = pd.DataFrame({
+        "usd_krw": rng.uniform(1000, 1500, n_add),
+        "rate":    rng.uniform(0, 5, n_add),
+    }, index=add_idx)
+    return df_orig, df_add
+
+
+def timeit(fn, *args, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="add_col benchmark")
+    parser.add_argument("--rows",      type=int, default=10000, help="df_orig 행 수")
+    parser.add_argument("--add_rows",  type=int, default=10000, help="df_add 행 수")
+    parser.add_argument("--date_types", nargs="+",
+                        default=["day", "week", "month", "quarter", "year"])
+    parser.add_argument("--skip_loop", action="store_true", help="기존 루프 구현 생략")
+    args = parser.parse_args()
+
+    print(f"{'date_type':>8} | {'loop(s)':>10} | {'vectorized(s)':>13} | {'speedup':>8}")
+    for date_type in args.date_types:
+        # 기존 구현의 키는 두 자리 연도(%y)라 100년을 넘기면 키가 겹침 -> 기간 수 제한
+        n_add = min(args.add_rows, MAX_ADD_ROWS.get(date_type, args.add_rows))
+        df_orig, df_add = make_frames(args.rows, n_add, date_type)
+
+        t_vec, out_vec = timeit(add_col, df_orig, df_add, date_type, repeat=3)
+        if args.skip_loop:
+            print(f"{date_type:>8} | {'-':>10} | {t_vec:>13.4f} | {'-':>8}")
+            continue
+
+        t_loop, out_loop = timeit(add_col_loop, df_orig, df_add, date_type)
+        pd.testing.assert_frame_equal(out_vec, out_loop, check_dtype=False)
+        print(f"{date_type:>8} | {t_loop:>10.3f} | {t_vec:>13.4f} | {t_loop / t_vec:>7.0f}x")
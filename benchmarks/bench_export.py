@@ -0,0 +1,110 @@
+"""
+Keras 추론 vs TFLite export(float32 / float16 / dynamic) 정확도·지연 시간 비교 (df_naver_add.csv)
+
+실행: python benchmarks/bench_export.py --save_dir LSTM_custom/checkpoint_saved
+      (bundle/weight가 없거나 bundle의 feature가 데이터에 없으면
+       임시 폴더에 --epochs만큼 빠르게 학습한 모델로 비교, save_dir는 건드리지 않음)
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "LSTM_custom"))
+from model import LSTM, BUNDLE_FILE, MANIFEST_FILE
+from export import QUANTIZE, export_tflite, load_tflite
+
+
+def latency_ms(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times)) * 1000
+
+
+def load_or_train(args, train):
+    """
+    save_dir의 bundle이 train의 column으로 만들 수 있으면 그대로 사용, 아니면 임시 폴더에 학습
+    -> (lstm, save_dir) / 입력은 lstm.features 순서로 골라서 사용
+    """
+    if os.path.exists(os.path.join(args.save_dir, BUNDLE_FILE)) and \
+            os.path.exists(os.path.join(args.save_dir, MANIFEST_FILE)):
+        features = LSTM.from_bundle_config(args.save_dir).features
+        missing = [c for c in features or [] if c not in train.columns]
+        if features and not missing:
+            return LSTM.from_bundle(args.save_dir, which="latest"), args.save_dir
+        reason = f"feature {missing}가 데이터에 없어" if missing else "feature 목록이 없어"
+    else:
+        reason = "학습된 모델이 없어"
+    save_dir = tempfile.mkdtemp(prefix="bench_export_")
+    print(f">>> {args.save_dir}에 {reason} {args.epochs} epoch 학습 후 비교 ({save_dir})")
+    lstm = LSTM(sample_size=args.sample_size, output_size=args.sample_size)
+    lstm.pre_processor(train)
+    lstm.build_model()
+    lstm.model.fit(lstm.train_input, lstm.gt_output, epochs=args.epochs, batch_size=32, verbose=0)
+    lstm.save_bundle(save_dir)
+    return lstm, save_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="export 정확도 / 지연 시간 비교")
+    parser.add_argument("--data", default=os.path.join(ROOT, "LSTM_custom", "data", "df_naver_add.csv"))
+    parser.add_argument("--save_dir", default=os.path.join(ROOT, "LSTM_custom", "checkpoint_saved"))
+    parser.add_argument("--split", default="2017-02-03", help="test 시작일 (main.py와 같은 기준)")
+    parser.add_argument("--test_days", type=int, default=130)
+    parser.add_argument("--sample_size", type=int, default=20, help="학습이 필요할 때만 사용")
+    parser.add_argument("--epochs", type=int, default=3, help="학습이 필요할 때만 사용")
+    parser.add_argument("--batch", type=int, default=16, help="배치 forecast 크기")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--target_idx", type=int, default=2, help="데이터 파일 기준 column 번호")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data, index_col="date", parse_dates=True)
+    target = df.columns[args.target_idx]
+    train, test = df[df.index < args.split], df[df.index >= args.split].iloc[:args.test_days]
+    lstm, save_dir = load_or_train(args, train)
+
+    # bundle의 feature 순서대로 column 선택 (5-column bundle이어도 25-column 파일에서 비교 가능)
+    if target not in lstm.features:
+        raise SystemExit(f"target column {target}이 bundle feature에 없습니다: {lstm.features}")
+    train, test = train[lstm.features], test[lstm.features]
+    s, t = lstm.sample_size, lstm.features.index(target)
+
+    # 정확도 입력: test 구간 각 날짜 직전 window (원본 스케일)
+    full = pd.concat([train, test]).to_numpy()
+    starts = range(len(train) - s, len(train) - s + len(test) - s)
+    windows = np.stack([full[i:i + s] for i in starts])
+    scaled = lstm._transform(windows).astype(np.float32)
+    reference = lstm.model(scaled, training=False).numpy()
+
+    variants = {"keras": lstm}
+    for q in QUANTIZE:
+        export_tflite(lstm, save_dir, q, batch_size=1)
+        variants[f"tflite_{q}"] = load_tflite(save_dir, q, num_threads=1)
+
+    single = windows[-1]
+    batch = windows[:args.batch]
+    print(f"\n{'variant':<16} {'size(MB)':>8} {'max|diff|':>10} {'mae':>10} "
+          f"{'predict(ms)':>12} {'keras.predict(ms)':>18} {f'forecast b{args.batch}(ms)':>18}")
+    for name, model in variants.items():
+        out = model._call_model(scaled)
+        diff = float(np.abs(out - reference).max())
+        pred = model.forecast(full[len(train) - s:len(train)], len(test))[0][:, t]
+        mae = float(np.mean(np.abs(pred - test.to_numpy()[:, t])))
+
+        t_predict = latency_ms(lambda: model.predict(single), args.repeat)
+        t_forecast = latency_ms(lambda: model.forecast(batch, s), max(5, args.repeat // 5))
+        if name == "keras":
+            size = "-"
+            t_keras = f"{latency_ms(lambda: lstm.model.predict(scaled[-1:], verbose=0), args.repeat):>18.3f}"
+        else:
+            size = f"{os.path.getsize(model.weight_path) / 2**20:.2f}"
+            t_keras = f"{'-':>18}"
+        print(f"{name:<16} {size:>8} {diff:>10.2e} {mae:>10.2f} {t_predict:>12.3f} {t_keras} {t_forecast:>18.3f}")
@@ -0,0 +1,83 @@
+"""
+LSTM_custom/main.py 시작 시간 벤치마크
+
+실행: python benchmarks/bench_startup.py --max_ms 1500
+      python benchmarks/bench_startup.py --baseline benchmarks/results/startup.json
+
+- 새 프로세스에서 `import main` / `main.py --help` 소요 시간 (median)
+- import만으로 tensorflow / yfinance / matplotlib / pandas가 로드되면 실패
+- --max_ms 초과 또는 --baseline 대비 threshold 이상 느려지면 exit 1
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_DIR = os.path.join(ROOT, "LSTM_custom")
+HEAVY_MODULES = ["tensorflow", "keras", "yfinance", "matplotlib", "pandas", "sklearn"]
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from run_benchmarks import compare
+
+CASES = {
+    "import main": [sys.executable, "-c", "import main"],
+    "main.py --help": [sys.executable, "main.py", "--help"],
+}
+
+
+def cold_start(cmd, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=ENTRY_DIR, check=True, capture_output=True)
+        times.append(time.perf_counter() - t0)
+    return {"median": float(np.median(times)), "min": float(np.min(times)), "repeat": repeat}
+
+
+def heavy_imports():
+    """`import main` 후 로드된 무거운 모듈 목록"""
+    code = ("import sys, json; import main; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ENTRY_DIR, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="main.py 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max_ms", type=float, default=1500, help="`import main` 허용 시간 (ms)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--noise_ms", type=float, default=50)
+    args = parser.parse_args()
+
+    failed = []
+    loaded = heavy_imports()
+    if loaded:
+        failed.append(f"import main 시 무거운 모듈 로드: {loaded}")
+
+    results = {name: cold_start(cmd, args.repeat) for name, cmd in CASES.items()}
+    for name, r in results.items():
+        print(f"{name:<20} median {r['median'] * 1000:>8.1f} ms")
+    if results["import main"]["median"] * 1000 > args.max_ms:
+        failed.append(f"import main {results['import main']['median'] * 1000:.0f} ms > {args.max_ms:.0f} ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"meta": {"python": sys.version.split()[0]}, "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            base = json.load(f)["results"]
+        failed += [f"{name} 회귀" for name in compare(results, base, args.threshold, args.noise_ms)]
+
+    if failed:
+        print("\n" + "\n".join(failed))
+        sys.exit(1)
+    print("\n시작 시간 정상")
@@ -0,0 +1,226 @@
+"""
+프로젝트 주요 경로 벤치마크 (합성 데이터)
+
+    python benchmarks/run_benchmarks.py --output benchmarks/results/base.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/base.json --threshold 0.2
+
+- 합성 OHLCV(종목 여러 개) / 거시 지표(일·주·월·분기·연) 생성, 크기는 인자로 조절
+- case별로 repeat번 측정해 median/min을 JSON으로 저장
+- --baseline을 주면 case별 median 비교, threshold 이상 느려지면 exit 1
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "LSTM_custom"))
+
+MACRO_FREQ = {"day": "D", "week": "W-MON", "month": "MS", "quarter": "QS", "year": "YS"}
+
+
+# ─── 합성 데이터 ─────────────────────────────────────────────────────
+def make_ohlcv(n_rows, n_tickers=1, seed=0) -> dict:
+    """영업일 기준 랜덤워크 OHLCV -> {code: DataFrame}"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2010-01-04", periods=n_rows, name="date")
+    frames = {}
+    for k in range(n_tickers):
+        close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows)))
+        spread = close * rng.uniform(0, 0.03, n_rows)
+        frames[f"{k:06d}"] = pd.DataFrame({
+            "Close":  close,
+            "Open":   close + rng.uniform(-1, 1, n_rows) * spread,
+            "High":   close + spread,
+            "Low":    close - spread,
+            "Volume": rng.integers(1_000, 5_000_000, n_rows).astype(float),
+        }, index=index)
+    return frames
+
+
+def make_macro(start, end, date_type, n_cols=2, seed=0) -> pd.DataFrame:
+    """start~end 구간의 date_type 주기 거시 지표"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, end, freq=MACRO_FREQ[date_type], name="date")
+    return pd.DataFrame({f"{date_type}_{i}": rng.normal(1000, 50, len(index))
+                         for i in range(n_cols)}, index=index)
+
+
+def make_sise_html(n_rows=10, seed=0) -> str:
+    """네이버 sise_day 페이지와 같은 구조의 html (table.type2, 7열)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-01-31", periods=n_rows)[::-1]
+    rows = []
+    for d in dates:
+        c, o, h, l = rng.integers(10000, 100000, 4)
+        v = rng.integers(1000, 5000000)
+        rows.append(f'<tr onmouseover="mouseOver(this)"><td align="center"><span class="tah p10 gray03">'
+                    f'{d:%Y.%m.%d}</span></td><td class="num"><span class="tah p11">{c:,}</span></td>'
+                    f'<td class="num"><img src="x.gif"><span class="tah p11 red02">150</span></td>'
+                    f'<td class="num"><span class="tah p11">{o:,}</span></td>'
+                    f'<td class="num"><span class="tah p11">{h:,}</span></td>'
+                    f'<td class="num"><span class="tah p11">{l:,}</span></td>'
+                    f'<td class="num"><span class="tah p11">{v:,}</span></td></tr>')
+        rows.append('<tr><td colspan="7" height="8"></td></tr>')
+    return ('<html><body><table class="type2"><tr><th>날짜</th><th>종가</th><th>전일비</th>'
+            '<th>시가</th><th>고가</th><th>저가</th><th>거래량</th></tr>'
+            + "".join(rows) + '</table><table class="Nnavi"><tr><td class="pgRR">'
+            '<a href="/item/sise_day.naver?code=000000&amp;page=400">맨뒤</a></td></tr></table>'
+            '</body></html>')
+
+
+# ─── 측정 ────────────────────────────────────────────────────────────
+def measure(fn, repeat=5, warmup=1) -> dict:
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"median": float(np.median(times)), "min": float(np.min(times)), "repeat": repeat}
+
+
+def bench_add_col(args):
+    from add_col import add_col
+    df_orig = make_ohlcv(args.rows)["000000"]
+    start, end = df_orig.index[0], df_orig.index[-1]
+    cases = {}
+    for date_type in MACRO_FREQ:
+        df_add = make_macro(start - pd.offsets.YearBegin(1), end, date_type)
+        cases[f"add_col[{date_type}]"] = lambda a=df_add, t=date_type: add_col(df_orig, a, t)
+    return cases
+
+
+def bench_indicators(args):
+    from indicators import compute_indicators, IndicatorState
+    close = np.column_stack([df["Close"].to_numpy() for df in make_ohlcv(args.rows, args.tickers).values()])
+    state = IndicatorState.from_history(close)
+    new_bar = close[-1] * 1.01
+    return {
+        f"indicators[batch {args.tickers}x{args.rows}]": lambda: compute_indicators(close),
+        f"indicators[update {args.tickers}]": lambda: state.update(new_bar),
+    }
+
+
+def bench_cross_corr(args):
+    from cross_corr import lagged_xcorr
+    close = np.column_stack([df["Close"].to_numpy() for df in make_ohlcv(args.rows, args.tickers).values()])
+    returns = close[1:] / close[:-1] - 1
+    macro = np.random.default_rng(1).normal(size=(len(returns), args.tickers))
+    macro[::7] = np.nan
+    lags = np.arange(-20, 21)
+    return {f"lagged_xcorr[{args.tickers}x{args.tickers}x{len(lags)} lags, {args.rows}]":
+            lambda: lagged_xcorr(macro, returns, lags)}
+
+
+def bench_crawler(args):
+    from stk_crawler import parse_sise_table
+    pages = [make_sise_html(seed=i) for i in range(args.pages)]
+    return {f"parse_sise_table[{args.pages} pages]": lambda: [parse_sise_table(p) for p in pages]}
+
+
+def bench_model(args):
+    from model import LSTM
+    data = make_ohlcv(args.rows)["000000"]
+    lstm = LSTM(sample_size=args.sample_size, output_size=args.sample_size)
+    lstm.pre_processor(data)
+    lstm.build_model()
+
+    inputs = np.stack([data.iloc[i:i + args.sample_size].to_numpy()
+                       for i in range(0, args.forecast_batch * 7, 7)])
+    return {
+        f"pre_processor[{args.rows}x{args.sample_size}]": lambda: lstm.pre_processor(data),
+        f"forecast[batch {args.forecast_batch}, {args.steps} steps]":
+            lambda: lstm.forecast(inputs, args.steps),
+    }
+
+
+GROUPS = {
+    "add_col": bench_add_col,
+    "indicators": bench_indicators,
+    "cross_corr": bench_cross_corr,
+    "crawler": bench_crawler,
+    "model": bench_model,
+}
+
+
+def run(args) -> dict:
+    results = {}
+    for group in args.only or GROUPS:
+        for name, fn in GROUPS[group](args).items():
+            results[name] = measure(fn, repeat=args.repeat)
+            print(f"{name:<40} median {results[name]['median'] * 1000:>10.3f} ms")
+    return results
+
+
+def compare(results, baseline, threshold, noise_ms) -> list:
+    """median 기준 비교 -> 느려진 case 이름 리스트 (noise_ms 이하 차이는 무시)"""
+    regressions = []
+    print(f"\n{'case':<40} {'base(ms)':>10} {'new(ms)':>10} {'ratio':>7}")
+    for name, r in results.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>10} {r['median'] * 1000:>10.3f} {'new':>7}")
+            continue
+        base, new = baseline[name]["median"], r["median"]
+        ratio = new / base if base else float("inf")
+        flag = ""
+        if ratio > 1 + threshold and (new - base) * 1000 > noise_ms:
+            regressions.append(name)
+            flag = "  <- regression"
+        print(f"{name:<40} {base * 1000:>10.3f} {new * 1000:>10.3f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주요 경로 벤치마크")
+    parser.add_argument("--rows", type=int, default=3750, help="합성 일봉 길이 (기본 약 15년)")
+    parser.add_argument("--tickers", type=int, default=9, help="지표 계산 종목 수")
+    parser.add_argument("--pages", type=int, default=50, help="파싱할 sise_day 페이지 수")
+    parser.add_argument("--sample_size", type=int, default=20)
+    parser.add_argument("--forecast_batch", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=60, help="forecast 예측 기간(일)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=list(GROUPS), help="일부 그룹만 실행")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본 benchmarks/results/<시각>.json)")
+    parser.add_argument("--baseline", default=None, help="비교 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 지연 비율 (0.2 = 20%%)")
+    parser.add_argument("--noise_ms", type=float, default=0.5, help="이 차이(ms) 이하는 회귀로 보지 않음")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results",
+                                         f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    meta = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "sizes": {k: getattr(args, k) for k in
+                  ("rows", "tickers", "pages", "sample_size", "forecast_batch", "steps", "repeat")},
+    }
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\n결과 저장 : {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            base = json.load(f)
+        if base["meta"].get("sizes") != meta["sizes"]:
+            print(">>> 경고: baseline과 데이터 크기 설정이 다릅니다.")
+        regressions = compare(results, base["results"], args.threshold, args.noise_ms)
+        if regressions:
+            print(f"\n성능 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n성능 회귀 없음")
@@ -0,0 +1,246 @@
+"""
+거시 지표(ECOS 통계 / 선가 / GDP) vs 종목 수익률 시차 상관분석
+
+    python cross_corr.py --freq W --min_lag 0 --max_lag 12 --window 104 --step 13
+
+- 모든 지표 x 모든 종목 x 모든 lag 상관계수를 FFT 한 번으로 계산 (pandas 루프 없음)
+  결측(NaN)은 채우지 않고 mask로 제외 -> lag마다 실제로 겹치는 구간만으로 Pearson r
+- lag > 0 : 지표가 종목보다 lag 기간 먼저 움직임 (corr(x[t], y[t + lag]))
+- rolling window마다 다시 계산해 부호가 얼마나 일정한지(sign_consistency)도 같이 기록
+- 결과: (지표, 종목)별로 |r|이 가장 큰 lag를 골라 순위표로 저장
+"""
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_store import DataStore
+
+GDP_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       "LSTM_custom", "data", "GDP_0201to2504.csv")
+TRANSFORMS = ("pct", "diff", "level")
+
+
+def _next_pow2(n):
+    return 1 << int(np.ceil(np.log2(max(n, 1))))
+
+
+def _standardize(a, mask):
+    """열별로 평균 0 / 표준편차 1 (Pearson r은 그대로, FFT 누적합의 상쇄 오차만 줄임)"""
+    n = mask.sum(axis=0)
+    mean = np.where(mask, a, 0.0).sum(axis=0) / np.maximum(n, 1)
+    centered = np.where(mask, a - mean, 0.0)
+    std = np.sqrt((centered ** 2).sum(axis=0) / np.maximum(n, 1))
+    return centered / np.where(std > 0, std, 1.0)
+
+
+def lagged_xcorr(x, y, lags, min_periods=20, chunk=16):
+    """
+    x: (T, M) 지표, y: (T, K) 종목 수익률 (같은 날짜 축, 결측은 NaN)
+    lags: 정수 배열, lag L -> corr(x[t], y[t + L]) (겹치는 유효 구간만 사용)
+    return: corr (M, K, L), n (M, K, L)  - 겹치는 점이 min_periods 미만이면 NaN
+
+    c[L] = sum_t a[t] * b[t + L] 를 irfft(conj(A) * B)로 모든 lag에 대해 한 번에 구함
+    n / Σx / Σy / Σx² / Σy² / Σxy 를 모두 mask 곱의 상호상관으로 계산
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x = x[:, None] if x.ndim == 1 else x
+    y = y[:, None] if y.ndim == 1 else y
+    lags = np.asarray(lags, dtype=np.int64)
+    T = x.shape[0]
+    if y.shape[0] != T:
+        raise ValueError(f"x, y 길이가 다릅니다: {T} != {y.shape[0]}")
+    if np.abs(lags).max(initial=0) >= T:
+        raise ValueError(f"lag 범위가 데이터 길이({T})보다 큽니다")
+
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    xs, ys = _standardize(x, mx), _standardize(y, my)
+
+    nfft = _next_pow2(2 * T)        # 원형 상관이 겹치지 않도록 2T 이상
+    fft = lambda a: np.fft.rfft(a, n=nfft, axis=0).T          # (T, C) -> (C, F)
+    X = np.stack([fft(mx.astype(np.float64)), fft(xs), fft(xs ** 2)])      # (3, M, F)
+    Y = np.stack([fft(my.astype(np.float64)), fft(ys), fft(ys ** 2)])      # (3, K, F)
+    idx = lags % nfft                # 음수 lag는 끝에서부터
+
+    M, K = x.shape[1], y.shape[1]
+    corr = np.full((M, K, len(lags)), np.nan)
+    count = np.zeros((M, K, len(lags)), dtype=np.int64)
+    # 지표를 chunk개씩 나눠 (chunk, K, nfft) 크기만 메모리에 올림
+    for s in range(0, M, chunk):
+        Xc = np.conj(X[:, s:s + chunk, None, :])               # (3, c, 1, F)
+
+        def xc(i, j):
+            return np.fft.irfft(Xc[i] * Y[j][None], n=nfft, axis=-1)[..., idx]
+
+        n = np.rint(xc(0, 0))
+        sx, sy = xc(1, 0), xc(0, 1)
+        sxx, syy, sxy = xc(2, 0), xc(0, 2), xc(1, 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = n * sxy - sx * sy
+            var = (n * sxx - sx ** 2) * (n * syy - sy ** 2)
+            r = cov / np.sqrt(var)
+        r = np.where((n >= min_periods) & (var > 1e-12 * n ** 4), np.clip(r, -1, 1), np.nan)
+        corr[s:s + chunk] = r
+        count[s:s + chunk] = n.astype(np.int64)
+    return corr, count
+
+
+def rolling_xcorr(x, y, lags, window, step, min_periods=20):
+    """
+    window 길이 구간을 step씩 옮기며 lagged_xcorr
+    return: corr (W, M, K, L), 각 구간 시작 index
+    """
+    T = len(x)
+    starts = list(range(0, max(T - window, 0) + 1, step)) if window < T else [0]
+    out = np.stack([lagged_xcorr(x[s:s + window], y[s:s + window], lags, min_periods)[0]
+                    for s in starts])
+    return out, starts
+
+
+def transform(frame, how):
+    """결측은 채우지 않음: 이웃한 두 값이 모두 있을 때만 변화율/차분"""
+    if how == "pct":
+        return frame / frame.shift(1) - 1
+    if how == "diff":
+        return frame.diff()
+    if how == "level":
+        return frame
+    raise ValueError(f"transform은 {TRANSFORMS} 중 하나: {how}")
+
+
+def to_grid(frame, freq):
+    """freq 주기 격자로 (기간의 마지막 값, 값이 없는 기간은 NaN 그대로)"""
+    frame = frame.apply(pd.to_numeric, errors="coerce")
+    frame.index = pd.to_datetime(frame.index)
+    return frame.sort_index().resample(freq).last()
+
+
+def load_gdp(path=GDP_CSV):
+    """ECOS 실질 GDP 성장률 CSV (한 행, '2002/Q1' ... 컬럼) -> 분기 말일 index Series
+
+    발표 전 값을 미리 쓰지 않도록 분기 시작일이 아니라 분기 말일에 둠
+    """
+    df = pd.read_csv(path, index_col=0, encoding="utf-8-sig")
+    row = df.iloc[0, 4:]
+    periods = pd.PeriodIndex(row.index.str.replace("/", ""), freq="Q")
+    s = pd.Series(pd.to_numeric(row.values, errors="coerce"),
+                  index=periods.to_timestamp(how="end").normalize(), name="gdp:real_GDP")
+    s.index.name = "date"
+    return s
+
+
+def load_macro(store, freq="W", how="pct", gdp_csv=GDP_CSV):
+    """
+    저장소의 ecos / ship_price 전부 + GDP -> freq 격자의 wide frame
+    컬럼 이름: 'ecos:usd_krw', 'ship_price:new_tanker:VLCC', 'gdp:real_GDP'
+    GDP는 이미 성장률이라 level 그대로, 다음 분기 값이 나올 때까지 유지
+    """
+    cols = []
+    for source in ("ecos", "ship_price"):
+        for key in store.keys(source):
+            df = to_grid(store.read(source, key), freq).dropna(axis=1, how="all")
+            df.columns = [f"{source}:{key}" if len(df.columns) == 1 else f"{source}:{key}:{c}"
+                          for c in df.columns]
+            cols.append(transform(df, how))
+    if gdp_csv and os.path.exists(gdp_csv):
+        gdp = load_gdp(gdp_csv).to_frame()
+        cols.append(gdp.resample(freq).last().ffill())
+    if not cols:
+        return pd.DataFrame()
+    return pd.concat(cols, axis=1, sort=True)
+
+
+def load_returns(store, freq="W", codes=None, col="Close"):
+    """종목별 종가 -> freq 격자 수익률 wide frame (컬럼: 종목 코드)"""
+    codes = codes or store.keys("stock")
+    close = pd.concat({code: store.read("stock", code, columns=[col])[col] for code in codes},
+                      axis=1, sort=True)
+    return transform(to_grid(close, freq), "pct")
+
+
+def align(macro, returns):
+    """두 frame을 같은 날짜 축으로 (겹치는 기간만, 결측은 NaN 그대로)"""
+    start = max(macro.index.min(), returns.index.min())
+    end = min(macro.index.max(), returns.index.max())
+    index = macro.index.union(returns.index)
+    index = index[(index >= start) & (index <= end)]
+    return macro.reindex(index), returns.reindex(index)
+
+
+def rank_lead_lag(macro, returns, lags, window=None, step=None, min_periods=20, top=None):
+    """
+    macro (T, M), returns (T, K) 같은 날짜 축 frame
+    (지표, 종목)마다 |r|이 가장 큰 lag 한 행씩 -> |r| 내림차순 순위표
+    window를 주면 rolling 구간별 r의 평균/표준편차와 부호 일치 비율도 추가
+    """
+    lags = np.asarray(lags, dtype=np.int64)
+    x, y = macro.to_numpy(np.float64), returns.to_numpy(np.float64)
+    corr, count = lagged_xcorr(x, y, lags, min_periods)
+
+    M, K, _ = corr.shape
+    absr = np.where(np.isnan(corr), -1.0, np.abs(corr))
+    best = absr.argmax(axis=2)                                    # (M, K)
+    mi, ki = np.meshgrid(np.arange(M), np.arange(K), indexing="ij")
+    r_best = corr[mi, ki, best]
+
+    table = pd.DataFrame({
+        "macro": np.repeat(macro.columns.to_numpy(), K),
+        "ticker": np.tile(returns.columns.to_numpy(), M),
+        "lag": lags[best].ravel(),
+        "corr": r_best.ravel(),
+        "n": count[mi, ki, best].ravel(),
+    })
+
+    if window:
+        rolled, starts = rolling_xcorr(x, y, lags, window, step or max(window // 4, 1),
+                                       min(min_periods, window))
+        r_win = rolled[:, mi, ki, best]                           # (W, M, K)
+        valid = ~np.isnan(r_win)
+        n_win = valid.sum(axis=0)
+        filled = np.where(valid, r_win, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = filled.sum(axis=0) / n_win
+            std = np.sqrt(np.where(valid, (r_win - mean) ** 2, 0.0).sum(axis=0) / n_win)
+            same = ((np.sign(r_win) == np.sign(r_best)[None]) & valid).sum(axis=0) / n_win
+        table["roll_mean"] = mean.ravel()
+        table["roll_std"] = std.ravel()
+        table["sign_consistency"] = same.ravel()
+        table["n_windows"] = n_win.ravel()
+
+    table = table.dropna(subset=["corr"])
+    table = table.reindex(table["corr"].abs().sort_values(ascending=False).index)
+    table = table.reset_index(drop=True)
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table.head(top) if top else table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="거시 지표 vs 종목 수익률 시차 상관 순위")
+    parser.add_argument("--freq", default="W", help="정렬 주기 (D / W / ME / QE)")
+    parser.add_argument("--min_lag", type=int, default=0, help="음수면 종목이 먼저 움직이는 경우도 포함")
+    parser.add_argument("--max_lag", type=int, default=12)
+    parser.add_argument("--window", type=int, default=None, help="rolling 구간 길이 (freq 단위)")
+    parser.add_argument("--step", type=int, default=None, help="rolling 이동 간격 (기본 window // 4)")
+    parser.add_argument("--min_periods", type=int, default=20, help="겹치는 점이 이보다 적으면 제외")
+    parser.add_argument("--macro_transform", choices=TRANSFORMS, default="pct",
+                        help="ECOS / 선가 변환 (GDP는 항상 level)")
+    parser.add_argument("--codes", nargs="+", default=None, help="종목 코드 (기본: 저장소 전체)")
+    parser.add_argument("--gdp_csv", default=GDP_CSV)
+    parser.add_argument("--top", type=int, default=30, help="출력할 상위 행 수")
+    parser.add_argument("--output", default="./analysis/lead_lag.csv")
+    args = parser.parse_args()
+
+    store = DataStore()
+    macro = load_macro(store, args.freq, args.macro_transform, args.gdp_csv)
+    returns = load_returns(store, args.freq, args.codes)
+    macro, returns = align(macro, returns)
+    print(f">>> 지표 {macro.shape[1]}개 x 종목 {returns.shape[1]}개, {len(macro)}개 기간 ({args.freq})")
+
+    table = rank_lead_lag(macro, returns, np.arange(args.min_lag, args.max_lag + 1),
+                          args.window, args.step, args.min_periods)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    table.to_csv(args.output, index=False)
+    print(table.head(args.top).to_string(index=False))
+    print(f"저장 완료 : {args.output}")
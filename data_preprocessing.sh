@@ -1,4 +1 @@
-python load_stk_price.py
-python load_ship_price.py
-python load_ecos.py
-python add_col.py
\ No newline at end of file
+python pipeline.py "$@"
@@ -0,0 +1,84 @@
+"""
+파이프라인 단계 간 데이터 저장소 (Parquet)
+
+레이아웃: {root}/{source}/{key}.parquet
+    source: 'stock' | 'ecos' | 'ship_price' | 'merged' ...
+    key   : 종목 코드 / 통계 이름 등
+모든 프레임은 'date' DatetimeIndex 기준으로 저장/병합
+"""
+import os
+import glob
+import pandas as pd
+
+DATA_ROOT = os.environ.get("STOCK_DATA_ROOT", "./data_store")
+
+
+class DataStore:
+    def __init__(self, root: str = DATA_ROOT):
+        self.root = root
+
+    def path(self, source: str, key: str) -> str:
+        return os.path.join(self.root, source, f"{key}.parquet")
+
+    def exists(self, source: str, key: str) -> bool:
+        return os.path.exists(self.path(source, key))
+
+    def keys(self, source: str) -> list:
+        files = glob.glob(os.path.join(glob.escape(os.path.join(self.root, source)), "*.parquet"))
+        return sorted(os.path.splitext(os.path.basename(f))[0] for f in files)
+
+    def read(self, source: str, key: str, columns=None) -> pd.DataFrame:
+        path = self.path(source, key)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"저장된 데이터가 없습니다: {path}")
+        return pd.read_parquet(path, columns=columns)
+
+    def read_all(self, source: str) -> dict:
+        return {key: self.read(source, key) for key in self.keys(source)}
+
+    def last_date(self, source: str, key: str):
+        """저장된 마지막 날짜 (없으면 None)"""
+        if not self.exists(source, key):
+            return None
+        df = self.read(source, key, columns=[])
+        return df.index.max() if len(df) else None
+
+    def write(self, df: pd.DataFrame, source: str, key: str, append: bool = False) -> str:
+        """
+        df 저장 (index는 date로 정규화)
+        append=True면 기존 데이터와 합친 뒤 날짜 중복은 새 값 우선으로 정리
+        """
+        df = _normalize(df)
+        if append and self.exists(source, key):
+            old = self.read(source, key)
+            df = pd.concat([old, df])
+            df = df[~df.index.duplicated(keep="last")]
+        df = df.sort_index()
+
+        path = self.path(source, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        df.to_parquet(tmp)
+        os.replace(tmp, path)   # 쓰는 도중 중단돼도 기존 파일 보존
+        return path
+
+    def export_excel(self, source: str, save_path: str, keys=None) -> str:
+        """(선택) source의 key별 데이터를 시트로 나눠 엑셀로 내보내기"""
+        keys = [key for key in (keys or self.keys(source)) if self.exists(source, key)]
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        with pd.ExcelWriter(save_path, engine="openpyxl",
+                            datetime_format="yyyy-mm-dd") as writer:
+            for key in keys:
+                self.read(source, key).to_excel(writer, sheet_name=str(key)[:31])
+        return save_path
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """'date' 컬럼 또는 기존 index를 DatetimeIndex('date')로 통일"""
+    df = df.copy()
+    if "date" in df.columns:
+        df = df.set_index("date")
+    df.index = pd.to_datetime(df.index)
+    df.index.name = "date"
+    df.columns = [str(c) for c in df.columns]
+    return df
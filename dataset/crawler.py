@@ -1,22 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-from openpyxl import Workbook
-from datetime import date
-import time
+import os
+import sys
+import pandas as pd
 
-# headers 설정
-headers = {
-    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                   "AppleWebKit/537.36 (KHTML, like Gecko) "
-                   "Chrome/124.0.0.0 Safari/537.36"),
-    "Referer": "https://finance.naver.com/",
-    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-}
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stk_crawler import NaverCrawler, COLUMNS
 
-session = requests.Session()
-session.headers.update(headers)
-
-# 조선 관련 주식 code 
+# 조선 관련 주식 code
 codes = [
     '042660',  # 한화오션 (구 대우조선해양)
     '009540',  # HD한국조선해양
@@ -29,56 +18,18 @@ codes = [
     '267250',  # HD현대마린엔진
 ]
 
-# 주가 저장할 액셀 초기화
-wb = Workbook()
-wb.remove(wb.active)
-
-# 주가 불러오기 + 액셀에 저장
-for code in codes:
-    ws = wb.create_sheet(title=code)
-    ws.append(["date","Close","Open","High","Low","Volume"])
-    
-    print(f"크롤링 시작: {code}")
-    MAX_PAGES = 500
-    page = 1
-    
-    for page in range(1, MAX_PAGES + 1):
-        # ✅ 일별시세 페이지 (table.type2가 여기에 있음)
-        url = f"https://finance.naver.com/item/sise_day.naver?code={code}&page={page}"
-        print(f"  페이지 {page} 크롤링 중...")
-        
-        r = session.get(url, timeout=10)
-        r.encoding = "euc-kr"
-        soup = BeautifulSoup(r.text, "html.parser")
+MAX_PAGES = 500
 
-        # 표에서 데이터 추출
-        table = soup.select_one("table.type2")
-        if not table:
-            break
+# 전체 이력을 종목별로 동시에 수집
+crawler = NaverCrawler(max_workers=len(codes), rate=5.0)
+results = crawler.crawl(codes, start_page=1, max_pages=MAX_PAGES)
 
-        rows_with_data = 0
-        for row in table.select("tr"):
-            tds = [td.get_text(strip=True) for td in row.find_all("td")]
-            if len(tds) == 7 and tds[0]:   # 실제 데이터 행만
-                trade_date, close, _, open_, high, low, volume = tds # 전일비는 무시
-                ws.append([
-                    trade_date,
-                    int(close.replace(",","")),
-                    int(open_.replace(",","")),
-                    int(high.replace(",","")),
-                    int(low.replace(",","")),
-                    int(volume.replace(",",""))
-                ])
-                rows_with_data += 1
-        
-        # 데이터가 없으면 마지막 페이지
-        if rows_with_data == 0:
-            break
-            
-        print(f"  페이지 {page}에서 {rows_with_data}개 데이터 수집")
-        page += 1
-        time.sleep(0.5)  # 서버 부하 방지
-    
-    print(f"크롤링 완료: {code} (총 {page-1}페이지)")
-
-wb.save('ship_stock_prices.xlsx')
\ No newline at end of file
+# 주가 불러오기 + 액셀에 저장
+with pd.ExcelWriter('ship_stock_prices.xlsx', engine="openpyxl",
+                    datetime_format="yyyy-mm-dd") as writer:
+    for code, res in results.items():
+        if not res.ok:
+            print(f"크롤링 실패: {code} ({res.error})")
+        df = pd.DataFrame(res.rows, columns=COLUMNS)
+        df.to_excel(writer, sheet_name=code, index=False)
+        print(f"크롤링 완료: {code} (총 {res.pages}페이지)")
@@ -0,0 +1,359 @@
+"""
+종목별 학습용 feature 행렬 저장소 (load_data.ipynb 수작업 셀 대체)
+
+    python feature_store.py --codes 042660 009540
+    python feature_store.py --codes all --start 2012-01-01 --csv_dir ./features_csv
+
+- FEATURES에 선언한 정의(join / gdp / indicators)로 종목별 행렬 생성
+  df_naver_add.csv와 같은 순서: 가격 -> real_GDP -> PER/PBR/EPS -> SMA/EMA/RSI -> bfill
+- feature마다 정의 hash로 {root}/features/{hash}/{code}.parquet에 캐시
+  정의가 바뀐 feature만 다시 계산, 새 날짜는 끝부분만 이어서 계산 (append)
+  입력 stamp({code}.json)가 달라지면(원본 수정 / 과거 종가 수정) 처음부터 다시 계산
+- 짧은 내부 결측 구간(예: 2015-08-14 PER/PBR/EPS)은 앞뒤 값으로 선형 보간 (벡터 연산)
+  앞쪽 결측은 bfill, 끝쪽 결측(아직 발표 안 된 분기 GDP 등)은 마지막 값 유지
+- 저장된 원본이 없는 join(예: fundamental 미수집 종목)은 0으로 채우고 manifest에 기록
+- 정의 묶음 hash = 버전, {root}/features/sets/{버전}.json에 정의 / 종목별 기간 / 보간 위치 기록
+- 결과는 float32 DataFrame -> LSTM.pre_processor / GlobalLSTM.pre_processor에 바로 사용
+"""
+import os
+import json
+import hashlib
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_store import DataStore
+from add_col import add_col
+from indicators import compute_indicators, WINDOW_SIZES
+from cross_corr import load_gdp, GDP_CSV
+
+FEATURE_VERSION = 1     # 계산 방식이 바뀌면 올려서 기존 캐시 무효화
+KINDS = ("join", "gdp", "indicators")
+PRICE_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+FUNDAMENTAL_COLUMNS = ["PER", "PBR", "EPS"]
+
+
+class Feature:
+    """
+    name : feature 이름 (캐시 단위)
+    kind : 'join'       -> source, key(None이면 종목 코드), columns, date_type (add_col 기준)
+           'gdp'        -> path (ECOS 실질 GDP CSV), 같은 분기 값을 붙임 (노트북 add_new_row와 동일)
+           'indicators' -> col, windows (indicators.py, 보간된 col로 계산)
+    """
+    def __init__(self, name, kind, **params):
+        if kind not in KINDS:
+            raise ValueError(f"kind는 {KINDS} 중 하나: {kind}")
+        self.name = name
+        self.kind = kind
+        self.params = params
+
+    def spec(self) -> dict:
+        return {"name": self.name, "kind": self.kind,
+                **{k: list(v) if isinstance(v, tuple) else v for k, v in self.params.items()}}
+
+    def columns(self) -> list:
+        if self.kind == "join":
+            return list(self.params["columns"])
+        if self.kind == "gdp":
+            return [self.name]
+        return [f"{p}_{w}" for w in self.windows() for p in ("SMA", "EMA", "RSI")]
+
+    def windows(self) -> tuple:
+        return tuple(self.params.get("windows", WINDOW_SIZES))
+
+    def context(self) -> int:
+        """끝부분만 다시 계산할 때 앞에 붙여야 하는 과거 행 수"""
+        return max(self.windows()) + 1 if self.kind == "indicators" else 0
+
+
+# df_naver_add.csv와 같은 구성
+FEATURES = [
+    Feature("price", "join", source="stock", key=None, columns=PRICE_COLUMNS, date_type="day"),
+    Feature("real_GDP", "gdp", path=GDP_CSV),
+    # PER/PBR/EPS 일별 (pykrx get_market_fundamental, --fetch_fundamental로 저장)
+    Feature("fundamental", "join", source="fundamental", key=None,
+            columns=FUNDAMENTAL_COLUMNS, date_type="day"),
+    Feature("indicators", "indicators", col="Close", windows=WINDOW_SIZES),
+]
+
+
+def _sha1(obj) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _file_hash(path) -> str:
+    if not os.path.exists(path):
+        return "<missing>"
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def fill_gaps(values, max_gap):
+    """
+    (T, C) 배열에서 앞뒤 값이 모두 있는 길이 max_gap 이하 결측 구간만 선형 보간
+    (1일 결측이면 노트북의 (전날 + 다음날) / 2와 같음)
+    return: 채운 배열, 채운 위치 mask (T, C)
+    """
+    x = np.array(values, dtype=np.float64)
+    x = x[:, None] if x.ndim == 1 else x
+    T = x.shape[0]
+    valid = ~np.isnan(x)
+    pos = np.broadcast_to(np.arange(T)[:, None], x.shape)
+    # 결측 위치마다 직전 / 직후 유효값 위치
+    prev = np.maximum.accumulate(np.where(valid, pos, -1), axis=0)
+    nxt = np.minimum.accumulate(np.where(valid, pos, T)[::-1], axis=0)[::-1]
+    fill = ~valid & (prev >= 0) & (nxt < T) & (nxt - prev - 1 <= max_gap)
+    if fill.any():
+        cols = np.broadcast_to(np.arange(x.shape[1]), x.shape)
+        p, n = np.where(fill, prev, 0), np.where(fill, nxt, 0)
+        w = (pos - p) / np.where(fill, n - p, 1)
+        x[fill] = (x[p, cols] + (x[n, cols] - x[p, cols]) * w)[fill]
+    return x, fill
+
+
+def _array_hash(values) -> str:
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+def fetch_fundamental(code, start, end, store=None):
+    """pykrx 일별 PER/PBR/EPS -> 저장소 'fundamental' source에 누적 저장"""
+    from pykrx import stock
+    df = stock.get_market_fundamental(start.replace("-", ""), end.replace("-", ""), ticker=code)
+    store = store or DataStore()
+    return store.write(df[FUNDAMENTAL_COLUMNS], "fundamental", code, append=True)
+
+
+class FeatureStore:
+    """
+    features : Feature 리스트 (순서 = 컬럼 순서)
+    max_gap  : 선형 보간할 최대 연속 결측 길이 (더 긴 구간은 bfill로 채움)
+    version  : 모든 feature 정의 hash + max_gap의 hash (정의가 같으면 같은 버전)
+    """
+    def __init__(self, store=None, features=FEATURES, max_gap=5):
+        self.store = store or DataStore()
+        self.features = list(features)
+        self.max_gap = max_gap
+        self.hashes = self._feature_hashes()
+        self.version = _sha1({"features": [self.hashes[f.name] for f in self.features],
+                              "max_gap": max_gap})
+
+    def _feature_hashes(self) -> dict:
+        hashes, producer = {}, {}
+        for f in self.features:
+            if f.name in hashes:
+                raise ValueError(f"feature 이름 중복: {f.name}")
+            spec = dict(f.spec(), version=FEATURE_VERSION)
+            if f.kind == "gdp":
+                spec["file"] = _file_hash(f.params["path"])
+            if f.kind == "indicators":
+                col = f.params.get("col", "Close")
+                if col not in producer:
+                    raise ValueError(f"{f.name}: '{col}' 컬럼을 만드는 feature가 앞에 없습니다")
+                # 입력 컬럼을 만드는 feature가 바뀔 때만 다시 계산
+                spec["input"] = [hashes[producer[col]], self.max_gap]
+            hashes[f.name] = _sha1(spec)
+            for c in f.columns():
+                producer[c] = f.name
+        return hashes
+
+    def columns(self) -> list:
+        return [c for f in self.features for c in f.columns()]
+
+    def _source(self, feature) -> str:
+        return f"features/{self.hashes[feature.name]}"
+
+    def _input_path(self, feature, code):
+        """join / gdp feature가 읽는 원본 파일 경로"""
+        if feature.kind == "join":
+            return self.store.path(feature.params["source"], feature.params.get("key") or code)
+        if feature.kind == "gdp":
+            return feature.params["path"]
+        return None
+
+    def _stamp(self, feature, code, frame, n_rows) -> str:
+        """
+        캐시를 만들 때 입력 상태 (다르면 캐시 전체를 다시 계산)
+        join / gdp : 원본 파일 수정 시각 + 크기 (없으면 'missing')
+        indicators : 앞 n_rows 행 입력 컬럼 내용 hash (과거 종가 수정 감지, append는 그대로)
+        """
+        if feature.kind == "indicators":
+            return _array_hash(frame[feature.params.get("col", "Close")].to_numpy()[:n_rows])
+        path = self._input_path(feature, code)
+        if not os.path.exists(path):
+            return "missing"
+        st = os.stat(path)
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def _meta_path(self, feature, code) -> str:
+        return os.path.join(self.store.root, self._source(feature), f"{code}.json")
+
+    def _load_cache(self, feature, code):
+        """(캐시 DataFrame, stamp) - 없으면 (None, None)"""
+        source, meta_path = self._source(feature), self._meta_path(feature, code)
+        if not (self.store.exists(source, code) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path) as f:
+            stamp = json.load(f)["stamp"]
+        return self.store.read(source, code), stamp
+
+    def _save_cache(self, feature, code, df, append, stamp):
+        self.store.write(df, self._source(feature), code, append=append)
+        meta_path = self._meta_path(feature, code)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({"stamp": stamp}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.store.root, "features", "sets", f"{self.version}.json")
+
+    # ─── feature 하나 계산 ───────────────────────────────────
+    def _compute(self, feature, code, index, frame, ema_init=None) -> pd.DataFrame:
+        cols = feature.columns()
+        if feature.kind == "join":
+            if not os.path.exists(self._input_path(feature, code)):
+                return pd.DataFrame(np.nan, index=index, columns=cols)
+            df_add = self.store.read(feature.params["source"], feature.params.get("key") or code,
+                                     columns=cols).apply(pd.to_numeric, errors="coerce")
+            out = add_col(pd.DataFrame(index=index), df_add, feature.params.get("date_type", "day"))
+        elif feature.kind == "gdp":
+            out = add_col(pd.DataFrame(index=index),
+                          load_gdp(feature.params["path"]).rename(feature.name).to_frame(), "quarter")
+        else:
+            close, _ = fill_gaps(frame[feature.params.get("col", "Close")].to_numpy(), self.max_gap)
+            out = pd.DataFrame({name: values[:, 0] for name, values in
+                                compute_indicators(close, feature.windows(), ema_init).items()},
+                               index=index)
+        return out.reindex(columns=cols).astype(np.float64)
+
+    def _dirty_from(self, cached, index):
+        """
+        다시 계산을 시작할 위치 (None이면 캐시 그대로 사용)
+        캐시 날짜가 index 앞부분과 다르면 처음부터, 같으면 새 날짜부터
+        """
+        if cached is None:
+            return 0
+        n = len(cached)
+        if n > len(index) or not cached.index.equals(index[:n]):
+            return 0
+        return None if n == len(index) else n
+
+    def _feature(self, feature, code, index, frame, refresh=False) -> pd.DataFrame:
+        cached, stamp = (None, None) if refresh else self._load_cache(feature, code)
+        if cached is not None and stamp != self._stamp(feature, code, frame, len(cached)):
+            print(f">>> {code} {feature.name}: 입력이 바뀌어 다시 계산")
+            cached = None
+        dirty = self._dirty_from(cached, index)
+        if dirty is None:
+            return cached
+
+        ctx = max(dirty - feature.context(), 0)
+        ema_init = None
+        if feature.kind == "indicators" and ctx > 0:
+            ema_init = cached.iloc[ctx - 1][[f"EMA_{w}" for w in feature.windows()]].to_numpy()
+        new = self._compute(feature, code, index[ctx:], frame.iloc[ctx:], ema_init).iloc[dirty - ctx:]
+
+        print(f">>> {code} {feature.name}: {'전체' if dirty == 0 else '추가'} {len(new)}행 계산")
+        self._save_cache(feature, code, new, dirty > 0, self._stamp(feature, code, frame, len(index)))
+        return new if dirty == 0 else pd.concat([cached.iloc[:dirty], new])
+
+    # ─── 종목 행렬 ──────────────────────────────────────────
+    def materialize(self, code, start=None, end=None, refresh=False) -> pd.DataFrame:
+        """
+        code 종목의 전체 이력으로 feature 계산 (캐시 재사용 / 끝부분 append)
+        -> [start, end) 구간 float32 DataFrame (index 'date', 컬럼 = columns())
+        """
+        index = self.store.read("stock", code, columns=[]).index.sort_values()
+        frame = pd.DataFrame(index=index)
+        for feature in self.features:
+            frame = pd.concat([frame, self._feature(feature, code, index, frame, refresh)], axis=1)
+
+        missing = [os.path.relpath(self._input_path(f, code), self.store.root)
+                   for f in self.features
+                   if f.kind == "join" and not os.path.exists(self._input_path(f, code))]
+        if missing:
+            print(f">>> {code}: 원본 없음 {missing} -> 0으로 채움")
+
+        values, filled = fill_gaps(frame.to_numpy(), self.max_gap)
+        frame = pd.DataFrame(values, index=index, columns=frame.columns).bfill()
+        # bfill 후 남은 결측 = 끝쪽 구간 -> 마지막 값 유지, 값이 하나도 없는 컬럼은 0
+        trailing = frame.isna().to_numpy()
+        empty = frame.columns[trailing.all(axis=0)].tolist() if len(frame) else []
+        frame = frame.ffill().fillna(0.0)
+        self._record(code, frame, filled, trailing, empty, missing)
+
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        if end is not None:
+            frame = frame[frame.index < pd.Timestamp(end)]
+        return frame.astype(np.float32)
+
+    def to_array(self, code, start=None, end=None):
+        """(T, feature) float32 배열, 날짜 index, 컬럼 이름"""
+        frame = self.materialize(code, start, end)
+        return frame.to_numpy(), frame.index, list(frame.columns)
+
+    def materialize_all(self, codes=None, start=None, end=None) -> dict:
+        """{code: float32 DataFrame} (GlobalLSTM.pre_processor 입력)"""
+        codes = codes or self.store.keys("stock")
+        return {code: self.materialize(code, start, end) for code in codes}
+
+    # ─── 버전 기록 ─────────────────────────────────────────
+    def manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {"version": self.version, "max_gap": self.max_gap,
+                    "features": [dict(f.spec(), hash=self.hashes[f.name]) for f in self.features],
+                    "columns": self.columns(), "codes": {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _record(self, code, frame, filled, trailing, empty, missing):
+        """종목별 기간 / 행 수 / 보간·끝쪽 유지한 날짜 / 원본 없는 입력을 버전 manifest에 기록"""
+        manifest = self.manifest()
+        dates = frame.index.strftime("%Y-%m-%d").to_numpy()
+        manifest["codes"][code] = {
+            "start": dates[0] if len(dates) else None,
+            "end": dates[-1] if len(dates) else None,
+            "rows": len(frame),
+            "filled": {col: dates[filled[:, i]].tolist()
+                       for i, col in enumerate(frame.columns) if filled[:, i].any()},
+            # 끝쪽 결측을 마지막 값으로 채운 구간 (컬럼별 시작일, 행 수)
+            "ffilled": {col: {"from": dates[trailing[:, i]][0], "rows": int(trailing[:, i].sum())}
+                        for i, col in enumerate(frame.columns)
+                        if trailing[:, i].any() and col not in empty},
+            "empty": empty,
+            "missing": missing,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="종목별 학습용 feature 행렬 생성")
+    parser.add_argument("--codes", nargs="+", default=["all"], help="종목 코드 ('all'이면 저장소 전체)")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None, help="미포함")
+    parser.add_argument("--max_gap", type=int, default=5, help="선형 보간할 최대 연속 결측 길이")
+    parser.add_argument("--refresh", action="store_true", help="캐시 무시하고 전부 다시 계산")
+    parser.add_argument("--fetch_fundamental", nargs=2, default=None, metavar=("START", "END"),
+                        help="먼저 pykrx로 PER/PBR/EPS를 받아 저장")
+    parser.add_argument("--csv_dir", default=None, help="종목별 CSV로도 내보내기")
+    args = parser.parse_args()
+
+    fs = FeatureStore(max_gap=args.max_gap)
+    codes = fs.store.keys("stock") if args.codes == ["all"] else args.codes
+    print(f">>> feature 버전 {fs.version} ({len(fs.columns())}개 컬럼)")
+    for code in codes:
+        if args.fetch_fundamental:
+            fetch_fundamental(code, *args.fetch_fundamental, store=fs.store)
+        frame = fs.materialize(code, args.start, args.end, refresh=args.refresh)
+        filled = fs.manifest()["codes"][code]["filled"]
+        print(f"{code}: {frame.shape}, 보간 {sum(len(v) for v in filled.values())}칸")
+        if args.csv_dir:
+            os.makedirs(args.csv_dir, exist_ok=True)
+            frame.to_csv(os.path.join(args.csv_dir, f"{code}.csv"))
@@ -0,0 +1,208 @@
+"""
+SMA / EMA / RSI 기술적 지표 (load_data.ipynb와 같은 정의)
+
+    SMA_w : Close.rolling(w).mean()
+    EMA_w : Close.ewm(span=w, adjust=False).mean()
+    RSI_w : 100 - 100 / (1 + gain.rolling(w).mean() / loss.rolling(w).mean())
+
+compute_indicators : (T, K) 종가 배열(K개 종목)에 대해 모든 window를 한 번에 계산
+IndicatorState     : 마지막 상태만 저장해두고 새 일봉이 오면 O(1)로 갱신
+"""
+import numpy as np
+import pandas as pd
+
+WINDOW_SIZES = (5, 10, 20, 30, 60)
+
+
+def _as_2d(close):
+    close = np.asarray(close, dtype=np.float64)
+    return close[:, None] if close.ndim == 1 else close
+
+
+def _rolling_mean(x, windows):
+    """(T, K) -> {w: (T, K)} 누적합 차분으로 모든 window 평균 계산 (NaN 포함 window는 NaN)"""
+    T = x.shape[0]
+    nan = np.isnan(x)
+    cs = np.zeros((T + 1,) + x.shape[1:])
+    cn = np.zeros((T + 1,) + x.shape[1:])
+    cs[1:] = np.cumsum(np.where(nan, 0.0, x), axis=0)
+    cn[1:] = np.cumsum(nan, axis=0)
+
+    out = {}
+    for w in windows:
+        m = np.full(x.shape, np.nan)
+        if w <= T:
+            s = (cs[w:] - cs[:-w]) / w
+            has_nan = (cn[w:] - cn[:-w]) > 0
+            m[w - 1:] = np.where(has_nan, np.nan, s)
+        out[w] = m
+    return out
+
+
+def _ema(x, windows, init=None):
+    """
+    (T, K) -> {w: (T, K)} adjust=False EMA, 모든 window/종목을 한 번에 점화식으로 계산
+    init: (W, K) 직전 bar의 EMA (주면 이어서 계산, 없으면 첫 유효값부터 시작)
+    """
+    alpha = np.array([2.0 / (w + 1) for w in windows])[:, None]   # (W, 1)
+    T = x.shape[0]
+    out = np.empty((T, len(windows), x.shape[1]))
+    y = np.full((len(windows), x.shape[1]), np.nan) if init is None \
+        else np.array(init, dtype=np.float64).reshape(len(windows), x.shape[1])
+    for t in range(T):
+        xt = x[t][None, :]
+        # 첫 유효값으로 시작, 결측이면 직전 값 유지
+        y = np.where(np.isnan(y), xt, np.where(np.isnan(xt), y, alpha * xt + (1 - alpha) * y))
+        out[t] = y
+    return {w: out[:, i] for i, w in enumerate(windows)}
+
+
+def _gain_loss(x):
+    delta = np.full(x.shape, np.nan)
+    delta[1:] = x[1:] - x[:-1]
+    # pandas where(delta > 0, 0)와 동일: 첫 행(NaN)은 0
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    return gain, loss
+
+
+def _rsi(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def compute_indicators(close, windows=WINDOW_SIZES, ema_init=None) -> dict:
+    """
+    close: (T,) 또는 (T, K) 종가
+    ema_init: (W, K) close 직전 bar의 EMA (앞부분을 잘라 이어서 계산할 때)
+    return: {'SMA_5': (T, K), 'EMA_5': ..., 'RSI_5': ..., ...} (window 순서대로)
+    """
+    x = _as_2d(close)
+    sma = _rolling_mean(x, windows)
+    ema = _ema(x, windows, ema_init)
+    gain, loss = _gain_loss(x)
+    avg_gain = _rolling_mean(gain, windows)
+    avg_loss = _rolling_mean(loss, windows)
+
+    out = {}
+    for w in windows:
+        out[f"SMA_{w}"] = sma[w]
+        out[f"EMA_{w}"] = ema[w]
+        out[f"RSI_{w}"] = _rsi(avg_gain[w], avg_loss[w])
+    return out
+
+
+def add_indicators(df, windows=WINDOW_SIZES, col="Close") -> pd.DataFrame:
+    """단일 종목 DataFrame에 노트북과 같은 이름/순서로 지표 컬럼 추가"""
+    df = df.copy()
+    for name, values in compute_indicators(df[col].to_numpy(), windows).items():
+        df[name] = values[:, 0]
+    return df
+
+
+class IndicatorState:
+    """
+    스트리밍 갱신용 상태 (K개 종목 동시)
+    - 최근 max(window)개 종가 / gain / loss / 결측 여부 링버퍼
+    - window별 누적합 / 결측 개수, EMA 마지막 값, 마지막 종가
+      (결측은 0으로 더하고 개수만 세서 배치와 같이 window 안에 결측이 있으면 SMA = NaN)
+    update(close_row)는 히스토리 길이와 무관하게 O(window 수)
+    """
+    def __init__(self, windows=WINDOW_SIZES, n_series=1):
+        self.windows = tuple(windows)
+        self.size = max(self.windows)
+        self.alpha = np.array([2.0 / (w + 1) for w in self.windows])[:, None]
+        W, K = len(self.windows), n_series
+
+        self.count = 0                              # 지금까지 들어온 bar 수
+        self.last_close = np.full(K, np.nan)
+        self.close_buf = np.zeros((self.size, K))
+        self.gain_buf = np.zeros((self.size, K))
+        self.loss_buf = np.zeros((self.size, K))
+        self.nan_buf = np.zeros((self.size, K))
+        self.close_sum = np.zeros((W, K))
+        self.close_nan = np.zeros((W, K))
+        self.gain_sum = np.zeros((W, K))
+        self.loss_sum = np.zeros((W, K))
+        self.ema = np.full((W, K), np.nan)
+
+    @classmethod
+    def from_history(cls, close, windows=WINDOW_SIZES):
+        """과거 종가로 상태 초기화 (마지막 max(window)개 bar만 다시 흘려보냄)"""
+        x = _as_2d(close)
+        state = cls(windows, n_series=x.shape[1])
+        start = max(0, x.shape[0] - state.size)
+        # EMA는 전체 이력에 의존하므로 배치 계산 결과에서 가져옴
+        if start > 0:
+            ema = _ema(x[:start], state.windows)
+            state.ema = np.stack([ema[w][-1] for w in state.windows])
+            state.last_close = x[start - 1].copy()
+            state.count = start
+        for row in x[start:]:
+            state.update(row)
+        return state
+
+    def update(self, close_row) -> dict:
+        """새 일봉 종가(K,) 반영 후 최신 지표 {'SMA_5': (K,), ...} 반환"""
+        xt = np.asarray(close_row, dtype=np.float64).reshape(-1)
+        slot = self.count % self.size
+        nan = np.isnan(xt)
+
+        delta = xt - self.last_close
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+
+        # window 밖으로 나가는 값 제거 후 새 값 추가
+        for i, w in enumerate(self.windows):
+            if self.count >= w:
+                old = (self.count - w) % self.size
+                self.close_sum[i] -= self.close_buf[old]
+                self.close_nan[i] -= self.nan_buf[old]
+                self.gain_sum[i] -= self.gain_buf[old]
+                self.loss_sum[i] -= self.loss_buf[old]
+        self.close_buf[slot] = np.where(nan, 0.0, xt)
+        self.nan_buf[slot] = nan
+        self.gain_buf[slot] = gain
+        self.loss_buf[slot] = loss
+        self.close_sum += self.close_buf[slot]
+        self.close_nan += nan
+        self.gain_sum += gain
+        self.loss_sum += loss
+
+        # 첫 유효값으로 시작, 결측이면 직전 값 유지 (_ema와 동일)
+        self.ema = np.where(np.isnan(self.ema), xt[None, :],
+                            np.where(nan[None, :], self.ema,
+                                     self.alpha * xt[None, :] + (1 - self.alpha) * self.ema))
+        self.last_close = xt
+        self.count += 1
+        return self.latest()
+
+    def latest(self) -> dict:
+        out = {}
+        for i, w in enumerate(self.windows):
+            ready = self.count >= w
+            nan = np.full_like(self.close_sum[i], np.nan)
+            out[f"SMA_{w}"] = np.where(self.close_nan[i] > 0, np.nan, self.close_sum[i] / w) \
+                if ready else nan
+            out[f"EMA_{w}"] = self.ema[i].copy()
+            out[f"RSI_{w}"] = _rsi(self.gain_sum[i] / w, self.loss_sum[i] / w) if ready else nan
+        return out
+
+    def save(self, path):
+        np.savez(path, windows=np.array(self.windows), count=np.int64(self.count),
+                 last_close=self.last_close, close_buf=self.close_buf,
+                 gain_buf=self.gain_buf, loss_buf=self.loss_buf, nan_buf=self.nan_buf,
+                 close_sum=self.close_sum, close_nan=self.close_nan, gain_sum=self.gain_sum,
+                 loss_sum=self.loss_sum, ema=self.ema)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            state = cls(tuple(int(w) for w in f["windows"]), n_series=f["last_close"].shape[0])
+            state.count = int(f["count"])
+            for key in ("last_close", "close_buf", "gain_buf", "loss_buf", "nan_buf",
+                        "close_sum", "close_nan", "gain_sum", "loss_sum", "ema"):
+                if key in f.files:      # 이전 버전 파일에는 결측 개수가 없음 (0으로 시작)
+                    setattr(state, key, f[key].copy())
+        return state
@@ -1,56 +1,212 @@
 import os
+import json
+import time
+import hashlib
 import requests
 import pandas as pd
 from pprint import pprint
+from concurrent.futures import ThreadPoolExecutor
+
+from data_store import DataStore
+
+SOURCE = "ecos"
+API_KEY = os.environ.get("ECOS_API_KEY", '5O3QUZG5ICSESDI650G2')
+ECOS_BASE_URL = "https://ecos.bok.or.kr/api"
+
+# 주기별 TIME 포맷 (분기는 '2024Q1' 형태라 별도 처리)
+TIME_FORMAT = {"D": "%Y%m%d", "M": "%Y%m", "A": "%Y", "Y": "%Y"}
+
+
+def _half_to_quarter(times):
+    """반기 -> 시작 분기 ('2020S1' -> '2020Q1', '2020S2' -> '2020Q3')"""
+    return times.str.replace(r"(\d{4})S1", r"\1Q1", regex=True) \
+                .str.replace(r"(\d{4})S2", r"\1Q3", regex=True)
+
+
+def parse_time(times: pd.Series, period: str) -> pd.Series:
+    if period in ("Q", "S"):
+        # 분기/반기는 해당 기간 시작일로 변환
+        return pd.PeriodIndex(_half_to_quarter(times), freq="Q").to_timestamp() \
+                 .to_series(index=times.index)
+    return pd.to_datetime(times, format=TIME_FORMAT[period])
+
+
+def period_end(value: str, period: str) -> pd.Timestamp:
+    """요청 TIME 값(주기별 포맷)이 가리키는 기간의 마지막 날"""
+    if period == "D":
+        return pd.Timestamp(value)
+    if period == "S":
+        p = pd.Period(_half_to_quarter(pd.Series([value]))[0], freq="Q") + 1    # 반기 끝 분기
+    elif period == "Q":
+        p = pd.Period(value, freq="Q")
+    else:
+        p = pd.Period(pd.to_datetime(value, format=TIME_FORMAT[period]), freq=period.replace("A", "Y"))
+    return p.end_time.normalize()
+
+
+class EcosFetcher:
+    """
+    ECOS StatisticSearch 다중 통계 동시 조회
+    - 통계 하나를 page_size 단위로 나눠 요청 (첫 페이지의 list_total_count 기준)
+    - 응답은 요청 파라미터(API 키 제외) 해시로 cache_dir에 저장, 같은 요청은 네트워크 없이 반환
+      현재 기간까지 포함하는 요청은 저장하지 않음 (새 발표값을 다시 받기 위해)
+      최근 recent_days 안에 끝나는 요청 / 빈 결과(INFO-200)는 recent_ttl초 동안만 사용
+    - base_url을 바꾸면 로컬 stub 서버로도 동작
+    """
+    def __init__(self, api_key: str = API_KEY, base_url: str = ECOS_BASE_URL,
+                 cache_dir: str = "./economic_data/ecos_cache", page_size: int = 10000,
+                 max_workers: int = 4, timeout: float = 20, language: str = "kr", session=None,
+                 recent_days: int = 120, recent_ttl: float = 86400):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.language = language
+        self.session = session or requests.Session()
+        self.recent_days = recent_days
+        self.recent_ttl = recent_ttl
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _url(self, start_idx, end_idx, stat_code, period, start_date, end_date, item_code):
+        path_params = f"{self.api_key}/json/{self.language}/{start_idx}/{end_idx}/{stat_code}/{period}/{start_date}/{end_date}/{item_code}"
+        return f"{self.base_url}/StatisticSearch/{path_params}"
+
+    def _cache_ttl(self, period, end_date):
+        """캐시 유효 시간(초): 0이면 저장 안 함, None이면 무기한"""
+        end = period_end(end_date, period)
+        today = pd.Timestamp.today().normalize()
+        if end >= today:
+            return 0
+        if end >= today - pd.Timedelta(days=self.recent_days):
+            return self.recent_ttl
+        return None
+
+    def _get_page(self, start_idx, end_idx, *params, refresh=False):
+        """페이지 하나 요청 (디스크 캐시 우선) -> StatisticSearch 응답 dict"""
+        key = hashlib.sha1(json.dumps([self.language, start_idx, end_idx, *params]).encode()).hexdigest()
+        ttl = self._cache_ttl(params[1], params[3])
+        cache_path = os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir and ttl != 0 else None
+        if cache_path and not refresh and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                data = json.load(f)
+            # 빈 결과는 나중에 발표될 수 있으므로 무기한 캐시하지 않음
+            limit = self.recent_ttl if ttl is None and not data["row"] else ttl
+            if limit is None or time.time() - os.path.getmtime(cache_path) < limit:
+                return data
+
+        resp = self.session.get(self._url(start_idx, end_idx, *params), timeout=self.timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        if "StatisticSearch" in data:
+            data = data["StatisticSearch"]
+        else:
+            result = data.get("RESULT", {})
+            # INFO-200: 해당하는 데이터가 없음 (빈 결과도 캐시)
+            if result.get("CODE") != "INFO-200":
+                raise RuntimeError(f"ECOS 요청 실패: {result}")
+            data = {"list_total_count": 0, "row": []}
+
+        if cache_path:
+            with open(cache_path + ".tmp", "w") as f:
+                json.dump(data, f)
+            os.replace(cache_path + ".tmp", cache_path)
+        return data
+
+    def fetch(self, spec, start_date: str, end_date: str, refresh=False, pool=None) -> pd.Series:
+        """spec: (stat_code, period, item_code[, name]) -> date 인덱스 Series"""
+        stat_code, period, item_code = spec[:3]
+        name = spec[3] if len(spec) > 3 else f"{stat_code}_{item_code}"
+        params = (stat_code, period, start_date.replace("-", ""), end_date.replace("-", ""), item_code)
+
+        first = self._get_page(1, self.page_size, *params, refresh=refresh)
+        if not first["row"]:
+            return pd.Series(dtype=float, name=name, index=pd.DatetimeIndex([], name="date"))
+        rows = list(first["row"])
+
+        # 나머지 페이지는 동시에 요청
+        total = int(first.get("list_total_count", len(rows)))
+        starts = range(self.page_size + 1, total + 1, self.page_size)
+        if starts:
+            own_pool = pool is None
+            pool = pool or ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                pages = pool.map(lambda s: self._get_page(s, s + self.page_size - 1, *params,
+                                                          refresh=refresh), starts)
+                for page in pages:
+                    rows.extend(page["row"])
+            finally:
+                if own_pool:
+                    pool.shutdown()
+
+        df = pd.DataFrame(rows)
+        values = pd.to_numeric(df["DATA_VALUE"], errors="coerce").to_numpy()
+        index = pd.DatetimeIndex(parse_time(df["TIME"], period), name="date")
+        s = pd.Series(values, index=index, name=name)
+        return s[~s.index.duplicated(keep="last")].sort_index()
+
+    def fetch_many(self, specs, start_date: str, end_date: str, refresh=False) -> pd.DataFrame:
+        """여러 통계를 동시에 받아 date 기준으로 정렬된 wide frame 반환 (통계별 컬럼)"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool, \
+             ThreadPoolExecutor(max_workers=self.max_workers) as page_pool:
+            futures = [pool.submit(self.fetch, spec, start_date, end_date, refresh, page_pool)
+                       for spec in specs]
+            series = [fut.result() for fut in futures]
+        return pd.concat(series, axis=1).sort_index()
+
 
 def save_ecos(static_code: str, period: str, \
-              start_date: str, end_date :str, table_code: str, table_name: str ):
-    API_KEY = '5O3QUZG5ICSESDI650G2'
-    start_idx = 1
-    end_idx = 100000 # 10만일이면 270년 정도 되므로 이정도 하드 코딩은 상관없음
-    language = 'kr'
-    RETURN_TYPE = "json"
-    
-    url_base = "https://ecos.bok.or.kr/api/StatisticSearch/"
-    path_params = f"{API_KEY}/{RETURN_TYPE}/{language}/{start_idx}/{end_idx}/{static_code}/{period}/{start_date}/{end_date}/{table_code}"
-    url = url_base + path_params
-
-    resp = requests.get(url, timeout=20)
-    data = resp.json()
-
-    data = data['StatisticSearch']['row']
-    data = pd.DataFrame(data)
-
-    df_data = data[['TIME', 'DATA_VALUE']].copy()
-    df_data['date'] = pd.to_datetime(df_data['TIME'], format="%Y%m%d")
-    df_data[f'{table_name}'] = df_data['DATA_VALUE']
-
-    # 컬럼 정리
-    df_data = df_data[['date', f'{table_name}']].sort_values('date')
-    
-    start_date = start_date.replace("-", "")
-    end_date = end_date.replace("-", "")
-
-    save_dir = "./economic_data"
-    os.makedirs(save_dir, exist_ok=True)
-
-    fname = f"{table_name}_{start_date}_{end_date}"
-    save_path = os.path.join(save_dir, f"{fname}.xlsx")
-    with pd.ExcelWriter(save_path, engine="xlsxwriter", 
-                        datetime_format="yyyy-mm-dd") as writer:
-        df_data.to_excel(writer, index=False)
-    
-    print(f"{fname}.xlsx 저장 완료 : {save_path}")
+              start_date: str, end_date :str, table_code: str, table_name: str,
+              store: DataStore = None, export_excel: bool = False):
+    df_data = EcosFetcher().fetch((static_code, period, table_code, table_name),
+                                  start_date, end_date)
+    df_data = df_data.to_frame().reset_index()
+
+    # 저장소에 통계 이름 단위로 누적 저장
+    store = store or DataStore()
+    save_path = store.write(df_data, SOURCE, table_name, append=True)
+    print(f"{table_name} 저장 완료 : {save_path}")
+
+    if export_excel:
+        start_date = start_date.replace("-", "")
+        end_date = end_date.replace("-", "")
+
+        save_dir = "./economic_data"
+        os.makedirs(save_dir, exist_ok=True)
+
+        fname = f"{table_name}_{start_date}_{end_date}"
+        save_path = os.path.join(save_dir, f"{fname}.xlsx")
+        with pd.ExcelWriter(save_path, engine="xlsxwriter",
+                            datetime_format="yyyy-mm-dd") as writer:
+            df_data.to_excel(writer, index=False)
+
+        print(f"{fname}.xlsx 저장 완료 : {save_path}")
+
+    return df_data
+
+
+def save_ecos_many(specs, start_date: str, end_date: str, store: DataStore = None,
+                   fetcher: EcosFetcher = None) -> pd.DataFrame:
+    """specs: [(stat_code, period, item_code, name), ...] 동시 조회 후 통계별로 저장"""
+    fetcher = fetcher or EcosFetcher()
+    store = store or DataStore()
+    df_wide = fetcher.fetch_many(specs, start_date, end_date)
+    for name in df_wide.columns:
+        save_path = store.write(df_wide[[name]].dropna(), SOURCE, name, append=True)
+        print(f"{name} 저장 완료 : {save_path}")
+    return df_wide
 
 
 if __name__ == "__main__":
 
-    static_code = '731Y001' # 환율 통계
-    period = 'D' 
     start_date = "20250704"
     end_date = "20251102"
-    table_code = "0000001" # 원 달러 환율
-    table_name = "usd_krw"
 
-    save_ecos(static_code, period, start_date, end_date, table_code, table_name)
+    # (통계표 코드, 주기, 항목 코드, 저장 이름)
+    specs = [
+        ('731Y001', 'D', '0000001', 'usd_krw'),  # 환율 통계 - 원 달러 환율
+    ]
 
+    save_ecos_many(specs, start_date, end_date)
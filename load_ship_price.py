@@ -1,16 +1,129 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from datetime import date
-from pathlib import Path
+from io import BytesIO
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import requests
 import glob, os, time
 
+from data_store import DataStore
+
+SOURCE = "ship_price"
+
+KOBC_BASE_URL = "https://www.kobc.or.kr"
+GRID_PATH = "/ebz/shippinginfo/sts/gridList.do"
+# 화면의 엑셀 다운로드 버튼(button.fDown.m1)이 호출하는 export 요청
+# 실제 사이트에서 경로/파라미터를 확인하지 못한 추정값 -> 기본 경로는 Selenium, --http로만 사용
+# 사이트 개편으로 경로/파라미터가 바뀌면 EXPORT_PATH와 export_params만 수정
+EXPORT_PATH = "/ebz/shippinginfo/sts/gridExcelDown.do"
+# xlsx(zip) / xls(OLE2) 파일 시그니처
+EXCEL_MAGIC = (b"PK\x03\x04", b"\xd0\xcf\x11\xe0")
+
+old_ship = {'code' :'0402000000', 'name' : "used"} # 중고선가
+new_ship = {'code' : '0401000000', 'name' : "new"} # 신고선가
+RELEASE_TYPES = [new_ship, old_ship]
+# BULKER(곡물, 석탄, 철광) / TANKER(원유, 석유제품, 액체 화물)
+SHIP_TYPES = ["tanker", "bulker"]
+
+
+def export_params(release_type: dict, ship_type: str, start_date: str, end_date: str) -> dict:
+    """탭(선종) 선택 + 시작/종료일 검색 폼과 같은 값으로 export 요청 파라미터 구성"""
+    return {
+        "mId": release_type['code'],
+        "shipType": ship_type.upper(),
+        "startDate": start_date,
+        "endDate": end_date,
+    }
+
+
+def to_price_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """다운로드한 표 -> 저장 스키마 (index 'date', '번호' 컬럼 제거)"""
+    df = df.set_index("DATE")
+    df.index.name = "date"
+    return df.drop(columns=['번호'])
+
+
+def parse_export(content: bytes) -> pd.DataFrame:
+    """export 응답(엑셀 바이트)을 임시 파일 없이 메모리에서 파싱"""
+    if not content.startswith(EXCEL_MAGIC):
+        # 로그인/오류 페이지 등 HTML이 오면 read_excel 대신 바로 알림
+        head = content[:80].decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"선가 export 응답이 엑셀 파일이 아닙니다 ({len(content)} bytes): {head!r}")
+    return to_price_frame(pd.read_excel(BytesIO(content), header=1))
+
+
+class ShipPriceLoader:
+    """
+    브라우저 없이 HTTP로 선가 export를 직접 요청
+    (release_type, ship_type) 조합을 스레드 풀로 동시에 수집
+    base_url을 바꾸면 로컬 fixture 서버로도 동작
+    """
+    def __init__(self, base_url: str = KOBC_BASE_URL, max_workers: int = 4,
+                 timeout: float = 30, max_retries: int = 2, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("Referer", self.base_url + GRID_PATH)
+
+    def fetch(self, release_type: dict, ship_type: str, start_date: str, end_date: str) -> pd.DataFrame:
+        params = export_params(release_type, ship_type, start_date, end_date)
+        for attempt in range(self.max_retries + 1):
+            try:
+                r = self.session.post(self.base_url + EXPORT_PATH, data=params, timeout=self.timeout)
+                r.raise_for_status()
+                return parse_export(r.content)
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                # 연결 오류 / 시간 초과 / 5xx만 재시도 (4xx는 요청 자체 문제)
+                server_error = not isinstance(e, requests.HTTPError) or e.response.status_code >= 500
+                if not server_error or attempt == self.max_retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def fetch_all(self, start_date: str, end_date: str,
+                  release_types=RELEASE_TYPES, ship_types=SHIP_TYPES) -> dict:
+        """모든 조합 동시 수집 -> {'{release}_{ship_type}': DataFrame}"""
+        combos = [(rt, st) for rt in release_types for st in ship_types]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {f"{rt['name']}_{st}": pool.submit(self.fetch, rt, st, start_date, end_date)
+                       for rt, st in combos}
+            return {key: fut.result() for key, fut in futures.items()}
+
+
+def save_ship_prices(start_date: str, end_date: str, loader: ShipPriceLoader = None,
+                     store: DataStore = None) -> dict:
+    """전체 조합 수집 후 저장소에 key별 누적 저장 (process_file과 같은 key/스키마)"""
+    loader = loader or ShipPriceLoader()
+    store = store or DataStore()
+    frames = loader.fetch_all(start_date, end_date)
+    for key, df in frames.items():
+        save_path = store.write(df, SOURCE, key, append=True)
+        print(f"{key} 저장 완료 : {save_path}")
+    return frames
+
+
+# ─── Selenium 흐름 (기본 경로: 화면의 다운로드 버튼 사용) ──────────────
+def save_ship_prices_selenium(start_date: str, end_date: str, download_dir: str,
+                              headless: bool = True, store: DataStore = None):
+    """브라우저로 모든 (release_type, ship_type) 조합을 차례로 다운로드 후 저장"""
+    url_base = KOBC_BASE_URL + GRID_PATH + "?mId="
+    os.makedirs(download_dir, exist_ok=True)
+    driver = setup_driver(os.path.abspath(download_dir), headless=headless)
+    try:
+        for release_type in RELEASE_TYPES:
+            for ship_type in SHIP_TYPES:
+                download_file(driver, url_base + release_type['code'], start_date, end_date, ship_type)
+                process_file(download_dir, start_date, end_date, ship_type, release_type, store=store)
+    finally:
+        driver.quit()
+
 
 def setup_driver(download_dir: str, headless: bool = True):
     """크롬 드라이버 초기화"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     opts = Options()
     if headless:
         opts.add_argument("--headless=new")
@@ -23,6 +136,10 @@ def setup_driver(download_dir: str, headless: bool = True):
 def download_file(driver, url: str, start_date: str, end_date: str, \
                   ship_type: str = "TANKER",wait_sec: int = 3):
     """사이트 접속 후 파일 다운로드"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     driver.get(url)
     wait = WebDriverWait(driver, wait_sec)
 
@@ -59,56 +176,49 @@ def download_file(driver, url: str, start_date: str, end_date: str, \
     time.sleep(wait_sec)
 
 
-def process_file(download_dir: str, start_date: str, end_date: str, ship_type: str, release_type: dict):
-    """다운로드된 파일을 xlsx로 변환 후 원본 삭제"""
+def process_file(download_dir: str, start_date: str, end_date: str, ship_type: str, release_type: dict,
+                 store: DataStore = None, export_excel: bool = False):
+    """다운로드된 파일을 저장소에 누적 저장 후 원본 삭제 (xlsx 변환은 선택)"""
     download_dir = glob.escape(download_dir)
     files = glob.glob(os.path.join(download_dir, f"{ship_type.upper()}*"))
     if not files:
         raise FileNotFoundError(f"{ship_type} 파일을 찾을 수 없습니다.")
     fpath = files[0]
-    
-    df = pd.read_excel(fpath, header=1).set_index("DATE")
-    df.index.name = "date"
-    df = df.drop(columns=['번호'])
 
-    save_dir = "./economic_data"
-    os.makedirs(save_dir, exist_ok=True)
+    df = to_price_frame(pd.read_excel(fpath, header=1))
 
-    start_date = start_date.replace("-", "")
-    end_date = end_date.replace("-", "")
-    
-    fname = f"{release_type['name']}_{ship_type}_ship_price_{start_date}_{end_date}"
-    save_path = os.path.join(save_dir, f"{fname}.xlsx")
-    
-    df.to_excel(save_path, index=True, header=True)
+    # 저장소 key: {신조/중고}_{선종} (예: new_tanker)
+    store = store or DataStore()
+    save_path = store.write(df, SOURCE, f"{release_type['name']}_{ship_type}", append=True)
 
-    os.remove(fpath)
-
-    print(f"{release_type['name']} 저장 완료 : {save_path}")
+    if export_excel:
+        save_dir = "./economic_data"
+        os.makedirs(save_dir, exist_ok=True)
 
+        start_date = start_date.replace("-", "")
+        end_date = end_date.replace("-", "")
 
-if __name__ == "__main__":    
-    old_ship = {'code' :'0402000000', 'name' : "used"} # 중고선가
-    new_ship = {'code' : '0401000000', 'name' : "new"} # 신고선가
-    # 중고선가 / 신고선가 선택
-    release_type = new_ship
+        fname = f"{release_type['name']}_{ship_type}_ship_price_{start_date}_{end_date}"
+        save_path = os.path.join(save_dir, f"{fname}.xlsx")
 
-    bulk_ship = "bulker"
-    tank_ship = "tanker"
-    # BULKER(곡물, 석탄, 철광) / TANKER(원유, 석유제품, 액체 화물) 선택
-    ship_type = tank_ship
+        df.to_excel(save_path, index=True, header=True)
 
-    start_date = date(2025, 6, 4).strftime("%Y-%m-%d")
-    end_date = date(2025, 9, 14).strftime("%Y-%m-%d")
+    os.remove(fpath)
 
-    url_base = "https://www.kobc.or.kr/ebz/shippinginfo/sts/gridList.do?mId="
-    url = url_base + release_type['code']
-    down_dir = "/home/hlabserver/[code]재활과제_server/from_github/"
+    print(f"{release_type['name']} 저장 완료 : {save_path}")
 
-    driver = setup_driver(down_dir, headless=True)
-    try:
-        download_file(driver, url, start_date, end_date, ship_type)
-    finally:
-        driver.quit()
 
-    process_file(down_dir, start_date, end_date, ship_type, release_type)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="신조/중고 선가 수집")
+    parser.add_argument("--start", default=date(2025, 6, 4).strftime("%Y-%m-%d"))
+    parser.add_argument("--end", default=date(2025, 9, 14).strftime("%Y-%m-%d"))
+    parser.add_argument("--download_dir", default="./ship_download", help="Selenium 다운로드 폴더")
+    parser.add_argument("--http", action="store_true",
+                        help="브라우저 없이 export 요청 직접 호출 (실제 사이트 미검증 경로)")
+    args = parser.parse_args()
+
+    # 신조/중고 x TANKER/BULKER 4개 조합 수집
+    if args.http:
+        save_ship_prices(args.start, args.end)
+    else:
+        save_ship_prices_selenium(args.start, args.end, args.download_dir)
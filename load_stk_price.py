@@ -1,23 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-from openpyxl import Workbook
-import time
-from datetime import date, datetime
-import os
+import sys
+import argparse
+import pandas as pd
 
-# headers 설정
-headers = {
-    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                   "AppleWebKit/537.36 (KHTML, like Gecko) "
-                   "Chrome/124.0.0.0 Safari/537.36"),
-    "Referer": "https://finance.naver.com/",
-    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-}
+from stk_crawler import NaverCrawler, COLUMNS
+from data_store import DataStore
 
-session = requests.Session()
-session.headers.update(headers)
-
-# 조선 관련 주식 code 
+# 조선 관련 주식 code
 codes = [
     '042660',  # 한화오션 (구 대우조선해양)
     '009540',  # HD한국조선해양
@@ -30,61 +18,53 @@ codes = [
     '267250',  # HD현대마린엔진
 ]
 
-# 주가 저장할 액셀 초기화
-wb = Workbook()
-wb.remove(wb.active)
+SOURCE = 'stock'
+EXCEL_PATH = './stk_data/ship_stock_prices.xlsx'
+PARTIAL_EXIT = 3    # 일부 종목 실패 (pipeline.PARTIAL_EXIT와 같은 값)
+
+
+def save_results(store, results, full=False) -> list:
+    """
+    종목별 크롤링 결과 저장 -> 실패 종목 리스트
+    실패한 종목은 중간까지 받은 행도 저장하지 않음
+    (증분이면 last_date가 빠진 구간을 건너뛰고, --full이면 기존 이력을 일부로 덮어쓰게 됨)
+    """
+    failed = []
+    for code, res in results.items():
+        if not res.ok:
+            failed.append(code)
+            print(f"크롤링 실패: {code} ({res.error}, {len(res.rows)}행 저장하지 않음)")
+            continue
+        if res.rows:
+            df = pd.DataFrame(res.rows, columns=COLUMNS)
+            store.write(df, SOURCE, code, append=not full)
+        print(f"크롤링 완료: {code} (신규 {len(res.rows)}행, 요청 {res.requests}회, {res.elapsed:.1f}s)")
+    return failed
+
 
-# 주가 불러오기 + 액셀에 저장
-for code in codes:
-    ws = wb.create_sheet(title=code)
-    ws.append(["date","Close","Open","High","Low","Volume"])
-    
-    print(f"크롤링 시작: {code}")
-    START_PAGE = 2
-    MAX_PAGES = 5
-    
-    for page in range(START_PAGE, MAX_PAGES + 1):
-        # ✅ 일별시세 페이지 (table.type2가 여기에 있음)
-        url = f"https://finance.naver.com/item/sise_day.naver?code={code}&page={page}"
-        print(f"  페이지 {page} 크롤링 중...")
-        
-        r = session.get(url, timeout=10)
-        r.encoding = "euc-kr"
-        soup = BeautifulSoup(r.text, "html.parser")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='네이버 일별시세 크롤링')
+    parser.add_argument('--full', action='store_true',
+                        help='저장된 데이터를 무시하고 전체 이력 재수집')
+    parser.add_argument('--max_pages', type=int, default=5000, help='종목당 최대 페이지')
+    parser.add_argument('--excel', action='store_true', help=f'{EXCEL_PATH}로도 내보내기')
+    args = parser.parse_args()
 
-        # 표에서 데이터 추출
-        table = soup.select_one("table.type2")
-        if not table:
-            break
+    store = DataStore()
+    last_dates = {code: (None if args.full else store.last_date(SOURCE, code)) for code in codes}
 
-        rows_with_data = 0
-        for row in table.select("tr"):
-            tds = [td.get_text(strip=True) for td in row.find_all("td")]
-            if len(tds) == 7 and tds[0]:   # 실제 데이터 행만
-                trade_date, close, _, open_, high, low, volume = tds # 전일비는 무시
+    # 저장된 종목은 최신 페이지부터 증분 수집, 처음 보는 종목은 전체 이력 수집
+    crawler = NaverCrawler(max_workers=len(codes), rate=5.0)
+    results = crawler.crawl_incremental(codes, last_dates, max_pages=args.max_pages)
 
-                date = datetime.strptime(trade_date, "%Y.%m.%d")
-                ws.append([
-                    date,
-                    int(close.replace(",","")),
-                    int(open_.replace(",","")),
-                    int(high.replace(",","")),
-                    int(low.replace(",","")),
-                    int(volume.replace(",",""))
-                ])
+    # 새 행만 이어 붙여 저장 (실패 종목은 다음 실행에서 다시 수집)
+    failed = save_results(store, results, full=args.full)
 
-                ws.cell(ws.max_row, 1).number_format = "yyyy-mm-dd"
-                rows_with_data += 1
-        
-        # 데이터가 없으면 마지막 페이지
-        if rows_with_data == 0:
-            break
-            
-        print(f"  페이지 {page}에서 {rows_with_data}개 데이터 수집")
-        page += 1
-        time.sleep(0.5)  # 서버 부하 방지
-    
-    print(f"크롤링 완료: {code} (총 {page-1}페이지)")
+    if args.excel:
+        store.export_excel(SOURCE, EXCEL_PATH, keys=codes)
+        print(f"엑셀 내보내기 완료 : {EXCEL_PATH}")
 
-os.makedirs('./stk_data', exist_ok=True)
-wb.save('./stk_data/ship_stock_prices.xlsx')
\ No newline at end of file
+    # 실패 종목은 저장하지 않았으므로 pipeline이 캐시하지 않도록 알림
+    if failed:
+        print(f"실패 종목 {len(failed)}개: {', '.join(failed)}")
+        sys.exit(PARTIAL_EXIT)
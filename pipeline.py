@@ -0,0 +1,197 @@
+"""
+데이터 전처리 파이프라인 (data_preprocessing.sh 대체)
+
+    python pipeline.py            # 변경된 단계만 실행
+    python pipeline.py --force    # 전부 다시 실행
+
+- 단계별 입력/출력/의존성을 DAG로 선언, 의존성이 없는 단계는 동시에 실행
+- 입력 파일 content hash가 지난 실행과 같고 출력이 남아 있으면 건너뜀
+- 단계별 소요 시간 출력 + pipeline_state.json에 기록
+- exit code PARTIAL_EXIT(일부 항목만 실패)는 'partial': 후속 단계는 진행하되 캐시하지 않음 (다음 실행에서 재시도)
+"""
+import os
+import sys
+import json
+import glob
+import time
+import hashlib
+import argparse
+import subprocess
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+STATE_FILE = "pipeline_state.json"
+STORE = os.environ.get("STOCK_DATA_ROOT", "./data_store")
+PARTIAL_EXIT = 3    # 단계 스크립트가 일부 항목(예: 종목 일부) 실패 시 쓰는 exit code
+
+
+class Stage:
+    """
+    name   : 단계 이름
+    cmd    : 실행할 명령 (리스트)
+    inputs : hash 대상 파일/디렉터리/glob
+    outputs: 실행 후 있어야 하는 파일/디렉터리 (없으면 다시 실행)
+    deps   : 먼저 끝나야 하는 단계 이름
+    stamp  : 파일 외 입력 (예: 네트워크 수집 단계는 날짜 -> 하루 한 번만 실행)
+    """
+    def __init__(self, name, cmd, inputs=(), outputs=(), deps=(), stamp=None):
+        self.name = name
+        self.cmd = cmd
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.stamp = stamp
+
+
+def today():
+    return date.today().isoformat()
+
+
+STAGES = [
+    Stage("load_stk_price", [sys.executable, "load_stk_price.py"],
+          inputs=["load_stk_price.py", "stk_crawler.py", "data_store.py"],
+          outputs=[os.path.join(STORE, "stock")], stamp=today),
+    Stage("load_ship_price", [sys.executable, "load_ship_price.py"],
+          inputs=["load_ship_price.py", "data_store.py"],
+          outputs=[os.path.join(STORE, "ship_price")], stamp=today),
+    Stage("load_ecos", [sys.executable, "load_ecos.py"],
+          inputs=["load_ecos.py", "data_store.py"],
+          outputs=[os.path.join(STORE, "ecos")], stamp=today),
+    Stage("add_col", [sys.executable, "add_col.py"],
+          inputs=["add_col.py", "data_store.py", os.path.join(STORE, "stock"),
+                  os.path.join(STORE, "ecos"), os.path.join(STORE, "ship_price")],
+          outputs=[os.path.join(STORE, "merged")],
+          deps=["load_stk_price", "load_ship_price", "load_ecos"]),
+]
+
+
+def hash_paths(paths) -> str:
+    """파일/디렉터리/glob 내용 전체의 sha256 (경로 순서 고정)"""
+    h = hashlib.sha256()
+    files = []
+    for p in paths:
+        matched = glob.glob(p) or [p]
+        for m in matched:
+            if os.path.isdir(m):
+                for root, _, names in os.walk(m):
+                    files.extend(os.path.join(root, n) for n in names if not n.endswith(".tmp"))
+            else:
+                files.append(m)
+    for f in sorted(set(files)):
+        h.update(f.encode())
+        if not os.path.exists(f):
+            h.update(b"<missing>")
+            continue
+        with open(f, "rb") as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def stage_key(stage) -> str:
+    key = hash_paths(stage.inputs) + " ".join(stage.cmd[1:])
+    if stage.stamp is not None:
+        key += stage.stamp()
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def load_state(path=STATE_FILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_FILE):
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def run_stage(stage) -> tuple:
+    t0 = time.perf_counter()
+    proc = subprocess.run(stage.cmd, capture_output=True, text=True)
+    return proc.returncode, time.perf_counter() - t0, proc.stdout + proc.stderr
+
+
+def run_pipeline(stages=STAGES, force=False, max_workers=4, state_path=STATE_FILE) -> dict:
+    """
+    의존성이 모두 끝난 단계부터 스레드 풀에 올려 동시에 실행
+    hash는 의존 단계가 끝난 뒤(=입력이 확정된 뒤)에 계산
+    return: {stage 이름: {'status': 'ran'|'partial'|'skipped'|'failed'|'blocked', 'seconds': float}}
+    """
+    by_name = {s.name: s for s in stages}
+    for s in stages:
+        missing = [d for d in s.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"{s.name}: 알 수 없는 의존 단계 {missing}")
+
+    state = load_state(state_path)
+    report = {}
+    pending = {s.name for s in stages}
+    running = {}
+
+    def ready(name):
+        return all(d in report for d in by_name[name].deps)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name in sorted(n for n in pending if ready(n)):
+                pending.discard(name)
+                stage = by_name[name]
+                if any(report[d]["status"] in ("failed", "blocked") for d in stage.deps):
+                    report[name] = {"status": "blocked", "seconds": 0.0}
+                    continue
+                t0 = time.perf_counter()
+                key = stage_key(stage)
+                outputs_ok = all(os.path.exists(o) for o in stage.outputs)
+                if not force and outputs_ok and state.get(name, {}).get("key") == key:
+                    report[name] = {"status": "skipped", "seconds": time.perf_counter() - t0}
+                    print(f"[skip] {name} (입력 변경 없음)")
+                    continue
+                print(f"[run ] {name}")
+                running[pool.submit(run_stage, stage)] = name
+
+            if not running:
+                if pending and not any(ready(n) for n in pending):
+                    raise ValueError(f"순환 의존성: {sorted(pending)}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                code, seconds, output = fut.result()
+                if code == 0:
+                    report[name] = {"status": "ran", "seconds": seconds}
+                    # 실행 후 입력 hash 기록 (단계가 자기 입력을 바꾼 경우도 반영)
+                    state[name] = {"key": stage_key(by_name[name]), "seconds": seconds,
+                                   "finished": time.strftime("%Y-%m-%d %H:%M:%S")}
+                    save_state(state, state_path)
+                elif code == PARTIAL_EXIT:
+                    # 저장된 결과로 후속 단계는 진행, 이전 key는 지워서 다음 실행에서 다시 수집
+                    report[name] = {"status": "partial", "seconds": seconds}
+                    if state.pop(name, None) is not None:
+                        save_state(state, state_path)
+                    print(f"[part] {name} (일부 실패, 캐시하지 않음)\n{output}")
+                else:
+                    report[name] = {"status": "failed", "seconds": seconds}
+                    print(f"[fail] {name} (exit {code})\n{output}")
+    return report
+
+
+def print_report(report, total):
+    print(f"\n{'stage':<18} {'status':<8} {'seconds':>8}")
+    for name, r in report.items():
+        print(f"{name:<18} {r['status']:<8} {r['seconds']:>8.2f}")
+    print(f"{'total':<18} {'':<8} {total:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='데이터 전처리 파이프라인')
+    parser.add_argument('--force', action='store_true', help='hash와 무관하게 모든 단계 실행')
+    parser.add_argument('--workers', type=int, default=4, help='동시에 실행할 단계 수')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    report = run_pipeline(force=args.force, max_workers=args.workers)
+    print_report(report, time.perf_counter() - t0)
+    sys.exit(1 if any(r["status"] in ("failed", "blocked", "partial") for r in report.values()) else 0)
@@ -1,35 +1,47 @@
-import pandas as pd
 import os
-import matplotlib.pyplot as plt
+import argparse
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 
-# --- 환율 데이터 ---
-fdir = "./economic_data/"
-fname = "usd_krw_20160704_20251102.xlsx"
-fpth = os.path.join(fdir, fname)
-df_ecos = pd.read_excel(fpth)
-
-x_ecos = df_ecos['date']
-y_ecos = df_ecos["usd_krw"].values.reshape(-1, 1)
-
-# --- 주가 데이터 ---
-fdir = "./stk_data/"
-fname = "ship_stock_prices.xlsx"
-fpth = os.path.join(fdir, fname)
-df_stk = pd.read_excel(fpth)
-
-x_stk = df_stk['date']
-y_stk = df_stk['Close'].values.reshape(-1, 1)
-
-# --- 스케일링 ---
-scaler = MinMaxScaler()
-y_ecos_scaled = scaler.fit_transform(y_ecos).flatten()
-y_stk_scaled = scaler.fit_transform(y_stk).flatten()
-
-
-# --- 시각화 ---
-plt.plot(x_ecos, y_ecos_scaled, label="USD/KRW (scaled)")
-plt.plot(x_stk, y_stk_scaled, label="Ship Stock (scaled)")
-
-plt.legend()
-plt.show()
+from data_store import DataStore
+from plotting import plot_lines, render_many
+
+
+def scaled(series):
+    return MinMaxScaler().fit_transform(series.values.reshape(-1, 1)).flatten()
+
+
+def make_job(store, code, macro, out_dir):
+    """환율(macro)과 종목 종가를 0~1로 스케일링해 겹쳐 그리는 plot_lines 인자"""
+    # --- 환율 데이터 ---
+    df_ecos = store.read("ecos", macro)
+    # --- 주가 데이터 ---
+    df_stk = store.read("stock", code)
+
+    return {
+        "series": [
+            {"x": df_ecos.index, "y": scaled(df_ecos[macro]), "label": f"{macro} (scaled)"},
+            {"x": df_stk.index,  "y": scaled(df_stk["Close"]), "label": f"{code} (scaled)"},
+        ],
+        "path": os.path.join(out_dir, f"{macro}_vs_{code}.png"),
+        "title": f"{macro} vs {code}",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="환율 vs 조선주 비교 그래프")
+    parser.add_argument("--codes", nargs="+", default=["042660"], help="종목 코드 ('all'이면 저장소 전체)")
+    parser.add_argument("--macro", default="usd_krw", help="ecos 저장소의 통계 이름")
+    parser.add_argument("--out_dir", default="./figures")
+    parser.add_argument("--workers", type=int, default=None, help="병렬 렌더링 프로세스 수")
+    parser.add_argument("--show", action="store_true", help="종목 하나일 때 창으로 표시")
+    args = parser.parse_args()
+
+    store = DataStore()
+    codes = store.keys("stock") if args.codes == ["all"] else args.codes
+    jobs = [make_job(store, code, args.macro, args.out_dir) for code in codes]
+
+    if args.show and len(jobs) == 1:
+        plot_lines(**jobs[0], show=True)
+    else:
+        for path in render_many(jobs, args.workers):
+            print(f"저장 완료 : {path}")
@@ -0,0 +1,161 @@
+"""
+긴 시계열용 plot 헬퍼
+
+- 그리기 전에 모양을 유지하는 downsampling (LTTB / 구간별 min·max)
+  15년 일봉(약 3,700점)을 수백~2,000점으로 줄여도 추세·급등락은 그대로 보임
+- 기본은 화면 없이 파일만 저장하는 Agg backend (show=True일 때만 창 표시)
+- render_many로 여러 종목 차트를 프로세스 풀에서 병렬 저장
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+MAX_POINTS = 2000       # 선 하나당 최대 점 수
+MARKER_LIMIT = 300      # 점 수가 이보다 많으면 marker 생략
+
+
+def get_pyplot(show=False):
+    """show=False면 Agg backend로 고정 (MPLBACKEND 환경변수가 있으면 그 값 우선)"""
+    import matplotlib
+    if not show and "MPLBACKEND" not in os.environ:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets -> 남길 index (처음/끝 점 포함, 오름차순)
+    각 구간에서 이전 선택 점 / 다음 구간 평균과 만드는 삼각형 넓이가 최대인 점 선택
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xf, yf = _as_float(x), np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)    # 중간 점을 n_out - 2개 구간으로
+    # 다음 구간 평균은 누적합으로 한 번에 계산
+    cx = np.concatenate([[0.0], np.cumsum(xf)])
+    cy = np.concatenate([[0.0], np.cumsum(yf)])
+    nxt_lo = np.append(edges[1:-1], n - 1)
+    nxt_hi = np.append(edges[2:], n)
+    avg_x = (cx[nxt_hi] - cx[nxt_lo]) / (nxt_hi - nxt_lo)
+    avg_y = (cy[nxt_hi] - cy[nxt_lo]) / (nxt_hi - nxt_lo)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((xf[a] - avg_x[i]) * (yf[lo:hi] - yf[a])
+                      - (xf[a] - xf[lo:hi]) * (avg_y[i] - yf[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax(y, n_out):
+    """구간별 최솟값/최댓값 index (n_out // 2개 구간, 시간 순서 유지) - 급등락 보존"""
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    lo, hi = [], []
+    for s, e in zip(edges[:-1], edges[1:]):
+        seg = y[s:e]
+        lo.append(s + np.argmin(seg))
+        hi.append(s + np.argmax(seg))
+    idx = np.unique(np.concatenate([lo, hi, [0, n - 1]]))
+    return idx
+
+
+def downsample(x, y, max_points=MAX_POINTS, method="lttb"):
+    """(x, y) -> 줄인 (x, y). NaN은 제외, method: 'lttb' | 'minmax' | None"""
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    if method is None or len(y) <= max_points:
+        return x, y
+    idx = lttb(x, y, max_points) if method == "lttb" else minmax(y, max_points)
+    return x[idx], y[idx]
+
+
+def plot_lines(series, path=None, title=None, xlabel=None, ylabel=None, vlines=(),
+               max_points=MAX_POINTS, method="lttb", figsize=(14, 5), dpi=100, show=False):
+    """
+    series: [{'x': ..., 'y': ..., 'label': ..., 'marker': 'o'}, ...]
+    vlines: [{'x': ..., 'label': ..., 'linestyle': '--', 'color': 'gray'}, ...]
+    path를 주면 저장, show=True면 창 표시
+    """
+    plt = get_pyplot(show)
+    fig, ax = plt.subplots(figsize=figsize)
+    for s in series:
+        x, y = downsample(s["x"], s["y"], max_points, method)
+        marker = s.get("marker") if len(y) <= MARKER_LIMIT else None
+        ax.plot(x, y, label=s.get("label"), marker=marker, linewidth=1)
+    for v in vlines:
+        ax.axvline(x=v["x"], linestyle=v.get("linestyle", "--"),
+                   color=v.get("color", "gray"), label=v.get("label"))
+    if title:
+        ax.set_title(title)
+    ax.set_xlabel(xlabel or "")
+    ax.set_ylabel(ylabel or "")
+    ax.legend()
+    ax.grid(True)
+    fig.autofmt_xdate(rotation=45)
+    fig.tight_layout()
+
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fig.savefig(path, dpi=dpi)
+    if show:
+        plt.show()
+    plt.close(fig)
+    return path
+
+
+def plot_loss_curve(df_loss, path=None, dpi=100, show=False):
+    """loss_log.csv (epoch, mean_loss, std_loss) 손실 곡선"""
+    plt = get_pyplot(show)
+    fig, ax = plt.subplots(figsize=(8, 4))
+    marker = "-o" if len(df_loss) <= MARKER_LIMIT else "-"
+    ax.errorbar(df_loss["epoch"], df_loss["mean_loss"], yerr=df_loss["std_loss"],
+                fmt=marker, capsize=4, label="Mean Loss")
+    ax.set_title("Training Loss Curve")
+    ax.set_xlabel("Epoch")
+    ax.set_ylabel("Loss")
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fig.savefig(path, dpi=dpi)
+    if show:
+        plt.show()
+    plt.close(fig)
+    return path
+
+
+def _render(kwargs):
+    return plot_lines(**kwargs)
+
+
+def render_many(jobs, max_workers=None):
+    """plot_lines 인자 dict 리스트를 프로세스 풀에서 병렬 저장 -> 저장 경로 리스트"""
+    jobs = [dict(job, show=False) for job in jobs]
+    if len(jobs) <= 1 or max_workers == 1:
+        return [_render(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_render, jobs))
@@ -0,0 +1,323 @@
+import re
+import time
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+NAVER_BASE_URL = "https://finance.naver.com"
+SISE_DAY_PATH = "/item/sise_day.naver"
+
+# headers 설정
+HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                   "AppleWebKit/537.36 (KHTML, like Gecko) "
+                   "Chrome/124.0.0.0 Safari/537.36"),
+    "Referer": "https://finance.naver.com/",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+COLUMNS = ["date", "Close", "Open", "High", "Low", "Volume"]
+
+
+class TokenBucket:
+    """호스트 단위 요청 속도 제한 (초당 rate개, 최대 burst개까지 몰아서 허용)"""
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class CrawlResult:
+    """종목별 크롤링 결과"""
+    code: str
+    rows: list = field(default_factory=list)   # [date, Close, Open, High, Low, Volume]
+    pages: int = 0                              # 데이터가 있던 페이지 수
+    requests: int = 0                           # 재시도 포함 실제 요청 수
+    elapsed: float = 0.0
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """모든 워커가 공유하는 커넥션 풀 세션"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_sise_table(html: str) -> list:
+    """sise_day 페이지 html -> [date, Close, Open, High, Low, Volume] 리스트"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 표에서 데이터 추출
+    table = soup.select_one("table.type2")
+    if not table:
+        return []
+
+    rows = []
+    for row in table.select("tr"):
+        tds = [td.get_text(strip=True) for td in row.find_all("td")]
+        if len(tds) == 7 and tds[0]:   # 실제 데이터 행만
+            trade_date, close, _, open_, high, low, volume = tds # 전일비는 무시
+            rows.append([
+                datetime.strptime(trade_date, "%Y.%m.%d"),
+                int(close.replace(",","")),
+                int(open_.replace(",","")),
+                int(high.replace(",","")),
+                int(low.replace(",","")),
+                int(volume.replace(",",""))
+            ])
+    return rows
+
+
+def parse_last_page(html: str):
+    """페이지 네비게이션의 '맨뒤'(td.pgRR) 링크에서 마지막 페이지 번호 추출 (없으면 None)"""
+    soup = BeautifulSoup(html, "html.parser")
+    link = soup.select_one("td.pgRR a")
+    if link is None:
+        return None
+    m = re.search(r"page=(\d+)", link.get("href", ""))
+    return int(m.group(1)) if m else None
+
+
+class NaverCrawler:
+    """
+    여러 종목의 일별시세를 스레드 풀로 동시에 수집
+    - 호스트별 token bucket 속도 제한
+    - 커넥션 풀 공유 세션
+    - 지수 백오프 재시도
+    base_url을 바꾸면 로컬 stub 서버로도 동작
+    """
+    def __init__(self, base_url: str = NAVER_BASE_URL, max_workers: int = 8,
+                 rate: float = 5.0, burst: int = 5, max_retries: int = 3,
+                 backoff: float = 0.5, timeout: float = 10, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or make_session(pool_size=max_workers)
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def page_url(self, code: str, page: int) -> str:
+        return f"{self.base_url}{SISE_DAY_PATH}?code={code}&page={page}"
+
+    def fetch_page(self, code: str, page: int):
+        """페이지 하나 요청 (재시도 포함) -> (rows, 요청 횟수)"""
+        html, n_req = self.fetch_html(code, page)
+        return parse_sise_table(html), n_req
+
+    def fetch_html(self, code: str, page: int):
+        """페이지 하나 요청 (재시도 포함) -> (html, 요청 횟수)"""
+        url = self.page_url(code, page)
+        bucket = self._bucket(url)
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                r = self.session.get(url, timeout=self.timeout)
+                if r.status_code == 429 or r.status_code >= 500:
+                    raise requests.HTTPError(f"HTTP {r.status_code}", response=r)
+                r.raise_for_status()
+                r.encoding = "euc-kr"
+                return r.text, attempt + 1
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                retryable = not (isinstance(e, requests.HTTPError) and e.response is not None
+                                 and 400 <= e.response.status_code < 500
+                                 and e.response.status_code != 429)
+                if not retryable or attempt == self.max_retries:
+                    raise
+                # 지수 백오프 + jitter
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def crawl_code(self, code: str, start_page: int = 1, max_pages: int = 500) -> CrawlResult:
+        """한 종목을 start_page부터 데이터가 없는(또는 직전 페이지가 반복되는) 페이지까지 수집"""
+        result = CrawlResult(code=code)
+        t0 = time.perf_counter()
+        try:
+            prev = None
+            for page in range(start_page, max_pages + 1):
+                rows, n_req = self.fetch_page(code, page)
+                result.requests += n_req
+                # 데이터가 없거나 직전 페이지가 반복되면 마지막 페이지를 지난 것
+                if not rows or rows == prev:
+                    break
+                prev = rows
+                result.rows.extend(rows)
+                result.pages += 1
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.elapsed = time.perf_counter() - t0
+        return result
+
+    def crawl(self, codes, start_page: int = 1, max_pages: int = 500) -> dict:
+        """여러 종목 동시 수집 -> {code: CrawlResult}"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {code: pool.submit(self.crawl_code, code, start_page, max_pages)
+                       for code in codes}
+            return {code: fut.result() for code, fut in futures.items()}
+
+    def crawl_since(self, code: str, last_date, max_pages: int = 500) -> CrawlResult:
+        """
+        최신 페이지부터 내려가며 last_date 이후의 행만 수집
+        last_date 이하의 날짜가 나오면 바로 중단 (일일 갱신이면 보통 1~2회 요청)
+        """
+        last_date = pd.Timestamp(last_date)
+        result = CrawlResult(code=code)
+        t0 = time.perf_counter()
+        try:
+            for page in range(1, max_pages + 1):
+                rows, n_req = self.fetch_page(code, page)
+                result.requests += n_req
+                if not rows:
+                    break
+                new_rows = [row for row in rows if row[0] > last_date]
+                result.rows.extend(new_rows)
+                result.pages += 1
+                # 이미 저장된 날짜에 도달하면 종료
+                if len(new_rows) < len(rows):
+                    break
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.elapsed = time.perf_counter() - t0
+        return result
+
+    def find_last_page(self, code: str, max_pages: int = 5000):
+        """
+        마지막 페이지 번호 탐색 -> (last_page, 요청 횟수)
+        1페이지의 '맨뒤' 링크를 우선 사용하고, 없으면 지수 탐색 + 이분 탐색
+        범위를 넘은 페이지는 비어 있거나 마지막 페이지가 반복되므로
+        데이터 유무가 아니라 직전에 확인한 페이지(tail)와 날짜가 같은지로 판단
+        """
+        html, n_req = self.fetch_html(code, 1)
+        first = [row[0] for row in parse_sise_table(html)]
+        if not first:
+            return 0, n_req
+        last = parse_last_page(html)
+        if last is not None:
+            return min(last, max_pages), n_req
+
+        def dates(page):
+            nonlocal n_req
+            rows, n = self.fetch_page(code, page)
+            n_req += n
+            return [row[0] for row in rows]
+
+        # 실제 페이지끼리는 날짜가 겹치지 않음 -> tail과 같은 날짜가 다시 나오면 범위 밖
+        before, prev, tail = 0, 1, first
+        while prev < max_pages:
+            cur = min(prev * 2, max_pages)
+            got = dates(cur)
+            if not got:
+                # 빈 페이지: 처음으로 비는 페이지 - 1 이 마지막, 찾는 범위 (prev, cur]
+                lo, hi, matches, offset = prev, cur, (lambda d: not d), 1
+                break
+            if got == tail:
+                # 마지막 페이지 반복: 처음으로 tail과 같은 페이지가 마지막, 찾는 범위 (before, prev]
+                lo, hi, matches, offset = before, prev, (lambda d, t=tail: d == t), 0
+                break
+            before, prev, tail = prev, cur, got
+        else:
+            # max_pages까지 전부 서로 다른 데이터
+            return max_pages, n_req
+
+        # lo: 조건 불만족, hi: 조건 만족 -> 조건을 만족하는 첫 페이지
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if matches(dates(mid)):
+                hi = mid
+            else:
+                lo = mid
+        return hi - offset, n_req
+
+    def backfill(self, codes, max_pages: int = 5000) -> dict:
+        """
+        전체 이력 수집: 종목별 마지막 페이지를 먼저 찾은 뒤
+        (종목, 페이지) 단위로 풀에 분배해 페이지까지 병렬로 요청
+        """
+        results = {code: CrawlResult(code=code) for code in codes}
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            last_pages = {code: pool.submit(self.find_last_page, code, max_pages)
+                          for code in codes}
+            page_futs = {}
+            for code, fut in last_pages.items():
+                try:
+                    last, n_req = fut.result()
+                except Exception as e:
+                    results[code].error = f"{type(e).__name__}: {e}"
+                    continue
+                results[code].requests += n_req
+                for page in range(1, last + 1):
+                    page_futs[(code, page)] = pool.submit(self.fetch_page, code, page)
+
+            # 페이지 순서(최신 -> 과거)대로 결과 조립
+            for (code, page), fut in page_futs.items():
+                res = results[code]
+                if res.error is not None:
+                    continue
+                try:
+                    rows, n_req = fut.result()
+                except Exception as e:
+                    res.error = f"{type(e).__name__}: {e}"
+                    continue
+                res.requests += n_req
+                if rows:
+                    res.rows.extend(rows)
+                    res.pages += 1
+        for res in results.values():
+            res.elapsed = time.perf_counter() - t0
+        return results
+
+    def crawl_incremental(self, codes, last_dates: dict, max_pages: int = 5000) -> dict:
+        """
+        저장된 마지막 날짜가 있는 종목은 crawl_since, 없는 종목은 backfill
+        last_dates: {code: 마지막 저장 날짜 or None}
+        """
+        new_codes = [code for code in codes if last_dates.get(code) is None]
+        old_codes = [code for code in codes if last_dates.get(code) is not None]
+
+        results = self.backfill(new_codes, max_pages) if new_codes else {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {code: pool.submit(self.crawl_since, code, last_dates[code], max_pages)
+                       for code in old_codes}
+            results.update({code: fut.result() for code, fut in futures.items()})
+        return {code: results[code] for code in codes}
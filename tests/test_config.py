@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "LSTM_custom"))
+
+from config import get_training_args
+
+
+@pytest.mark.parametrize("argv", [
+    ["--mode", "predict", "--sample_size", "20"],
+    ["--mode=predict", "--sample_size=20", "--epochs", "5", "--weights", "best"],
+    ["--sample_size", "20", "--batch_size", "64", "--save_interval", "2", "--mode", "predict"],
+])
+def test_legacy_predict_accepts_training_options(argv):
+    args = get_training_args(argv)
+    assert args.command == args.mode == "predict"
+    assert args.weights == ("best" if "best" in argv else "latest")
+
+
+def test_legacy_train_keeps_options():
+    args = get_training_args(["--mode", "train", "--sample_size", "20", "--epochs", "3"])
+    assert (args.command, args.sample_size, args.epochs) == ("train", 20, 3)
+
@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_store import DataStore
+from feature_store import FeatureStore, fill_gaps, FUNDAMENTAL_COLUMNS
+from cross_corr import load_gdp
+
+CODE = "000000"
+
+
+def make_prices(start="2024-01-02", end="2025-10-10", seed=0):
+    dates = pd.bdate_range(start, end, name="date")
+    rng = np.random.default_rng(seed)
+    close = 1e4 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    return pd.DataFrame({"Close": close, "High": close * 1.01, "Low": close * 0.99,
+                         "Open": close, "Volume": rng.integers(1e5, 1e6, len(dates)).astype(float)},
+                        index=dates)
+
+
+def make_fundamental(index):
+    n = len(index)
+    return pd.DataFrame({"PER": np.linspace(10, 12, n), "PBR": np.linspace(1, 2, n),
+                         "EPS": np.linspace(500, 600, n)}, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DataStore(str(tmp_path))
+    prices = make_prices()
+    store.write(prices, "stock", CODE)
+    store.write(make_fundamental(prices.index), "fundamental", CODE)
+    return store
+
+
+def test_fill_gaps_interpolates_short_interior_gaps_only():
+    x = np.array([1.0, np.nan, 3.0, np.nan, np.nan, np.nan, 7.0, np.nan])
+    out, filled = fill_gaps(x, max_gap=2)
+    assert out[1, 0] == 2.0
+    assert np.isnan(out[3:6, 0]).all()          # max_gap보다 긴 구간
+    assert np.isnan(out[7, 0])                  # 끝쪽 결측은 보간하지 않음
+    assert filled[:, 0].tolist() == [False, True] + [False] * 6
+
+
+def test_trailing_gdp_is_forward_filled(store):
+    fs = FeatureStore(store)
+    frame = fs.materialize(CODE)
+
+    assert frame.dtypes.unique().tolist() == [np.float32]
+    assert not frame.isna().any().any()
+
+    # GDP CSV는 2025Q2부터 NaN -> 마지막 발표값(2025Q1) 유지
+    gdp = load_gdp()
+    last_q = gdp.dropna().index[-1]
+    tail = frame.loc[frame.index > last_q, "real_GDP"]
+    assert len(tail) > 0
+    assert np.allclose(tail, np.float32(gdp.dropna().iloc[-1]))
+
+    record = fs.manifest()["codes"][CODE]
+    assert record["ffilled"]["real_GDP"]["rows"] == len(tail)
+    assert record["missing"] == [] and record["empty"] == []
+
+
+def test_missing_fundamental_is_recorded_not_raised(tmp_path):
+    store = DataStore(str(tmp_path))
+    prices = make_prices()
+    store.write(prices, "stock", CODE)
+
+    fs = FeatureStore(store)
+    frame = fs.materialize(CODE)
+    assert not frame.isna().any().any()
+    assert (frame[FUNDAMENTAL_COLUMNS] == 0).all().all()
+    record = fs.manifest()["codes"][CODE]
+    assert record["missing"] == [os.path.join("fundamental", f"{CODE}.parquet")]
+    assert sorted(record["empty"]) == sorted(FUNDAMENTAL_COLUMNS)
+
+    # 나중에 수집하면 캐시 대신 새 값 사용
+    store.write(make_fundamental(prices.index), "fundamental", CODE)
+    frame = fs.materialize(CODE)
+    assert frame["PER"].iloc[0] == pytest.approx(10.0)
+    assert fs.manifest()["codes"][CODE]["missing"] == []
+
+
+def test_append_matches_full_recompute(tmp_path):
+    prices = make_prices()
+    store = DataStore(str(tmp_path))
+    store.write(prices.iloc[:300], "stock", CODE)
+    store.write(make_fundamental(prices.index), "fundamental", CODE)
+    FeatureStore(store).materialize(CODE)
+
+    store.write(prices.iloc[300:], "stock", CODE, append=True)
+    appended = FeatureStore(store).materialize(CODE)
+    full = FeatureStore(store).materialize(CODE, refresh=True)
+    assert np.array_equal(appended.to_numpy(), full.to_numpy())
+
+
+def test_revised_history_invalidates_cache(store, tmp_path):
+    fs = FeatureStore(store)
+    fs.materialize(CODE)
+
+    # 액면분할 수정주가처럼 과거 종가 전체가 바뀐 경우
+    revised = store.read("stock", CODE)
+    revised.iloc[:100] = revised.iloc[:100] / 2
+    store.write(revised, "stock", CODE)
+    frame = fs.materialize(CODE)
+
+    fresh_store = DataStore(str(tmp_path / "fresh"))
+    fresh_store.write(revised, "stock", CODE)
+    fresh_store.write(store.read("fundamental", CODE), "fundamental", CODE)
+    expected = FeatureStore(fresh_store).materialize(CODE)
+    assert np.array_equal(frame.to_numpy(), expected.to_numpy())
+
+
+def test_unchanged_inputs_reuse_cache(store):
+    fs = FeatureStore(store)
+    fs.materialize(CODE)
+    meta = {f.name: json.load(open(fs._meta_path(f, CODE))) for f in fs.features}
+    mtimes = {f.name: os.path.getmtime(store.path(fs._source(f), CODE)) for f in fs.features}
+
+    fs.materialize(CODE)
+    for f in fs.features:
+        assert json.load(open(fs._meta_path(f, CODE))) == meta[f.name]
+        assert os.path.getmtime(store.path(fs._source(f), CODE)) == mtimes[f.name]
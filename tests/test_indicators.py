@@ -0,0 +1,23 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import compute_indicators, IndicatorState
+
+
+def test_streaming_matches_batch_with_missing_bars():
+    rng = np.random.default_rng(0)
+    close = 30 + np.cumsum(rng.normal(size=(200, 3)), axis=0)
+    close[:7, 0] = np.nan           # 상장 전
+    close[100, 1] = np.nan          # 하루 결측
+    close[150:153, 2] = np.nan      # 연속 결측
+    batch = compute_indicators(close)
+
+    state = IndicatorState.from_history(close[:80])
+    for t in range(80, len(close)):
+        latest = state.update(close[t])
+        for name, values in latest.items():
+            np.testing.assert_allclose(values, batch[name][t], rtol=1e-9, equal_nan=True)
@@ -0,0 +1,52 @@
+import os
+import sys
+from unittest import mock
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_ecos import EcosFetcher, parse_time, period_end
+
+SPEC = ("731Y001", "D", "0000001", "usd_krw")
+ROW = {"StatisticSearch": {"list_total_count": 1,
+                           "row": [{"TIME": "20200102", "DATA_VALUE": "1"}]}}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+def fetch_twice(tmp_path, end_date, data=ROW, **kwargs):
+    session = mock.Mock()
+    session.get.return_value = FakeResponse(data)
+    fetcher = EcosFetcher(cache_dir=str(tmp_path), session=session, **kwargs)
+    for _ in range(2):
+        fetcher.fetch(SPEC, "2020-01-01", end_date)
+    return session.get.call_count
+
+
+def test_half_year_starts_in_january_and_july():
+    out = parse_time(pd.Series(["2020S1", "2020S2"]), "S")
+    assert out.tolist() == [pd.Timestamp("2020-01-01"), pd.Timestamp("2020-07-01")]
+    assert period_end("2020S2", "S") == pd.Timestamp("2020-12-31")
+
+
+def test_closed_range_is_cached(tmp_path):
+    assert fetch_twice(tmp_path, "2020-01-31") == 1
+
+
+def test_range_reaching_today_is_not_cached(tmp_path):
+    assert fetch_twice(tmp_path, pd.Timestamp.today().strftime("%Y-%m-%d")) == 2
+
+
+def test_empty_result_expires(tmp_path):
+    empty = {"RESULT": {"CODE": "INFO-200"}}
+    assert fetch_twice(tmp_path, "2020-01-31", data=empty, recent_ttl=0) == 2
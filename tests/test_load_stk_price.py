@@ -0,0 +1,36 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_store import DataStore
+from stk_crawler import CrawlResult
+from load_stk_price import save_results, SOURCE
+
+
+def rows(*days):
+    return [[datetime(2025, 1, d), 100, 100, 101, 99, 1000] for d in days]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DataStore(str(tmp_path))
+    save_results(store, {"A": CrawlResult("A", rows=rows(2, 3, 6)),
+                         "B": CrawlResult("B", rows=rows(2, 3, 6))})
+    return store
+
+
+@pytest.mark.parametrize("full", [False, True])
+def test_failed_code_is_not_written(store, full):
+    # 최신 페이지만 받고 다음 페이지에서 실패
+    results = {"A": CrawlResult("A", rows=rows(10, 9), error="Timeout: page 2"),
+               "B": CrawlResult("B", rows=rows(8, 7))}
+    failed = save_results(store, results, full=full)
+
+    assert failed == ["A"]
+    assert store.last_date(SOURCE, "A").day == 6
+    assert len(store.read(SOURCE, "A")) == 3
+    assert store.last_date(SOURCE, "B").day == 8
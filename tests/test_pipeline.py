@@ -0,0 +1,44 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import Stage, run_pipeline, load_state, PARTIAL_EXIT
+
+
+def make_stages(tmp_path, crawl_exit):
+    out = tmp_path / "out"
+    out.mkdir(exist_ok=True)
+    crawl = tmp_path / "crawl.py"
+    crawl.write_text(f"import sys\nsys.exit({crawl_exit})\n")
+    merge = tmp_path / "merge.py"
+    merge.write_text("")
+    return [
+        Stage("crawl", [sys.executable, str(crawl)], inputs=[str(crawl)],
+              outputs=[str(out)], stamp=lambda: "2025-01-01"),
+        Stage("merge", [sys.executable, str(merge)], inputs=[str(merge)],
+              outputs=[str(out)], deps=["crawl"]),
+    ]
+
+
+def test_partial_failure_runs_downstream_but_is_not_cached(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    stages = make_stages(tmp_path, crawl_exit=PARTIAL_EXIT)
+
+    report = run_pipeline(stages, state_path=state_path)
+    assert report["crawl"]["status"] == "partial"
+    assert report["merge"]["status"] == "ran"
+    assert "crawl" not in load_state(state_path)
+
+    # 같은 날 다시 실행해도 건너뛰지 않음
+    assert run_pipeline(stages, state_path=state_path)["crawl"]["status"] == "partial"
+
+
+def test_partial_failure_clears_earlier_success(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    assert run_pipeline(make_stages(tmp_path, 0), state_path=state_path)["crawl"]["status"] == "ran"
+    assert run_pipeline(make_stages(tmp_path, 0), state_path=state_path)["crawl"]["status"] == "skipped"
+
+    stages = make_stages(tmp_path, PARTIAL_EXIT)
+    assert run_pipeline(stages, state_path=state_path, force=True)["crawl"]["status"] == "partial"
+    assert "crawl" not in load_state(state_path)
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+import threading
+import http.client
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "LSTM_custom"))
+
+from server import serve
+
+
+class FakeLSTM:
+    sample_size, feature_size, output_size = 4, 2, 3
+    weight_path = "fake"
+
+    def forecast(self, windows, steps):
+        return np.repeat(windows[:, -1:, :], steps, axis=1)
+
+
+@pytest.fixture
+def client():
+    server = serve({"default": FakeLSTM()}, port=0, max_steps=10)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def post(body):
+        conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+        conn.request("POST", "/forecast", body=json.dumps(body))
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+
+    yield post
+    server.shutdown()
+    server.server_close()
+    for b in server.batchers.values():
+        b.close()
+
+
+def test_forecast(client):
+    status, body = client({"window": np.ones((4, 2)).tolist(), "steps": 5})
+    assert status == 200
+    assert np.asarray(body["forecast"]).shape == (5, 2)
+
+
+@pytest.mark.parametrize("body", [[], "window", 3, None])
+def test_non_object_body_is_rejected(client, body):
+    status, out = client(body)
+    assert status == 400 and "error" in out
+
+
+@pytest.mark.parametrize("steps", [0, 11, 2.5, "5", True])
+def test_steps_out_of_range_is_rejected(client, steps):
+    status, _ = client({"window": np.ones((4, 2)).tolist(), "steps": steps})
+    assert status == 400
@@ -0,0 +1,54 @@
+import os
+import sys
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stk_crawler import NaverCrawler
+
+
+class FakeSession:
+    """페이지당 10행, last_page를 넘으면 빈 표(empty) 또는 마지막 페이지(repeat)를 돌려줌"""
+    def __init__(self, last_page, past_end="empty"):
+        self.last_page = last_page
+        self.past_end = past_end
+        self.calls = 0
+
+    def page_html(self, page):
+        if page > self.last_page:
+            if self.past_end == "empty":
+                return "<table class='type2'></table>"
+            page = self.last_page
+        dates = pd.bdate_range(end="2025-01-31", periods=10 * page)[::-1][10 * (page - 1):]
+        rows = "".join(f"<tr><td>{d:%Y.%m.%d}</td><td>1,000</td><td>0</td><td>1,000</td>"
+                       f"<td>1,010</td><td>990</td><td>5,000</td></tr>" for d in dates)
+        return f"<table class='type2'>{rows}</table>"
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        page = int(parse_qs(urlparse(url).query)["page"][0])
+        return type("Response", (), {"status_code": 200, "text": self.page_html(page),
+                                     "raise_for_status": lambda self: None})()
+
+
+@pytest.mark.parametrize("past_end", ["empty", "repeat"])
+@pytest.mark.parametrize("last_page", [1, 2, 3, 5, 8, 37, 64, 100])
+def test_find_last_page(last_page, past_end):
+    crawler = NaverCrawler(session=FakeSession(last_page, past_end), rate=1000)
+    assert crawler.find_last_page("000000", max_pages=100)[0] == last_page
+
+
+@pytest.mark.parametrize("past_end", ["empty", "repeat"])
+def test_find_last_page_capped_by_max_pages(past_end):
+    crawler = NaverCrawler(session=FakeSession(300, past_end), rate=1000)
+    assert crawler.find_last_page("000000", max_pages=100)[0] == 100
+
+
+def test_crawl_code_stops_on_repeated_page():
+    session = FakeSession(4, "repeat")
+    result = NaverCrawler(session=session, rate=1000).crawl_code("000000", max_pages=50)
+    assert result.pages == 4 and len(result.rows) == 40
+    assert session.calls == 5
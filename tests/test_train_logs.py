@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "LSTM_custom"))
+
+from utils import Throughput
+
+
+def write_metrics(path, epochs):
+    with open(path, "w") as f:
+        f.write(",".join(Throughput.COLUMNS) + "\n")
+        for e in epochs:
+            f.write(",".join([str(e)] + ["1"] * (len(Throughput.COLUMNS) - 1)) + "\n")
+
+
+def test_resume_drops_rows_after_restored_epoch(tmp_path):
+    path = tmp_path / "train_metrics.csv"
+    write_metrics(path, range(1, 8))    # epoch 7까지 기록, 체크포인트는 5
+
+    cb = Throughput(batch_size=4, num_samples=8, save_dir=str(tmp_path),
+                    resume=True, initial_epoch=5)
+    for epoch in range(5, 7):
+        cb.on_epoch_begin(epoch)
+        cb.on_train_batch_begin(0)
+        cb.on_train_batch_end(0)
+        cb.on_epoch_end(epoch)
+
+    log = pd.read_csv(path)
+    assert log["epoch"].tolist() == [1, 2, 3, 4, 5, 6, 7]
+    assert log["samples"].tolist()[-2:] == [8, 8]
+
+
+def test_fresh_run_overwrites_log(tmp_path):
+    path = tmp_path / "train_metrics.csv"
+    write_metrics(path, range(1, 4))
+    Throughput(batch_size=4, save_dir=str(tmp_path))
+    assert pd.read_csv(path).empty